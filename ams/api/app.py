@@ -4,18 +4,29 @@ API Application
 This module defines the FastAPI application and all its routes.
 """
 
+import asyncio
+import json
 import logging
 import uuid
 from typing import Dict, List, Any, Union
-from dataclasses import asdict
 
 from fastapi import FastAPI, Path, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+# Serialize responses with orjson's C encoder when it is installed
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    orjson = None
+    from fastapi.responses import JSONResponse as DefaultJSONResponse
+
 from ..core.registry import InMemoryAgentRegistry, AgentMetadata, AgentFramework, AgentStatus, AgentCapability
 from ..core.adapters import get_adapter
 from ..core.supervisor import SupervisorManager
 from ..core.communication import CommunicationHub
+from ..core import config as config_module
 from ..core.errors import (
     AgentNotFoundException,
     SessionNotFoundException,
@@ -31,11 +42,30 @@ from .models import (
     TaskRequest,
     TaskResponse,
     MessageRequest,
+    to_dict,
 )
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Seconds a message stream waits for a new message before re-checking the session
+# status and sending a keep-alive comment
+STREAM_IDLE_SECONDS = 1.0
+
+def dumps_json(data: Any) -> str:
+    """
+    Encode data as JSON with the same encoder as the API responses.
+    
+    Args:
+        data: The data to encode
+        
+    Returns:
+        The JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str)
+
 # Create application dependencies
 agent_registry = InMemoryAgentRegistry()
 communication_hub = CommunicationHub()
@@ -67,6 +97,82 @@ def convert_capability(cap: Union[AgentCapabilityModel, Dict[str, Any]]) -> Agen
             parameters=cap.parameters
         )
 
+# Helper functions shared by the single and batch registration endpoints
+def build_agent_metadata(json_data: Dict[str, Any]) -> AgentMetadata:
+    """
+    Validate an agent registration payload and build the agent's metadata.
+    
+    Args:
+        json_data: The agent registration payload
+        
+    Returns:
+        Metadata for a new agent, not yet registered
+        
+    Raises:
+        InvalidAgentDataException: If the payload is malformed or the framework is not supported
+    """
+    # Convert to dataclass; missing or unknown keys raise TypeError
+    try:
+        agent_data = AgentRegistrationRequest(**json_data)
+    except TypeError as e:
+        raise InvalidAgentDataException(f"Invalid agent data: {e}")
+    
+    # Convert framework string to enum
+    try:
+        framework = AgentFramework(agent_data.framework.lower())
+    except (ValueError, AttributeError):
+        raise InvalidAgentDataException(
+            f"Invalid framework: {agent_data.framework}. Supported frameworks: {[f.value for f in AgentFramework]}",
+            details={"supported_frameworks": [f.value for f in AgentFramework]}
+        )
+    
+    # Convert capabilities
+    capabilities = None
+    if agent_data.capabilities:
+        try:
+            capabilities = [convert_capability(cap) for cap in agent_data.capabilities]
+        except (TypeError, KeyError, AttributeError) as e:
+            raise InvalidAgentDataException(f"Invalid agent capabilities: {e!r}")
+    
+    # Create agent metadata
+    return AgentMetadata(
+        id=str(uuid.uuid4()),
+        name=agent_data.name,
+        description=agent_data.description,
+        system_prompt=agent_data.system_prompt,
+        framework=framework,
+        capabilities=capabilities,
+        config=agent_data.config,
+        status=AgentStatus.READY  # Set status to READY by default
+    )
+
+def register_agent_metadata(agent: AgentMetadata) -> AgentResponse:
+    """
+    Register an agent and describe it for the API response.
+    
+    Args:
+        agent: The agent metadata to register
+        
+    Returns:
+        The registered agent's information
+    """
+    # Register the agent
+    agent_id = agent_registry.register_agent(agent)
+    
+    # Get the registered agent
+    registered_agent = agent_registry.get_agent(agent_id)
+    
+    # Convert to response model
+    return AgentResponse(
+        id=registered_agent.id,
+        name=registered_agent.name,
+        description=registered_agent.description,
+        framework=registered_agent.framework.value,
+        status=registered_agent.status.value,
+        created_at=registered_agent.created_at,
+        updated_at=registered_agent.updated_at
+    )
+
 # Helper function for JSON parsing
 async def parse_json_request(request: Request) -> dict:
     """
@@ -87,11 +193,16 @@ def create_app() -> FastAPI:
     Returns:
         A configured FastAPI application
     """
+    # Read settings here rather than at import, so a config loaded by
+    # load_config before the app is created applies
+    communication_hub.max_messages = config_module.config.llm.max_history_messages or None
+    
     # Create FastAPI app
     app = FastAPI(
         title="Agent Management Server (AMS)",
         description="A server for managing and orchestrating AI agents from different frameworks.",
         version="0.1.0",
+        default_response_class=DefaultJSONResponse,
     )
     
     # Add CORS middleware
@@ -133,55 +244,50 @@ def create_app() -> FastAPI:
             # Parse request body
             json_data = await parse_json_request(request)
             
-            # Convert to dataclass
-            agent_data = AgentRegistrationRequest(**json_data)
+            # Validate the request and register the agent
+            agent = build_agent_metadata(json_data)
+            response = register_agent_metadata(agent)
             
-            # Convert framework string to enum
-            try:
-                framework = AgentFramework(agent_data.framework.lower())
-            except ValueError:
-                raise InvalidAgentDataException(
-                    f"Invalid framework: {agent_data.framework}. Supported frameworks: {[f.value for f in AgentFramework]}",
-                    details={"supported_frameworks": [f.value for f in AgentFramework]}
-                )
-            
-            # Convert capabilities
-            capabilities = None
-            if agent_data.capabilities:
-                capabilities = [convert_capability(cap) for cap in agent_data.capabilities]
-            
-            # Create agent metadata
-            agent = AgentMetadata(
-                id=str(uuid.uuid4()),
-                name=agent_data.name,
-                description=agent_data.description,
-                system_prompt=agent_data.system_prompt,
-                framework=framework,
-                capabilities=capabilities,
-                config=agent_data.config,
-                status=AgentStatus.READY  # Set status to READY by default
-            )
-            
-            # Register the agent
-            agent_id = await agent_registry.register_agent(agent)
+            return to_dict(response)
+        except Exception as e:
+            logger.error(f"Error registering agent: {str(e)}")
+            raise
+    
+    @app.post("/agents/batch", response_model=List[dict])
+    async def register_agents(request: Request) -> List[Dict[str, Any]]:
+        """
+        Register several agents with one request.
+        
+        Args:
+            request: The HTTP request containing {"agents": [agent data, ...]}
             
-            # Get the registered agent
-            registered_agent = await agent_registry.get_agent(agent_id)
+        Returns:
+            The registered agents' information, in request order
+        """
+        try:
+            # Parse request body
+            json_data = await parse_json_request(request)
             
-            # Convert to response model
-            response = AgentResponse(
-                id=registered_agent.id,
-                name=registered_agent.name,
-                description=registered_agent.description,
-                framework=registered_agent.framework.value,
-                status=registered_agent.status.value,
-                created_at=registered_agent.created_at,
-                updated_at=registered_agent.updated_at
-            )
+            agents_data = json_data.get("agents") if isinstance(json_data, dict) else None
+            if not isinstance(agents_data, list):
+                raise InvalidAgentDataException("Expected a JSON object with an 'agents' list")
             
-            return asdict(response)
+            # Validate every agent before registering any, so a bad entry registers nothing
+            agents = []
+            for index, agent_data in enumerate(agents_data):
+                if not isinstance(agent_data, dict):
+                    raise InvalidAgentDataException(
+                        f"Agent {index} must be a JSON object", details={"index": index}
+                    )
+                try:
+                    agents.append(build_agent_metadata(agent_data))
+                except InvalidAgentDataException as e:
+                    e.message = f"Agent {index}: {e.message}"
+                    e.details["index"] = index
+                    raise
+            return [to_dict(register_agent_metadata(agent)) for agent in agents]
         except Exception as e:
-            logger.error(f"Error registering agent: {str(e)}")
+            logger.error(f"Error registering agents: {str(e)}")
             raise
             
     @app.get("/agents", response_model=List[dict])
@@ -196,10 +302,10 @@ def create_app() -> FastAPI:
             HTTPException: If there's an error retrieving the agents
         """
         try:
-            agents = await agent_registry.list_agents()
+            agents = agent_registry.list_agents()
             
             return [
-                asdict(AgentResponse(
+                to_dict(AgentResponse(
                     id=agent.id,
                     name=agent.name,
                     description=agent.description,
@@ -229,7 +335,7 @@ def create_app() -> FastAPI:
             HTTPException: If the agent is not found or there's an error retrieving it
         """
         try:
-            agent = await agent_registry.get_agent(agent_id)
+            agent = agent_registry.get_agent(agent_id)
             
             if not agent:
                 raise AgentNotFoundException(agent_id)
@@ -244,7 +350,7 @@ def create_app() -> FastAPI:
                 updated_at=agent.updated_at
             )
             
-            return asdict(response)
+            return to_dict(response)
         except AgentNotFoundException as e:
             logger.error(f"Agent not found: {agent_id}")
             raise
@@ -256,7 +362,7 @@ def create_app() -> FastAPI:
     async def delete_agent(agent_id: str) -> Dict[str, str]:
         """Delete an agent from the registry."""
         try:
-            deleted = await agent_registry.delete_agent(agent_id)
+            deleted = agent_registry.delete_agent(agent_id)
             
             if not deleted:
                 raise AgentNotFoundException(agent_id)
@@ -301,7 +407,7 @@ def create_app() -> FastAPI:
                 status="created"
             )
             
-            return asdict(response)
+            return to_dict(response)
         except Exception as e:
             logger.error(f"Error creating task: {str(e)}")
             raise
@@ -311,12 +417,12 @@ def create_app() -> FastAPI:
         """Execute a task with the selected agents."""
         try:
             # Get the session from the supervisor
-            if session_id not in supervisor.active_sessions:
+            session_info = supervisor.active_sessions.get(session_id)
+            if session_info is None:
                 raise SessionNotFoundException(session_id)
             
-            session_info = supervisor.active_sessions[session_id]
-            task = session_info["task"]
-            agent_ids = session_info["agents"]
+            task = session_info.task
+            agent_ids = session_info.agent_ids
             
             # Get the session messages for context
             messages = communication_hub.get_session_history(session_id)
@@ -327,7 +433,7 @@ def create_app() -> FastAPI:
             # Get the agents from the registry
             agents = []
             for agent_id in agent_ids:
-                agent = await agent_registry.get_agent(agent_id)
+                agent = agent_registry.get_agent(agent_id)
                 if not agent:
                     raise AgentNotFoundException(agent_id)
                 agents.append(agent)
@@ -393,7 +499,7 @@ def create_app() -> FastAPI:
                     )
             
             # Update session status
-            supervisor.active_sessions[session_id]["status"] = "executed"
+            session_info.status = "executed"
             
             return {
                 "session_id": session_id,
@@ -447,10 +553,10 @@ def create_app() -> FastAPI:
             raise
 
     @app.get("/tasks/{session_id}/messages", response_model=List[Dict[str, Any]])
-    async def get_messages(session_id: str) -> List[Dict[str, Any]]:
-        """Get all messages in a collaboration session."""
+    async def get_messages(session_id: str, since: int = 0) -> List[Dict[str, Any]]:
+        """Get the messages in a collaboration session, skipping the first `since`."""
         try:
-            messages = communication_hub.get_session_history(session_id)
+            messages = communication_hub.get_session_history(session_id, since=since)
             return messages
         except SessionNotFoundException as e:
             raise
@@ -458,6 +564,57 @@ def create_app() -> FastAPI:
             logger.error(f"Error getting messages for session {session_id}: {str(e)}")
             raise
 
+    @app.get("/tasks/{session_id}/stream")
+    async def stream_messages(session_id: str, since: int = 0) -> StreamingResponse:
+        """
+        Stream the messages of a collaboration session as Server-Sent Events.
+        
+        Messages after the first `since` are sent as `data:` events as soon as they
+        are added, and an `event: done` sentinel closes the stream once the session
+        is no longer active.
+        """
+        subscriber_id = f"stream-{uuid.uuid4()}"
+        # Subscribe before reading the history, so no message falls between the two
+        queue = communication_hub.subscribe(session_id, subscriber_id)
+        history = communication_hub.get_session_history(session_id, since=since)
+        
+        def session_active() -> bool:
+            session_info = supervisor.active_sessions.get(session_id)
+            return session_info is not None and session_info.status == "active"
+        
+        async def events():
+            try:
+                sent_ids = set()
+                for message in history:
+                    sent_ids.add(message["message_id"])
+                    yield f"data: {dumps_json(message)}\n\n"
+                
+                while True:
+                    try:
+                        message = await asyncio.wait_for(queue.get(), STREAM_IDLE_SECONDS)
+                    except asyncio.TimeoutError:
+                        if not session_active():
+                            break
+                        yield ": keep-alive\n\n"
+                        continue
+                    # Messages queued before the history snapshot were already sent
+                    if message.message_id in sent_ids:
+                        continue
+                    yield f"data: {dumps_json(message.to_dict())}\n\n"
+                
+                yield "event: done\ndata: {}\n\n"
+            finally:
+                try:
+                    communication_hub.unsubscribe(session_id, subscriber_id)
+                except SessionNotFoundException:
+                    pass
+        
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+
     @app.post("/tasks/{session_id}/terminate", response_model=Dict[str, str])
     async def terminate_task(session_id: str) -> Dict[str, str]:
         """Terminate a task."""
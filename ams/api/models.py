@@ -5,11 +5,39 @@ This module contains the dataclass models used for API requests and responses.
 These models define the expected data structures for the API endpoints.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+import sys
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 
+# Models are immutable once built; they are also slotted where the running
+# Python supports slotted dataclasses (3.10+), which makes them smaller
+_MODEL_OPTIONS = {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def _field_names(model_type: type) -> Tuple[str, ...]:
+    """Get the field names of a dataclass type, computed once per type."""
+    return tuple(f.name for f in fields(model_type))
+
+
+def to_dict(model: Any) -> Dict[str, Any]:
+    """
+    Convert a response model to a dictionary for serialization.
+    
+    Unlike dataclasses.asdict, field values are not recursively deep-copied, so
+    this is meant for freshly built models whose values are not shared.
+    
+    Args:
+        model: The dataclass model instance
+        
+    Returns:
+        Dictionary mapping field names to the model's values
+    """
+    return {name: getattr(model, name) for name in _field_names(type(model))}
+
+
+@dataclass(**_MODEL_OPTIONS)
 class AgentCapabilityModel:
     """
     Represents a capability that an agent can possess.
@@ -24,7 +52,7 @@ class AgentCapabilityModel:
     parameters: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_MODEL_OPTIONS)
 class AgentRegistrationRequest:
     """
     Request model for registering a new agent.
@@ -45,7 +73,7 @@ class AgentRegistrationRequest:
     config: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_MODEL_OPTIONS)
 class AgentResponse:
     """
     Response model for agent information.
@@ -68,7 +96,7 @@ class AgentResponse:
     updated_at: str
 
 
-@dataclass
+@dataclass(**_MODEL_OPTIONS)
 class TaskRequest:
     """
     Request model for creating a new task.
@@ -79,7 +107,7 @@ class TaskRequest:
     task: str
 
 
-@dataclass
+@dataclass(**_MODEL_OPTIONS)
 class TaskResponse:
     """
     Response model for task creation.
@@ -96,7 +124,7 @@ class TaskResponse:
     status: str = "created"
 
 
-@dataclass
+@dataclass(**_MODEL_OPTIONS)
 class MessageRequest:
     """
     Request model for sending a message.
@@ -113,7 +141,7 @@ class MessageRequest:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_MODEL_OPTIONS)
 class MessageResponse:
     """
     Response model for message information.
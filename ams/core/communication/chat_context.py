@@ -6,13 +6,29 @@ in the Agent Management Server. It handles the persistence and formatting of con
 history between different agents.
 """
 
+import asyncio
+import itertools
+import json
 import logging
-from typing import List, Dict, Any, Optional, Set, Union
+import sys
+from typing import Deque, Iterator, List, Dict, Any, Optional, Set, Union
 from datetime import datetime
 import uuid
+from collections import deque
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+
+def _intern(value: Any) -> Any:
+    """Intern string values so repeated sender ids/names share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
 class ChatMessage:
     """
     Represents a single message in a chat history.
@@ -21,6 +37,11 @@ class ChatMessage:
     between agents, maintaining information about sender, timestamps, 
     and additional context.
     """
+    __slots__ = (
+        "content", "sender_id", "sender_name", "timestamp", "metadata",
+        "message_id", "sender_role", "sender_framework"
+    )
+    
     def __init__(
         self, 
         content: str, 
@@ -45,8 +66,9 @@ class ChatMessage:
             sender_framework: Framework of the sender (defaults to None)
         """
         self.content = content
-        self.sender_id = sender_id
-        self.sender_name = sender_name or sender_id
+        self.sender_id = _intern(sender_id)
+        # Reuse the interned sender_id object when no display name is given
+        self.sender_name = _intern(sender_name) if sender_name else self.sender_id
         
         # Handle timestamp conversion
         if timestamp is None:
@@ -142,7 +164,8 @@ class ChatSession:
         metadata: Dict[str, Any], 
         task: str = "",
         messages: Optional[List[ChatMessage]] = None,
-        created_at: Optional[str] = None
+        created_at: Optional[Union[datetime, str]] = None,
+        max_messages: Optional[int] = None
     ):
         """
         Initialize a new chat session.
@@ -152,18 +175,26 @@ class ChatSession:
             metadata: Additional information about the session
             task: The task description for this session
             messages: Initial messages in the session
-            created_at: When the session was created (ISO format string)
+            created_at: When the session was created (datetime or ISO format string)
+            max_messages: Optional cap on stored messages; the oldest are evicted first
         """
         self.session_id = session_id
         self.metadata = metadata or {}
         self.task = task
-        self.messages = messages or []
+        self.messages: Deque[ChatMessage] = deque(messages or (), maxlen=max_messages)
+        # Messages ever added, including ones the cap has evicted; message offsets
+        # such as get_messages_since's are positions in this full sequence
+        self.total_messages = len(messages or ())
         self.start_time = datetime.now()
         self.is_active = True
+        # Per-agent queues that receive each new message as it is added
+        self.subscribers: Dict[str, "asyncio.Queue[ChatMessage]"] = {}
         
         # Handle created_at conversion
         if created_at is None:
             self.created_at = datetime.now().isoformat()
+        elif isinstance(created_at, datetime):
+            self.created_at = created_at.isoformat()
         else:
             self.created_at = created_at
     
@@ -179,16 +210,91 @@ class ChatSession:
             return
             
         self.messages.append(message)
-        logger.debug(f"Added message from {message.sender_name} to session {self.session_id}")
+        self.total_messages += 1
+        if self.subscribers:
+            self._publish(message)
+        logger.debug("Added message from %s to session %s", message.sender_name, self.session_id)
+    
+    def add_messages(self, messages: List[ChatMessage]) -> None:
+        """
+        Add several messages to the conversation history at once.
+        
+        Args:
+            messages: The ChatMessages to add, in order
+        """
+        self.messages.extend(messages)
+        self.total_messages += len(messages)
+        if self.subscribers:
+            for message in messages:
+                self._publish(message)
+        logger.debug("Added %d messages to session %s", len(messages), self.session_id)
+    
+    def subscribe(self, agent_id: str, maxsize: int = 0) -> "asyncio.Queue[ChatMessage]":
+        """
+        Subscribe an agent to messages added to this session.
+        
+        Every message added after subscribing is put on the returned queue, so
+        the agent can ``await queue.get()`` instead of polling the history.
+        Subscribing again with the same agent ID returns the existing queue.
+        
+        Args:
+            agent_id: ID of the subscribing agent
+            maxsize: Maximum queued messages (0 for unbounded); when a bounded
+                queue is full, new messages for that subscriber are dropped
+            
+        Returns:
+            The agent's message queue
+        """
+        queue = self.subscribers.get(agent_id)
+        if queue is None:
+            queue = self.subscribers[agent_id] = asyncio.Queue(maxsize=maxsize)
+        return queue
+    
+    def unsubscribe(self, agent_id: str) -> bool:
+        """
+        Stop delivering new messages to an agent.
+        
+        Args:
+            agent_id: ID of the subscribed agent
+            
+        Returns:
+            True if the agent was subscribed
+        """
+        return self.subscribers.pop(agent_id, None) is not None
+    
+    def _publish(self, message: ChatMessage) -> None:
+        """Put a message on every subscriber queue."""
+        for agent_id, queue in self.subscribers.items():
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"Subscriber queue for agent {agent_id} in session {self.session_id} is full, dropping message")
     
     def get_messages(self) -> List[ChatMessage]:
         """
         Get all messages in the session.
         
         Returns:
-            List of all ChatMessage objects in the session
+            List of all retained ChatMessage objects in the session, oldest first
+        """
+        return list(self.messages)
+    
+    def get_messages_since(self, offset: int) -> Iterator[ChatMessage]:
+        """
+        Iterate over the retained messages after the first offset ever added.
+        
+        Offsets count every message added to the session, so a poller that has
+        seen N messages still gets exactly the newer ones after the oldest have
+        been evicted.
+        
+        Args:
+            offset: Number of messages, counted from the start of the session, to skip
+            
+        Returns:
+            Iterator over the retained ChatMessage objects after offset, oldest first
         """
-        return self.messages
+        evicted = self.total_messages - len(self.messages)
+        return itertools.islice(self.messages, max(offset - evicted, 0), None)
     
     def get_messages_by_sender(self, sender_id: str) -> List[ChatMessage]:
         """
@@ -283,6 +389,21 @@ class ChatSession:
                 "is_active": False
             }
 
+    def to_orjson_bytes(self) -> bytes:
+        """
+        Serialize the session to JSON bytes.
+        
+        Uses orjson when it is installed and falls back to the stdlib json
+        encoder otherwise. All timestamps in to_dict() are already ISO strings,
+        so the encoder never has to handle datetime objects.
+        
+        Returns:
+            UTF-8 encoded JSON representation of the session
+        """
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(self.to_dict(), default=str).encode("utf-8")
+
     def get_session_info(self) -> Dict[str, Any]:
         """
         Get information about the session.
@@ -296,7 +417,7 @@ class ChatSession:
             return {
                 "session_id": self.session_id,
                 "start_time": self.start_time.isoformat(),
-                "message_count": len(self.messages),
+                "message_count": self.total_messages,
                 "unique_participants": len(unique_senders),
                 "is_active": self.is_active,
                 "metadata": self.metadata
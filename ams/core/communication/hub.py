@@ -6,19 +6,30 @@ between agents in collaboration sessions. It handles session creation, message p
 and history retrieval.
 """
 
+import asyncio
+import itertools
 import logging
+import sys
 import uuid
+from collections import ChainMap, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Deque, Dict, Iterator, List, Any, Mapping, Optional, Tuple
 
+from ..errors import SessionNotFoundException
 from ..registry.models import AgentMetadata
-from .chat_context import ChatMessage, ChatSession
+from .chat_context import ChatMessage, ChatSession, _intern
 
 logger = logging.getLogger(__name__)
 
+# Number of session shards in CommunicationHub (must be a power of two)
+_SESSION_SHARDS = 16
+
 class Message:
     """Represents a message in a collaboration session."""
     
+    __slots__ = ("content", "sender_id", "sender_name", "timestamp", "message_id", "metadata")
+    
     def __init__(
         self,
         content: str,
@@ -50,17 +61,20 @@ class Message:
 class Session:
     """Represents a collaboration session between agents."""
     
+    __slots__ = ("session_id", "task", "agents", "messages", "created_at", "active")
+    
     def __init__(
         self, 
         session_id: str,
         task: str,
         agents: List[AgentMetadata],
-        created_at: Optional[str] = None
+        created_at: Optional[str] = None,
+        max_messages: Optional[int] = None
     ):
         self.session_id = session_id
         self.task = task
         self.agents = agents
-        self.messages: List[Message] = []
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
         self.created_at = created_at or datetime.now().isoformat()
         self.active = True
     
@@ -92,11 +106,35 @@ class CommunicationHub:
     handling message routing between agents, session management, and history tracking.
     """
     
-    def __init__(self):
-        """Initialize a new CommunicationHub."""
-        self.sessions: Dict[str, ChatSession] = {}
+    def __init__(self, max_messages: Optional[int] = None):
+        """
+        Initialize a new CommunicationHub.
+        
+        Args:
+            max_messages: Optional cap on messages retained per session (None or 0 keeps all)
+        """
+        self.max_messages = max_messages or None
+        # Sessions are split across shards by hash(session_id) so each shard can later
+        # get its own lock without a global one
+        self._shards: List[Dict[str, ChatSession]] = [{} for _ in range(_SESSION_SHARDS)]
+        # agent_id -> (interned id, interned name) of the agents in current sessions,
+        # filled on session creation and pruned on session deletion
+        self.sender_identities: Dict[str, Tuple[str, str]] = {}
         logger.info("CommunicationHub initialized")
     
+    def _shard(self, session_id: str) -> Dict[str, ChatSession]:
+        """Return the shard that holds (or would hold) the given session."""
+        return self._shards[hash(session_id) & (_SESSION_SHARDS - 1)]
+    
+    @property
+    def sessions(self) -> Mapping[str, ChatSession]:
+        """Read-only view of all sessions by ID, across shards."""
+        return MappingProxyType(ChainMap(*self._shards))
+    
+    def iter_sessions(self) -> Iterator[ChatSession]:
+        """Iterate over all sessions across shards without building a combined dict."""
+        return itertools.chain.from_iterable(shard.values() for shard in self._shards)
+    
     def create_session(
         self, 
         task: str, 
@@ -119,17 +157,22 @@ class CommunicationHub:
             logger.error("Cannot create session with empty agents list")
             raise ValueError("Cannot create session with empty agents list")
             
-        session_id = str(uuid.uuid4())
+        session_id = sys.intern(str(uuid.uuid4()))
         
         try:
             # Extract agent IDs for metadata
             agent_ids = [agent.id for agent in agents]
             
+            # Cache interned sender identities so send_message can reuse them
+            for agent in agents:
+                self.sender_identities[agent.id] = (sys.intern(agent.id), sys.intern(agent.name))
+            
             # Create a new chat session
-            self.sessions[session_id] = ChatSession(
+            self._shard(session_id)[session_id] = ChatSession(
                 session_id=session_id,
                 metadata={"agents": agent_ids},
-                task=task
+                task=task,
+                max_messages=self.max_messages
             )
             
             # Add a system message to start the session
@@ -141,12 +184,71 @@ class CommunicationHub:
                 metadata={"type": "system", "action": "session_start"}
             )
             
-            logger.info(f"Created session {session_id} with {len(agents)} agents for task: {task}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Created session %s with %d agents for task: %s", session_id, len(agents), task)
             return session_id
         except Exception as e:
             logger.error(f"Error creating session: {str(e)}")
             raise
     
+    def _build_message(
+        self,
+        content: str,
+        sender_id: str,
+        sender_name: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> ChatMessage:
+        """
+        Create a chat message with sender role and framework resolved from metadata.
+        
+        Args:
+            content: The message content
+            sender_id: The ID of the sending agent
+            sender_name: The name of the sending agent
+            metadata: Optional metadata for the message
+            
+        Returns:
+            The created (not yet stored) message
+        """
+        # Determine sender role and framework for metadata
+        sender_role = "agent"
+        sender_framework = None
+        
+        if sender_id == "system":
+            sender_role = "system"
+        elif metadata and "type" in metadata:
+            msg_type = metadata["type"]
+            if msg_type == "system":
+                sender_role = "system"
+            
+            # Try to extract framework info if available
+            if "framework" in metadata:
+                sender_framework = metadata["framework"]
+        
+        sender_id = _intern(sender_id)
+        
+        # Reuse the cached interned identity strings for registered agents
+        identity = self.sender_identities.get(sender_id)
+        if identity is not None and identity[1] == sender_name:
+            sender_id, sender_name = identity
+        
+        # Update metadata with role and framework info
+        message_metadata = metadata.copy() if metadata else {}
+        message_metadata["sender_role"] = sender_role
+        if sender_framework:
+            message_metadata["sender_framework"] = sender_framework
+        
+        # Create a new chat message with all attributes properly set
+        return ChatMessage(
+            content=content,
+            sender_id=sender_id,
+            sender_name=sender_name,
+            metadata=message_metadata,
+            message_id=str(uuid.uuid4()),
+            sender_role=sender_role,
+            sender_framework=sender_framework
+        )
+    
     def send_message(
         self, 
         session_id: str, 
@@ -169,80 +271,85 @@ class CommunicationHub:
             The created message
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.sessions:
-            error_msg = f"Session {session_id} not found"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        session_id = sys.intern(session_id)
+        session = self._shard(session_id).get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            raise SessionNotFoundException(session_id)
         
         try:
-            # Determine sender role and framework for metadata
-            sender_role = "agent"
-            sender_framework = None
-            
-            if sender_id == "system":
-                sender_role = "system"
-            elif metadata and "type" in metadata:
-                msg_type = metadata["type"]
-                if msg_type == "system":
-                    sender_role = "system"
-                
-                # Try to extract framework info if available
-                if "framework" in metadata:
-                    sender_framework = metadata["framework"]
-            
-            # Update metadata with role and framework info
-            message_metadata = metadata.copy() if metadata else {}
-            message_metadata["sender_role"] = sender_role
-            if sender_framework:
-                message_metadata["sender_framework"] = sender_framework
-            
-            # Generate a unique message ID
-            message_id = str(uuid.uuid4())
-            
-            # Create a new chat message with all attributes properly set
-            message = ChatMessage(
-                content=content,
-                sender_id=sender_id,
-                sender_name=sender_name,
-                metadata=message_metadata,
-                message_id=message_id,
-                sender_role=sender_role,
-                sender_framework=sender_framework
-            )
+            message = self._build_message(content, sender_id, sender_name, metadata)
             
             # Add the message to the session
-            self.sessions[session_id].add_message(message)
-            logger.info(f"Message sent in session {session_id} by {sender_name} [{sender_id}]")
+            session.add_message(message)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Message sent in session %s by %s [%s]", session_id, sender_name, sender_id)
             
             return message
         except Exception as e:
             logger.error(f"Error sending message in session {session_id}: {str(e)}")
             raise
     
-    def get_session_history(self, session_id: str) -> List[Dict[str, Any]]:
+    def send_messages_bulk(
+        self,
+        session_id: str,
+        messages: List[Tuple[str, str, str, Optional[Dict[str, Any]]]]
+    ) -> List[ChatMessage]:
+        """
+        Send several messages in a session with a single lookup and log entry.
+        
+        Args:
+            session_id: The session ID
+            messages: (content, sender_id, sender_name, metadata) tuples, in send order
+            
+        Returns:
+            The created messages
+            
+        Raises:
+            SessionNotFoundException: If the session doesn't exist
+        """
+        session = self._shard(session_id).get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            raise SessionNotFoundException(session_id)
+        
+        try:
+            created = [self._build_message(*args) for args in messages]
+            session.add_messages(created)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%d messages sent in session %s", len(created), session_id)
+            return created
+        except Exception as e:
+            logger.error(f"Error sending messages in session {session_id}: {str(e)}")
+            raise
+    
+    def get_session_history(self, session_id: str, since: int = 0) -> List[Dict[str, Any]]:
         """
         Get the message history for a session.
         
         Args:
             session_id: The session ID
+            since: Number of messages, counted from the start of the session, to
+                skip, so pollers only receive new ones; evicted messages still count
             
         Returns:
-            List of messages in the session
+            List of the retained messages after the first since
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.sessions:
-            error_msg = f"Session {session_id} not found"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        session = self._shard(session_id).get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            raise SessionNotFoundException(session_id)
         
         try:
             # Convert all messages to dictionaries
             messages = []
-            for msg in self.sessions[session_id].get_messages():
+            # Skipped messages are never converted to dictionaries
+            for msg in session.get_messages_since(since):
                 try:
                     msg_dict = msg.to_dict()
                     messages.append(msg_dict)
@@ -261,12 +368,36 @@ class CommunicationHub:
                     }
                     messages.append(safe_dict)
             
-            logger.debug(f"Retrieved {len(messages)} messages from session {session_id}")
+            logger.debug("Retrieved %d messages from session %s", len(messages), session_id)
             return messages
         except Exception as e:
             logger.error(f"Error retrieving session history: {str(e)}")
             return []  # Return empty list on error
     
+    def get_session_stats(self, session_id: str) -> Tuple[int, Optional[str]]:
+        """
+        Get the message count and last message time of a session without
+        copying its history.
+        
+        Args:
+            session_id: The session ID
+            
+        Returns:
+            Tuple of (messages ever added, including evicted ones, ISO timestamp
+            of the last message or None)
+            
+        Raises:
+            SessionNotFoundException: If the session doesn't exist
+        """
+        session = self.get_session(session_id)
+        if not session.messages:
+            return session.total_messages, None
+        
+        last_timestamp = session.messages[-1].timestamp
+        if isinstance(last_timestamp, datetime):
+            last_timestamp = last_timestamp.isoformat()
+        return session.total_messages, str(last_timestamp)
+    
     def get_session(self, session_id: str) -> ChatSession:
         """
         Get a session by ID.
@@ -278,14 +409,50 @@ class CommunicationHub:
             The chat session
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.sessions:
-            error_msg = f"Session {session_id} not found"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        session = self._shard(session_id).get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            raise SessionNotFoundException(session_id)
         
-        return self.sessions[session_id]
+        return session
+    
+    def subscribe(self, session_id: str, agent_id: str, maxsize: int = 0) -> "asyncio.Queue[ChatMessage]":
+        """
+        Subscribe an agent to new messages in a session.
+        
+        Messages sent with send_message are pushed to the returned queue, so the
+        agent can await them instead of polling get_session_history.
+        
+        Args:
+            session_id: The session ID
+            agent_id: ID of the subscribing agent
+            maxsize: Maximum queued messages for this agent (0 for unbounded)
+        
+        Returns:
+            The agent's message queue
+        
+        Raises:
+            SessionNotFoundException: If the session doesn't exist
+        """
+        return self.get_session(session_id).subscribe(_intern(agent_id), maxsize)
+    
+    def unsubscribe(self, session_id: str, agent_id: str) -> bool:
+        """
+        Stop delivering a session's messages to an agent.
+        
+        Args:
+            session_id: The session ID
+            agent_id: ID of the subscribed agent
+        
+        Returns:
+            True if the agent was subscribed
+        
+        Raises:
+            SessionNotFoundException: If the session doesn't exist
+        """
+        return self.get_session(session_id).unsubscribe(agent_id)
     
     def get_formatted_history(
         self, 
@@ -307,18 +474,18 @@ class CommunicationHub:
             Formatted conversation history
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.sessions:
-            error_msg = f"Session {session_id} not found"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        session = self._shard(session_id).get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            raise SessionNotFoundException(session_id)
         
         try:
             # Convert list to set if provided
             exclude_senders = set(exclude_sender_ids) if exclude_sender_ids else None
             
-            return self.sessions[session_id].get_formatted_history(
+            return session.get_formatted_history(
                 exclude_senders=exclude_senders,
                 include_framework=include_framework,
                 max_messages=max_messages
@@ -338,16 +505,16 @@ class CommunicationHub:
             True if successful, False otherwise
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.sessions:
-            error_msg = f"Session {session_id} not found"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
+        session = self._shard(session_id).get(session_id)
+        if session is None:
+            logger.error(f"Session {session_id} not found")
+            raise SessionNotFoundException(session_id)
         
         try:
             # Mark the session as inactive instead of removing it
-            self.sessions[session_id].is_active = False
+            session.is_active = False
             
             # Add a system message about termination
             self.send_message(
@@ -358,7 +525,8 @@ class CommunicationHub:
                 metadata={"type": "system", "action": "session_terminate"}
             )
             
-            logger.info(f"Terminated session {session_id}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Terminated session %s", session_id)
             return True
         except Exception as e:
             logger.error(f"Error terminating session {session_id}: {str(e)}")
@@ -376,7 +544,7 @@ class CommunicationHub:
         """
         try:
             sessions = []
-            for session_id, session in self.sessions.items():
+            for session in self.iter_sessions():
                 # Skip inactive sessions unless requested
                 if not include_inactive and not session.is_active:
                     continue
@@ -402,12 +570,21 @@ class CommunicationHub:
         Returns:
             True if successful, False otherwise
         """
-        if session_id not in self.sessions:
-            logger.warning(f"Attempted to delete non-existent session {session_id}")
-            return False
-            
         try:
-            del self.sessions[session_id]
+            session = self._shard(session_id).pop(session_id, None)
+            if session is None:
+                logger.warning(f"Attempted to delete non-existent session {session_id}")
+                return False
+            
+            # Forget the identities of agents no remaining session includes
+            agent_ids = set(session.metadata.get("agents", ())).intersection(self.sender_identities)
+            if agent_ids:
+                for other in self.iter_sessions():
+                    agent_ids.difference_update(other.metadata.get("agents", ()))
+                    if not agent_ids:
+                        break
+                for agent_id in agent_ids:
+                    del self.sender_identities[agent_id]
             logger.info(f"Deleted session {session_id} from memory")
             return True
         except Exception as e:
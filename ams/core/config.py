@@ -7,16 +7,17 @@ and provides default values.
 """
 
 import os
+import copy
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, Union
 from enum import Enum
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 
-import yaml
 from dotenv import load_dotenv
 
-# Load environment variables from .env file if it exists
+# Load environment variables from .env file if it exists, before anything
+# reads the AMS_* settings (including apps imported without load_config)
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,10 @@ logger = logging.getLogger(__name__)
 # Environment variable prefix for all AMS settings
 ENV_PREFIX = "AMS_"
 
+# Resolved path -> ((mtime_ns, size, AMS_* environment), parsed config); one entry
+# per file, replaced when the file or the environment changes
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[Any, ...], "Config"]] = {}
+
 
 class LogLevel(str, Enum):
     """Supported log levels"""
@@ -34,52 +39,93 @@ class LogLevel(str, Enum):
     CRITICAL = "critical"
 
 
+# Strings accepted as true for boolean environment variables, in their common
+# casings so the usual values match without lowercasing
+_TRUTHY = frozenset(("true", "True", "TRUE", "1", "yes", "Yes", "YES"))
+
+
+def _env_snapshot() -> Dict[str, str]:
+    """Return all AMS_* environment variables in one pass, keyed without the prefix"""
+    prefix_len = len(ENV_PREFIX)
+    return {k[prefix_len:]: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable"""
+    # Only unusual casings such as "tRuE" pay for the lowercased copy
+    return value in _TRUTHY or value.lower() in _TRUTHY
+
+
+def _parse_log_level(value: str) -> "LogLevel":
+    """Parse a log level environment variable"""
+    return LogLevel(value.lower())
+
+
+def _parse_optional_int(value: str) -> Optional[int]:
+    """Parse an integer environment variable where 0 means unset"""
+    return int(value) or None
+
+
+def _env_field(key: str, parse: Callable[[str], Any], default: Any) -> Any:
+    """
+    Declare a config field that defaults to the AMS_<key> environment variable
+    
+    Directly constructed sections read the variable when the field is not given;
+    from_env fills every field from a single snapshot instead.
+    """
+    def default_factory() -> Any:
+        value = os.environ.get(f"{ENV_PREFIX}{key}")
+        return default if value is None else parse(value)
+    return field(default_factory=default_factory, metadata={"env": (key, parse, default)})
+
+
+def _env_values(env: Dict[str, str], section: type, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve every field of a config section from overrides, then env, then its default"""
+    values = dict(overrides)
+    for f in fields(section):
+        if f.name not in values:
+            key, parse, default = f.metadata["env"]
+            values[f.name] = parse(env[key]) if key in env else default
+    return values
+
+
+_SectionT = TypeVar("_SectionT", bound="_EnvSection")
+
+
+class _EnvSection:
+    """Base for config sections whose fields are declared with _env_field"""
+    
+    @classmethod
+    def from_env(cls: Type[_SectionT], env: Optional[Dict[str, str]] = None, **overrides: Any) -> _SectionT:
+        """Create the config from AMS_* environment variables, with explicit overrides"""
+        env = _env_snapshot() if env is None else env
+        return cls(**_env_values(env, cls, overrides))
+
+
 @dataclass
-class ServerConfig:
+class ServerConfig(_EnvSection):
     """Configuration for the HTTP server"""
-    host: str = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}HOST", "0.0.0.0")
-    )
-    port: int = field(
-        default_factory=lambda: int(os.getenv(f"{ENV_PREFIX}PORT", "8000"))
-    )
-    reload: bool = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}RELOAD", "false").lower() in ("true", "1", "yes")
-    )
-    log_level: LogLevel = field(
-        default_factory=lambda: LogLevel(os.getenv(f"{ENV_PREFIX}LOG_LEVEL", "info").lower())
-    )
-    workers: int = field(
-        default_factory=lambda: int(os.getenv(f"{ENV_PREFIX}WORKERS", "1"))
-    )
+    host: str = _env_field("HOST", str, "0.0.0.0")
+    port: int = _env_field("PORT", int, 8000)
+    reload: bool = _env_field("RELOAD", _parse_bool, False)
+    log_level: LogLevel = _env_field("LOG_LEVEL", _parse_log_level, LogLevel.INFO)
+    workers: int = _env_field("WORKERS", int, 1)
 
 
 @dataclass
-class DatabaseConfig:
+class DatabaseConfig(_EnvSection):
     """Configuration for database connections"""
-    url: str = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}DATABASE_URL", "sqlite:///ams.db")
-    )
-    echo: bool = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}DATABASE_ECHO", "false").lower() in ("true", "1", "yes")
-    )
-    pool_size: int = field(
-        default_factory=lambda: int(os.getenv(f"{ENV_PREFIX}DATABASE_POOL_SIZE", "5"))
-    )
+    url: str = _env_field("DATABASE_URL", str, "sqlite:///ams.db")
+    echo: bool = _env_field("DATABASE_ECHO", _parse_bool, False)
+    pool_size: int = _env_field("DATABASE_POOL_SIZE", int, 5)
 
 
 @dataclass
-class SecurityConfig:
+class SecurityConfig(_EnvSection):
     """Configuration for security features"""
-    secret_key: str = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}SECRET_KEY", "supersecretkey")
-    )
-    token_expiration: int = field(
-        default_factory=lambda: int(os.getenv(f"{ENV_PREFIX}TOKEN_EXPIRATION", "1440"))
-    )
-    enable_auth: bool = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}ENABLE_AUTH", "false").lower() in ("true", "1", "yes")
-    )
+    secret_key: str = _env_field("SECRET_KEY", str, "supersecretkey")
+    token_expiration: int = _env_field("TOKEN_EXPIRATION", int, 1440)
+    enable_auth: bool = _env_field("ENABLE_AUTH", _parse_bool, False)
     
     def __post_init__(self):
         """Validate that the secret key is strong enough"""
@@ -90,32 +136,42 @@ class SecurityConfig:
 
 
 @dataclass
-class LLMConfig:
+class LLMConfig(_EnvSection):
     """Configuration for LLM providers"""
-    provider: str = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}LLM_PROVIDER", "openai")
-    )
-    api_key: Optional[str] = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}LLM_API_KEY")
-    )
-    default_model: str = field(
-        default_factory=lambda: os.getenv(f"{ENV_PREFIX}LLM_DEFAULT_MODEL", "gpt-4")
-    )
-    temperature: float = field(
-        default_factory=lambda: float(os.getenv(f"{ENV_PREFIX}LLM_TEMPERATURE", "0.7"))
-    )
-    max_tokens: Optional[int] = field(
-        default_factory=lambda: int(os.getenv(f"{ENV_PREFIX}LLM_MAX_TOKENS", "0")) or None
-    )
+    provider: str = _env_field("LLM_PROVIDER", str, "openai")
+    api_key: Optional[str] = _env_field("LLM_API_KEY", str, None)
+    default_model: str = _env_field("LLM_DEFAULT_MODEL", str, "gpt-4")
+    temperature: float = _env_field("LLM_TEMPERATURE", float, 0.7)
+    max_tokens: Optional[int] = _env_field("LLM_MAX_TOKENS", _parse_optional_int, None)
+    max_history_messages: Optional[int] = _env_field("LLM_MAX_HISTORY_MESSAGES", _parse_optional_int, None)
 
 
 @dataclass
 class Config:
     """Main configuration for the AMS system"""
-    server: ServerConfig = field(default_factory=ServerConfig)
-    database: DatabaseConfig = field(default_factory=DatabaseConfig)
-    security: SecurityConfig = field(default_factory=SecurityConfig)
-    llm: LLMConfig = field(default_factory=LLMConfig)
+    server: ServerConfig = field(default_factory=ServerConfig.from_env)
+    database: DatabaseConfig = field(default_factory=DatabaseConfig.from_env)
+    security: SecurityConfig = field(default_factory=SecurityConfig.from_env)
+    llm: LLMConfig = field(default_factory=LLMConfig.from_env)
+    
+    @classmethod
+    def from_env(cls, env: Optional[Dict[str, str]] = None) -> "Config":
+        """
+        Create a config from a single snapshot of the AMS_* environment variables
+        
+        Args:
+            env: Optional pre-computed snapshot (keys without the AMS_ prefix)
+            
+        Returns:
+            A Config object with env-provided settings applied over the defaults
+        """
+        env = _env_snapshot() if env is None else env
+        return cls(
+            server=ServerConfig.from_env(env),
+            database=DatabaseConfig.from_env(env),
+            security=SecurityConfig.from_env(env),
+            llm=LLMConfig.from_env(env)
+        )
     
     @classmethod
     def from_file(cls, file_path: Union[str, Path]) -> "Config":
@@ -131,28 +187,60 @@ class Config:
         path = Path(file_path)
         if not path.exists():
             logger.warning(f"Config file {file_path} not found, using default settings")
-            return cls()
+            return cls.from_env()
+        
+        # Unset fields fall back to AMS_* env vars, so those are part of the key
+        env = _env_snapshot()
+        env_items = tuple(sorted(env.items()))
+        st = path.stat()
+        cache_key = str(path.resolve())
+        stamp = (st.st_mtime_ns, st.st_size, env_items)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1].copy()
         
         try:
-            with open(path, "r") as f:
-                config_data = yaml.safe_load(f)
+            # Read bytes so libyaml decodes UTF-8 itself
+            raw = path.read_bytes()
+            
+            # Imported lazily so processes that never read a config file skip it;
+            # prefer the libyaml C parser when PyYAML was built with it
+            import yaml
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            config_data = yaml.load(raw, Loader=loader)
             
             # Create config based on the loaded data
-            server_config = ServerConfig(**config_data.get("server", {}))
-            database_config = DatabaseConfig(**config_data.get("database", {}))
-            security_config = SecurityConfig(**config_data.get("security", {}))
-            llm_config = LLMConfig(**config_data.get("llm", {}))
+            server_config = ServerConfig.from_env(env, **config_data.get("server", {}))
+            database_config = DatabaseConfig.from_env(env, **config_data.get("database", {}))
+            security_config = SecurityConfig.from_env(env, **config_data.get("security", {}))
+            llm_config = LLMConfig.from_env(env, **config_data.get("llm", {}))
             
-            return cls(
+            loaded = cls(
                 server=server_config,
                 database=database_config,
                 security=security_config,
                 llm=llm_config
             )
+            _CONFIG_CACHE[cache_key] = (stamp, loaded)
+            return loaded.copy()
         except Exception as e:
             logger.error(f"Error loading config from {file_path}: {e}")
             logger.warning("Using default settings")
-            return cls()
+            return cls.from_env(env)
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all configs cached by from_file"""
+        _CONFIG_CACHE.clear()
+    
+    def copy(self) -> "Config":
+        """Return a copy whose section objects can be mutated independently"""
+        return type(self)(
+            server=copy.copy(self.server),
+            database=copy.copy(self.database),
+            security=copy.copy(self.security),
+            llm=copy.copy(self.llm)
+        )
     
     def setup_logging(self) -> None:
         """Configure the logging system based on settings"""
@@ -172,7 +260,7 @@ class Config:
 
 
 # Create a global config instance
-config = Config()
+config = Config.from_env()
 
 
 def load_config(file_path: Optional[Union[str, Path]] = None) -> Config:
@@ -26,16 +26,28 @@ class AMSBaseException(Exception):
     ):
         self.message = message
         self.code = code
-        self.details = details or {}
+        # Most exceptions carry no details, so the dict is only created when first used
+        self._details = details
         super().__init__(self.message)
 
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Additional details about the error, as a mutable dict."""
+        if self._details is None:
+            self._details = {}
+        return self._details
+
+    @details.setter
+    def details(self, value: Optional[Dict[str, Any]]) -> None:
+        self._details = value
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the exception to a dictionary for API responses."""
         return {
             "error": {
                 "code": self.code,
                 "message": self.message,
-                "details": self.details
+                "details": dict(self._details) if self._details else {}
             }
         }
 
@@ -102,8 +114,13 @@ class SupervisorException(AMSBaseException):
         super().__init__(message, code="SUPERVISOR_ERROR", details=details)
 
 
-class SessionNotFoundException(SupervisorException):
-    """Exception raised when a session is not found."""
+class SessionNotFoundException(SupervisorException, ValueError):
+    """
+    Exception raised when a session is not found.
+    
+    Also a ValueError, which the hub and supervisor raised for unknown sessions
+    before this exception existed, so existing handlers keep working.
+    """
     def __init__(self, session_id: str, details: Optional[Dict[str, Any]] = None):
         message = f"Session with ID '{session_id}' not found"
         super().__init__(message, details=details)
@@ -7,6 +7,7 @@ management of agent information.
 
 Classes:
 - AgentRegistry: Abstract base class defining the registry interface
+- AsyncAgentRegistry: Registry base with thread-offloaded async wrappers for I/O-backed stores
 - InMemoryAgentRegistry: In-memory implementation of the agent registry
 - AgentMetadata: Data model for agent metadata
 - AgentCapability: Representation of agent capabilities
@@ -14,12 +15,13 @@ Classes:
 - AgentStatus: Enumeration of possible agent states
 """
 
-from .base import AgentRegistry
+from .base import AgentRegistry, AsyncAgentRegistry
 from .memory import InMemoryAgentRegistry
 from .models import AgentMetadata, AgentCapability, AgentFramework, AgentStatus
 
 __all__ = [
     "AgentRegistry",
+    "AsyncAgentRegistry",
     "InMemoryAgentRegistry",
     "AgentMetadata",
     "AgentCapability",
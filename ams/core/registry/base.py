@@ -1,34 +1,85 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from .models import AgentMetadata, AgentStatus
 
 class AgentRegistry(ABC):
+    """
+    Synchronous registry interface.
+    
+    In-memory implementations answer from local data structures, so the
+    interface is plain sync methods rather than coroutines.
+    """
     @abstractmethod
-    async def register_agent(self, agent: AgentMetadata) -> str:
+    def register_agent(self, agent: AgentMetadata) -> str:
         """Register a new agent in the registry."""
         pass
 
     @abstractmethod
-    async def get_agent(self, agent_id: str) -> Optional[AgentMetadata]:
+    def get_agent(self, agent_id: str) -> Optional[AgentMetadata]:
         """Retrieve an agent by its ID."""
         pass
 
     @abstractmethod
-    async def list_agents(self) -> List[AgentMetadata]:
+    def list_agents(self) -> List[AgentMetadata]:
         """List all registered agents."""
         pass
 
     @abstractmethod
-    async def update_agent_status(self, agent_id: str, status: AgentStatus) -> bool:
+    def update_agent_status(self, agent_id: str, status: AgentStatus) -> bool:
         """Update the status of an agent."""
         pass
 
     @abstractmethod
-    async def delete_agent(self, agent_id: str) -> bool:
+    def delete_agent(self, agent_id: str) -> bool:
         """Remove an agent from the registry."""
         pass
 
     @abstractmethod
-    async def find_agents_by_capability(self, capability_name: str) -> List[AgentMetadata]:
+    def find_agents_by_capability(self, capability_name: str) -> List[AgentMetadata]:
         """Find agents that have a specific capability."""
-        pass 
\ No newline at end of file
+        pass
+
+    def find_agents_by_capabilities(self, capability_names: Iterable[str]) -> List[AgentMetadata]:
+        """Find agents that have any of the given capabilities, without duplicates."""
+        agents = {}
+        for capability_name in capability_names:
+            for agent in self.find_agents_by_capability(capability_name):
+                agents.setdefault(agent.id, agent)
+        return list(agents.values())
+
+
+class AsyncAgentRegistry(AgentRegistry):
+    """
+    Registry whose sync methods perform blocking I/O (e.g. a database).
+    
+    Adds awaitable counterparts that run the sync methods in a worker thread
+    so async callers do not block the event loop.
+    """
+    async def register_agent_async(self, agent: AgentMetadata) -> str:
+        """Register a new agent without blocking the event loop."""
+        return await asyncio.to_thread(self.register_agent, agent)
+
+    async def get_agent_async(self, agent_id: str) -> Optional[AgentMetadata]:
+        """Retrieve an agent by its ID without blocking the event loop."""
+        return await asyncio.to_thread(self.get_agent, agent_id)
+
+    async def list_agents_async(self) -> List[AgentMetadata]:
+        """List all registered agents without blocking the event loop."""
+        return await asyncio.to_thread(self.list_agents)
+
+    async def update_agent_status_async(self, agent_id: str, status: AgentStatus) -> bool:
+        """Update the status of an agent without blocking the event loop."""
+        return await asyncio.to_thread(self.update_agent_status, agent_id, status)
+
+    async def delete_agent_async(self, agent_id: str) -> bool:
+        """Remove an agent from the registry without blocking the event loop."""
+        return await asyncio.to_thread(self.delete_agent, agent_id)
+
+    async def find_agents_by_capability_async(self, capability_name: str) -> List[AgentMetadata]:
+        """Find agents that have a specific capability without blocking the event loop."""
+        return await asyncio.to_thread(self.find_agents_by_capability, capability_name)
+
+    async def find_agents_by_capabilities_async(self, capability_names: Iterable[str]) -> List[AgentMetadata]:
+        """Find agents that have any of the given capabilities without blocking the event loop."""
+        return await asyncio.to_thread(self.find_agents_by_capabilities, capability_names)
@@ -5,12 +5,23 @@ This module provides a registry for agent capabilities and a semantic matching s
 for determining which capabilities are required for a given task using LLM.
 """
 
+import asyncio
+import hashlib
+import heapq
 import json
 import logging
-from typing import Dict, Any, List, Set, Optional
+import operator
+import re
+from typing import Dict, Any, List, Set, Optional, Tuple
 
 import openai
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+from ..semantic_cache import SemanticCache
 from .models import AgentMetadata
 
 logger = logging.getLogger(__name__)
@@ -18,6 +29,48 @@ logger = logging.getLogger(__name__)
 # Type for task analysis result
 TaskAnalysisResult = Dict[str, Any]
 
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Punctuation stripped when comparing tasks to registered examples
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+
+
+def _normalize_task(task: str) -> str:
+    """Lowercase a task and strip punctuation and extra whitespace for example matching."""
+    return " ".join(_PUNCTUATION_RE.sub(" ", task.lower()).split())
+
+# A complete "name": number pair in the streamed JSON object. The lookahead
+# waits for the delimiter so a number split across chunks is not cut short.
+_SCORE_PAIR_RE = re.compile(r'"([^"\\]+)"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)(?=\s*[,}])')
+
+# Batch API statuses after which a batch will not progress further
+_BATCH_TERMINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
+# Scoring rubric sent as the first system message. It never changes, so it
+# forms a stable prefix for the provider's automatic prompt caching.
+_STATIC_RUBRIC = """
+You are a task analyzer that identifies which capabilities are required for a given task.
+Analyze the task and determine which of the available capabilities listed in the next message are needed to complete it.
+
+For each capability, assign a score between 0.0 and 1.0:
+- 0.0: Not required at all for this task
+- 0.1-0.3: Slightly relevant
+- 0.4-0.6: Moderately relevant
+- 0.7-0.9: Highly relevant
+- 1.0: Essential, cannot complete the task without this capability
+
+Return your analysis as a JSON object with capability names as keys and scores as values.
+Example: {"text_generation": 0.9, "research": 0.7, "code_generation": 0.0}
+"""
+
 class CapabilityRegistry:
     """
     Registry for agent capabilities with semantic matching.
@@ -26,18 +79,43 @@ class CapabilityRegistry:
     methods to match capabilities to tasks using LLM-based semantic matching.
     """
     
-    def __init__(self, llm_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        llm_config: Optional[Dict[str, Any]] = None,
+        semantic_cache_threshold: Optional[float] = None,
+        semantic_cache_size: int = 256,
+        semantic_cache_ttl: float = 3600.0
+    ):
         """
         Initialize a capability registry.
         
         Args:
             llm_config: Configuration for the LLM used for capability matching
+            semantic_cache_threshold: Cosine similarity at or above which a previous
+                task's scores are reused for a new task (None disables the cache)
+            semantic_cache_size: Maximum number of cached task analyses
+            semantic_cache_ttl: Seconds a cached task analysis stays valid
         """
         self.capabilities: Dict[str, Dict[str, Any]] = {}
+        # Bumped whenever capabilities change; the cached catalog prompt is
+        # only reused while its version matches
+        self._caps_version = 0
+        self._catalog_cache: Tuple[Optional[Tuple[str, str]], int] = (None, -1)
+        self._example_cache: Tuple[Optional[Dict[str, Dict[str, float]]], int] = (None, -1)
         self.llm_config = llm_config or {
             "model": "gpt-4o",
             "temperature": 0.1
         }
+        
+        # Semantic cache of task prompt embedding -> scores, reset when capabilities change
+        self._semantic_cache: Optional[SemanticCache] = None
+        if semantic_cache_threshold is not None:
+            self._semantic_cache = SemanticCache(
+                threshold=semantic_cache_threshold,
+                max_size=semantic_cache_size,
+                ttl=semantic_cache_ttl
+            )
+        self._semantic_cache_version = 0
     
     def register_capability(
         self, 
@@ -56,10 +134,16 @@ class CapabilityRegistry:
         if capability_name in self.capabilities:
             logger.warning(f"Capability '{capability_name}' is already registered. Overwriting.")
         
+        # Keep the first spelling of examples that normalize to the same task
+        unique_examples: Dict[str, str] = {}
+        for example in examples or ():
+            unique_examples.setdefault(_normalize_task(example), example)
+        
         self.capabilities[capability_name] = {
             "description": description,
-            "examples": examples or []
+            "examples": list(unique_examples.values())
         }
+        self._caps_version += 1
         
         logger.info(f"Registered capability: {capability_name}")
     
@@ -75,6 +159,7 @@ class CapabilityRegistry:
         """
         if capability_name in self.capabilities:
             del self.capabilities[capability_name]
+            self._caps_version += 1
             logger.info(f"Unregistered capability: {capability_name}")
             return True
         
@@ -104,6 +189,105 @@ class CapabilityRegistry:
             return self.capabilities[capability_name]["description"]
         return None
     
+    def _get_catalog_prompt(self) -> Tuple[str, str]:
+        """
+        Get the capability catalog message and its prompt cache key, rebuilding
+        them only when the registered capabilities have changed.
+        
+        Returns:
+            Tuple of (catalog message content, prompt cache key)
+        """
+        cached, version = self._catalog_cache
+        if cached is not None and version == self._caps_version:
+            return cached
+        
+        # Create capability descriptions for the prompt
+        capability_descriptions = "\n".join(
+            f"- {name}: {data['description']}" 
+            for name, data in self.capabilities.items()
+        )
+        catalog_prompt = f"Available capabilities:\n{capability_descriptions}"
+        cache_key = "ams-caps-" + hashlib.blake2b(catalog_prompt.encode("utf-8"), digest_size=8).hexdigest()
+        
+        self._catalog_cache = ((catalog_prompt, cache_key), self._caps_version)
+        return catalog_prompt, cache_key
+    
+    def _get_example_index(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the normalized example task -> capability scores index, rebuilding
+        it only when the registered capabilities have changed.
+        
+        Returns:
+            Dictionary mapping normalized example tasks to the scores of the
+            capabilities that list them
+        """
+        cached, version = self._example_cache
+        if cached is not None and version == self._caps_version:
+            return cached
+        
+        index: Dict[str, Dict[str, float]] = {}
+        for name, data in self.capabilities.items():
+            for example in data["examples"]:
+                index.setdefault(_normalize_task(example), {})[name] = 1.0
+        
+        self._example_cache = (index, self._caps_version)
+        return index
+    
+    def _build_messages(
+        self,
+        task: str,
+        task_analysis: Optional[TaskAnalysisResult] = None
+    ) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Build the chat messages for a capability analysis request.
+        
+        Args:
+            task: The task description
+            task_analysis: Optional additional task analysis information
+            
+        Returns:
+            Tuple of (chat messages, prompt cache key)
+        """
+        catalog_prompt, cache_key = self._get_catalog_prompt()
+        
+        # Prepare the user prompt
+        user_prompt = f"Task: {task}"
+        if task_analysis:
+            # Include any additional task analysis if available
+            user_prompt += f"\n\nAdditional analysis: {_dumps(task_analysis)}"
+        
+        # Static rubric first, then the catalog, then the task, so
+        # requests share the longest possible cached prefix
+        messages = [
+            {"role": "system", "content": _STATIC_RUBRIC},
+            {"role": "system", "content": catalog_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        return messages, cache_key
+    
+    def _scan_scores(self, text: str, pos: int, scores: Dict[str, float]) -> int:
+        """
+        Validate complete "name": score pairs in text from pos onwards into scores.
+        
+        Args:
+            text: Response text received so far
+            pos: Offset where the previous scan stopped
+            scores: Dictionary that valid scores are added to
+            
+        Returns:
+            Offset to resume scanning from once more text arrives
+        """
+        for match in _SCORE_PAIR_RE.finditer(text, pos):
+            pos = match.end()
+            capability, score = match.group(1), float(match.group(2))
+            if capability not in self.capabilities:
+                continue
+            if score < 0 or score > 1:
+                logger.warning(f"Invalid score for capability '{capability}': {score}. Setting to 0.0")
+                score = 0.0
+            scores[capability] = score
+        return pos
+    
     async def analyze_capabilities_with_llm(
         self, 
         task: str, 
@@ -123,70 +307,37 @@ class CapabilityRegistry:
             logger.warning("No capabilities registered. Cannot analyze task requirements.")
             return {}
         
-        # Create capability descriptions for the prompt
-        capability_descriptions = "\n".join([
-            f"- {name}: {data['description']}" 
-            for name, data in self.capabilities.items()
-        ])
+        # A task that is one of the registered examples needs no LLM call
+        example_scores = self._get_example_index().get(_normalize_task(task))
+        if example_scores is not None:
+            logger.info(f"Capability analysis for task (matched example): {example_scores}")
+            return dict(example_scores)
         
-        # Create the system prompt
-        system_prompt = f"""
-        You are a task analyzer that identifies which capabilities are required for a given task.
-        Analyze the task and determine which of the following capabilities are needed to complete it.
-
-        Available capabilities:
-        {capability_descriptions}
-
-        For each capability, assign a score between 0.0 and 1.0:
-        - 0.0: Not required at all for this task
-        - 0.1-0.3: Slightly relevant
-        - 0.4-0.6: Moderately relevant
-        - 0.7-0.9: Highly relevant
-        - 1.0: Essential, cannot complete the task without this capability
-
-        Return your analysis as a JSON object with capability names as keys and scores as values.
-        Example: {{"text_generation": 0.9, "research": 0.7, "code_generation": 0.0}}
-        """
+        messages, cache_key = self._build_messages(task, task_analysis)
         
-        # Prepare the user prompt
-        user_prompt = f"Task: {task}"
-        if task_analysis:
-            # Include any additional task analysis if available
-            user_prompt += f"\n\nAdditional analysis: {json.dumps(task_analysis, indent=2)}"
+        # Near-duplicate tasks get the scores of an earlier analysis
+        embedding = None
+        semantic_cache = self._semantic_cache
+        if semantic_cache is not None:
+            # Scores computed against a different set of capabilities are stale
+            if self._semantic_cache_version != self._caps_version:
+                semantic_cache.clear()
+                self._semantic_cache_version = self._caps_version
+            semantic_cache.embedding_model = self.llm_config.get("embedding_model", "text-embedding-3-small")
+            embedding = await asyncio.to_thread(semantic_cache.embed, messages[-1]["content"])
+            if embedding is not None:
+                cached_scores = semantic_cache.lookup(embedding)
+                if cached_scores is not None:
+                    logger.info(f"Capability analysis for task (semantic cache hit): {cached_scores}")
+                    return dict(cached_scores)
         
         try:
-            response = openai.chat.completions.create(
-                model=self.llm_config.get("model", "gpt-4o"),
-                temperature=self.llm_config.get("temperature", 0.1),
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+            # The OpenAI client blocks while streaming, so run it off the event
+            # loop to let concurrent analyses overlap their network waits
+            capability_scores = await asyncio.to_thread(self._stream_scores, messages, cache_key)
             
-            # Extract the JSON response
-            content = response.choices[0].message.content
-            capability_scores = {}
-            
-            try:
-                capability_scores = json.loads(content)
-                
-                # Validate the scores - ensure they're between 0 and 1
-                for capability, score in capability_scores.items():
-                    if not isinstance(score, (int, float)) or score < 0 or score > 1:
-                        logger.warning(f"Invalid score for capability '{capability}': {score}. Setting to 0.0")
-                        capability_scores[capability] = 0.0
-                
-                # Filter out capabilities that aren't registered
-                capability_scores = {
-                    name: score for name, score in capability_scores.items() 
-                    if name in self.capabilities
-                }
-                
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse LLM response as JSON: {content}")
-                # Extract scores using a fallback approach if JSON parsing fails
-                capability_scores = self._extract_scores_from_text(content)
+            if embedding is not None and capability_scores:
+                semantic_cache.store(embedding, dict(capability_scores))
             
             logger.info(f"Capability analysis for task: {capability_scores}")
             return capability_scores
@@ -195,37 +346,278 @@ class CapabilityRegistry:
             logger.error(f"Error analyzing task with LLM: {str(e)}")
             return {}
     
-    def _extract_scores_from_text(self, text: str) -> Dict[str, float]:
+    def _stream_scores(self, messages: List[Dict[str, str]], cache_key: str) -> Dict[str, float]:
         """
-        Extract capability scores from free-form text when JSON parsing fails.
+        Run a streamed capability analysis request and collect the validated scores.
         
         Args:
-            text: The text to parse
+            messages: Chat messages built by _build_messages
+            cache_key: Prompt cache key for the capability catalog
             
         Returns:
-            Dictionary of capability names to scores
-        """
-        scores = {}
-        
-        # Look for patterns like "capability_name: 0.7" or "capability_name - 0.7"
-        for capability_name in self.capabilities:
-            for line in text.split('\n'):
-                line = line.strip().lower()
-                if capability_name.lower() in line:
-                    # Try to extract a number from the line
-                    import re
-                    number_matches = re.findall(r'(\d+\.\d+|\d+)', line)
-                    if number_matches:
-                        try:
-                            # Use the first number found
-                            score = float(number_matches[0])
-                            if 0 <= score <= 1:
-                                scores[capability_name] = score
-                                break
-                        except ValueError:
-                            pass
-        
-        return scores
+            Dictionary mapping capability names to relevance scores (0-1)
+        """
+        stream = openai.chat.completions.create(
+            model=self.llm_config.get("model", "gpt-4o"),
+            temperature=self.llm_config.get("temperature", 0.1),
+            messages=messages,
+            response_format={"type": "json_object"},
+            stream=True,
+            stream_options={"include_usage": True},
+            extra_body={"prompt_cache_key": cache_key}
+        )
+        
+        # Validate "name": score pairs as they stream in instead of waiting
+        # for the whole object and parsing it at the end
+        capability_scores: Dict[str, float] = {}
+        buffer = ""
+        scan_pos = 0
+        for chunk in stream:
+            if chunk.usage is not None and chunk.usage.prompt_tokens_details is not None:
+                logger.debug(
+                    "Capability analysis prompt cache: %s of %s prompt tokens cached",
+                    chunk.usage.prompt_tokens_details.cached_tokens, chunk.usage.prompt_tokens
+                )
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            
+            buffer += chunk.choices[0].delta.content
+            scan_pos = self._scan_scores(buffer, scan_pos, capability_scores)
+        
+        if not capability_scores and buffer:
+            logger.error(f"Failed to parse LLM response as JSON: {buffer}")
+        
+        return capability_scores
+    
+    async def analyze_capabilities_with_llm_many(self, tasks: List[str]) -> List[Dict[str, float]]:
+        """
+        Analyze the capabilities needed for several tasks with a single LLM request.
+        
+        The capability catalog is sent once for all tasks instead of once per
+        task. Tasks that match a registered example are scored without the LLM,
+        and if the combined response can't be used each remaining task falls
+        back to analyze_capabilities_with_llm.
+        
+        Args:
+            tasks: The task descriptions
+            
+        Returns:
+            Capability scores for each task, in the same order as tasks
+            (empty for tasks that could not be analyzed)
+        """
+        results: List[Dict[str, float]] = [{} for _ in tasks]
+        if not tasks:
+            return results
+        if not self.capabilities:
+            logger.warning("No capabilities registered. Cannot analyze task requirements.")
+            return results
+        
+        # Registered examples need no LLM call
+        example_index = self._get_example_index()
+        pending: List[int] = []
+        for i, task in enumerate(tasks):
+            example_scores = example_index.get(_normalize_task(task))
+            if example_scores is not None:
+                results[i] = dict(example_scores)
+            else:
+                pending.append(i)
+        if not pending:
+            return results
+        if len(pending) == 1:
+            results[pending[0]] = await self.analyze_capabilities_with_llm(tasks[pending[0]])
+            return results
+        
+        # Same rubric and catalog prefix as single-task requests, so they share the prompt cache
+        catalog_prompt, cache_key = self._get_catalog_prompt()
+        numbered_tasks = "\n".join(f"{n}. {tasks[i]}" for n, i in enumerate(pending, 1))
+        messages = [
+            {"role": "system", "content": _STATIC_RUBRIC},
+            {"role": "system", "content": catalog_prompt},
+            {"role": "user", "content": (
+                f"Analyze each of these {len(pending)} tasks. Return a JSON object of the form "
+                f'{{"scores": [...]}} containing exactly {len(pending)} score objects in the same '
+                f"order as the tasks:\n{numbered_tasks}"
+            )}
+        ]
+        
+        try:
+            response = await asyncio.to_thread(
+                openai.chat.completions.create,
+                model=self.llm_config.get("model", "gpt-4o"),
+                temperature=self.llm_config.get("temperature", 0.1),
+                messages=messages,
+                response_format={"type": "json_object"},
+                extra_body={"prompt_cache_key": cache_key}
+            )
+            score_objects = _loads(response.choices[0].message.content).get("scores")
+        except Exception as e:
+            logger.error(f"Error analyzing tasks with LLM: {str(e)}")
+            score_objects = None
+        
+        if (
+            not isinstance(score_objects, list)
+            or len(score_objects) != len(pending)
+            or not all(isinstance(raw_scores, dict) for raw_scores in score_objects)
+        ):
+            logger.warning("Combined capability analysis unusable, analyzing tasks individually")
+            scores_per_task = await asyncio.gather(*(
+                self.analyze_capabilities_with_llm(tasks[i]) for i in pending
+            ))
+            for i, scores in zip(pending, scores_per_task):
+                results[i] = scores
+            return results
+        
+        for i, raw_scores in zip(pending, score_objects):
+            # Reuse the streaming validator on the object's JSON text
+            self._scan_scores(_dumps(raw_scores), 0, results[i])
+        
+        logger.info(f"Capability analysis for {len(pending)} tasks in one request")
+        return results
+    
+    async def analyze_capabilities_batch(
+        self,
+        tasks: List[str],
+        task_analyses: Optional[List[Optional[TaskAnalysisResult]]] = None,
+        priority: str = "batch",
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = 3600.0
+    ) -> List[Dict[str, float]]:
+        """
+        Analyze the capabilities needed for many tasks at once.
+        
+        With the default "batch" priority the requests are submitted through the
+        OpenAI Batch API, which is cheaper but may take up to 24 hours, so it
+        suits non-interactive workloads such as bulk routing. With "interactive"
+        priority each task goes through analyze_capabilities_with_llm concurrently.
+        
+        Args:
+            tasks: The task descriptions
+            task_analyses: Optional task analysis per task, in the same order
+            priority: "batch" for the Batch API or "interactive" for live calls
+            poll_interval: Seconds between batch status checks
+            timeout: Seconds to wait for the batch before cancelling it (None waits
+                for the whole completion window)
+            
+        Returns:
+            Capability scores for each task, in the same order as tasks
+            (empty for tasks that could not be analyzed)
+        """
+        task_analyses = task_analyses or [None] * len(tasks)
+        
+        if priority == "interactive":
+            return list(await asyncio.gather(*(
+                self.analyze_capabilities_with_llm(task, analysis)
+                for task, analysis in zip(tasks, task_analyses)
+            )))
+        
+        results: List[Dict[str, float]] = [{} for _ in tasks]
+        if not tasks:
+            return results
+        if not self.capabilities:
+            logger.warning("No capabilities registered. Cannot analyze task requirements.")
+            return results
+        
+        batch_file = None
+        batch = None
+        try:
+            # One JSONL line per task with the same payload as the live path
+            lines = []
+            for i, (task, analysis) in enumerate(zip(tasks, task_analyses)):
+                messages, cache_key = self._build_messages(task, analysis)
+                lines.append(_dumps({
+                    "custom_id": f"task-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.llm_config.get("model", "gpt-4o"),
+                        "temperature": self.llm_config.get("temperature", 0.1),
+                        "messages": messages,
+                        "response_format": {"type": "json_object"},
+                        "prompt_cache_key": cache_key
+                    }
+                }))
+            
+            # The OpenAI client is synchronous, so every call runs in a worker thread
+            batch_file = await asyncio.to_thread(
+                openai.files.create,
+                file=("capability_analysis.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = await asyncio.to_thread(
+                openai.batches.create,
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted capability analysis batch {batch.id} for {len(tasks)} tasks")
+            
+            loop = asyncio.get_running_loop()
+            deadline = None if timeout is None else loop.time() + timeout
+            while batch.status not in _BATCH_TERMINAL_STATUSES:
+                if deadline is None:
+                    delay = poll_interval
+                else:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        # The batch is cancelled in the finally block below
+                        logger.error(f"Capability analysis batch {batch.id} did not finish within {timeout}s")
+                        return results
+                    delay = min(poll_interval, remaining)
+                await asyncio.sleep(delay)
+                batch = await asyncio.to_thread(openai.batches.retrieve, batch.id)
+            
+            if batch.status != "completed":
+                logger.error(f"Capability analysis batch {batch.id} ended with status {batch.status}")
+            if not batch.output_file_id:
+                return results
+            
+            output = (await asyncio.to_thread(openai.files.content, batch.output_file_id)).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = _loads(line)
+                index = int(record["custom_id"].split("-", 1)[1])
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    logger.error(f"Capability analysis failed for {record['custom_id']}: {record.get('error')}")
+                    continue
+                
+                content = response["body"]["choices"][0]["message"]["content"] or ""
+                scores: Dict[str, float] = {}
+                self._scan_scores(content, 0, scores)
+                if not scores and content:
+                    logger.error(f"Failed to parse LLM response as JSON: {content}")
+                results[index] = scores
+            
+            logger.info(f"Capability analysis batch {batch.id} returned results for {len(tasks)} tasks")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error analyzing task batch with LLM: {str(e)}")
+            return results
+        finally:
+            # Also runs when the caller cancels this coroutine
+            await self._clean_up_batch(batch, batch_file)
+    
+    async def _clean_up_batch(self, batch: Any, batch_file: Any) -> None:
+        """
+        Cancel an unfinished capability analysis batch and delete its input file.
+        
+        Args:
+            batch: The submitted batch, or None if submission failed
+            batch_file: The uploaded input file, or None if the upload failed
+        """
+        if batch is not None and batch.status not in _BATCH_TERMINAL_STATUSES:
+            try:
+                await asyncio.to_thread(openai.batches.cancel, batch.id)
+                logger.info(f"Cancelled capability analysis batch {batch.id}")
+            except Exception as e:
+                logger.error(f"Error cancelling capability analysis batch {batch.id}: {str(e)}")
+        if batch_file is not None:
+            try:
+                await asyncio.to_thread(openai.files.delete, batch_file.id)
+            except Exception as e:
+                logger.error(f"Error deleting capability analysis batch file {batch_file.id}: {str(e)}")
     
     async def get_required_capabilities(
         self,
@@ -262,10 +654,7 @@ class CapabilityRegistry:
         Returns:
             Dictionary mapping capability names to boolean (True if agent has it)
         """
-        if not agent.capabilities:
-            return {cap: False for cap in required_capabilities}
-        
-        agent_capability_names = {cap.name for cap in agent.capabilities}
+        agent_capability_names = agent._capability_names
         return {name: name in agent_capability_names for name in required_capabilities}
     
     async def filter_agents_by_capabilities(
@@ -274,7 +663,9 @@ class CapabilityRegistry:
         task: str,
         task_analysis: Optional[TaskAnalysisResult] = None,
         threshold: float = 0.5,
-        require_all: bool = False
+        require_all: bool = False,
+        max_agents: Optional[int] = None,
+        required_capabilities: Optional[Set[str]] = None
     ) -> List[AgentMetadata]:
         """
         Filter a list of agents by task requirements.
@@ -285,14 +676,18 @@ class CapabilityRegistry:
             task_analysis: Optional task analysis information
             threshold: Minimum score to consider a capability required
             require_all: If True, agents must have all required capabilities
+            max_agents: Optional number of best-matching agents to keep
+            required_capabilities: Optional result of get_required_capabilities,
+                if the caller already has it
             
         Returns:
             Filtered and sorted list of agents
         """
         # Get required capabilities for this task
-        required_capabilities = await self.get_required_capabilities(
-            task, task_analysis, threshold
-        )
+        if required_capabilities is None:
+            required_capabilities = await self.get_required_capabilities(
+                task, task_analysis, threshold
+            )
         
         if not required_capabilities:
             logger.info("No specific capabilities required for this task")
@@ -300,33 +695,97 @@ class CapabilityRegistry:
         
         logger.info(f"Required capabilities for task: {required_capabilities}")
         
+        filtered_agents = self._rank_agents(agents, required_capabilities, require_all, max_agents)
+        
+        if not filtered_agents:
+            logger.warning(f"No agents found matching required capabilities: {required_capabilities}")
+            logger.info("Falling back to all available agents")
+            return agents
+        
+        logger.info(f"Selected {len(filtered_agents)} agents based on capabilities")
+        return filtered_agents
+    
+    def _rank_agents(
+        self,
+        agents: List[AgentMetadata],
+        required_capabilities: Set[str],
+        require_all: bool,
+        max_agents: Optional[int] = None
+    ) -> List[AgentMetadata]:
+        """
+        Sort agents by how many of the required capabilities they have.
+        
+        Args:
+            agents: List of agents to rank
+            required_capabilities: Set of required capability names
+            require_all: If True, drop agents missing any required capability
+            max_agents: Optional number of top agents to return
+            
+        Returns:
+            Agents ordered by match count (ties keep their input order)
+        """
         agent_matches = []
+        required_count = len(required_capabilities)
         
         for agent in agents:
-            # Get capability matches for this agent
-            matches = self.match_agent_to_capabilities(agent, required_capabilities)
-            match_count = sum(1 for v in matches.values() if v)
-            match_ratio = match_count / len(required_capabilities) if required_capabilities else 0
+            # Count matches with one set intersection instead of a per-agent dict
+            match_count = len(required_capabilities & agent._capability_names)
             
             # If we require all capabilities, skip agents that don't have them all
-            if require_all and match_count < len(required_capabilities):
+            if require_all and match_count < required_count:
                 continue
             
-            # Otherwise, include the agent with its match metrics
-            agent_matches.append((agent, match_count, match_ratio))
+            # Otherwise, include the agent with its match count
+            agent_matches.append((agent, match_count))
         
-        # Sort by match count and then by match ratio
-        agent_matches.sort(key=lambda x: (x[1], x[2]), reverse=True)
+        # Sort by match count; the match ratio is count / required_count, so it
+        # never breaks ties and the stable sort keeps the input order for them.
+        # When only the top agents are wanted, a heap selects them without a full sort.
+        if max_agents is not None and max_agents < len(agent_matches):
+            agent_matches = heapq.nlargest(max_agents, agent_matches, key=operator.itemgetter(1))
+        else:
+            agent_matches.sort(key=operator.itemgetter(1), reverse=True)
         
-        filtered_agents = [agent for agent, _, _ in agent_matches]
+        return [agent for agent, _ in agent_matches]
+    
+    async def filter_agents_by_capabilities_many(
+        self,
+        agents: List[AgentMetadata],
+        tasks: List[str],
+        threshold: float = 0.5,
+        require_all: bool = False,
+        max_in_flight: int = 8,
+        max_agents: Optional[int] = None
+    ) -> List[List[AgentMetadata]]:
+        """
+        Filter a list of agents for several tasks, analyzing the tasks concurrently.
         
-        if not filtered_agents:
-            logger.warning(f"No agents found matching required capabilities: {required_capabilities}")
-            logger.info("Falling back to all available agents")
-            return agents
+        Args:
+            agents: List of agents to filter
+            tasks: The task descriptions
+            threshold: Minimum score to consider a capability required
+            require_all: If True, agents must have all required capabilities
+            max_in_flight: Maximum number of concurrent LLM analyses
+            max_agents: Optional number of best-matching agents to keep per task
+            
+        Returns:
+            Filtered and sorted list of agents for each task, in task order
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
         
-        logger.info(f"Selected {len(filtered_agents)} agents based on capabilities")
-        return filtered_agents
+        async def analyze(task: str) -> Set[str]:
+            async with semaphore:
+                return await self.get_required_capabilities(task, None, threshold)
+        
+        required_per_task = await asyncio.gather(*(analyze(task) for task in tasks))
+        
+        results = []
+        for required_capabilities in required_per_task:
+            filtered_agents = self._rank_agents(agents, required_capabilities, require_all, max_agents) if required_capabilities else []
+            results.append(filtered_agents or agents)
+        
+        logger.info(f"Filtered agents for {len(tasks)} tasks based on capabilities")
+        return results
 
 
 # Global instance of the registry with default settings
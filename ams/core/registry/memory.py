@@ -1,10 +1,10 @@
 import logging
+import sys
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .base import AgentRegistry
-from .models import AgentMetadata, AgentStatus
+from .models import AgentMetadata, AgentStatus, _now_iso
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +16,34 @@ class InMemoryAgentRegistry(AgentRegistry):
     
     def __init__(self):
         self.agents: Dict[str, AgentMetadata] = {}
+        # capability name -> agent IDs (dict as an insertion-ordered set)
+        self._by_cap: Dict[str, Dict[str, None]] = {}
+        # agent ID -> capability names it is indexed under, since the agent's own
+        # capabilities may have been edited by the time it is unindexed
+        self._indexed_caps: Dict[str, Tuple[str, ...]] = {}
+        # IDs of agents whose status is READY
+        self._ready: Set[str] = set()
     
-    async def register_agent(self, agent: AgentMetadata) -> str:
+    def _index_agent(self, agent: AgentMetadata) -> None:
+        """Add an agent to the capability and status indexes."""
+        capability_names = tuple(capability.name for capability in agent.capabilities or ())
+        self._indexed_caps[agent.id] = capability_names
+        for capability_name in capability_names:
+            self._by_cap.setdefault(capability_name, {})[agent.id] = None
+        if agent.status is AgentStatus.READY:
+            self._ready.add(agent.id)
+    
+    def _unindex_agent(self, agent_id: str) -> None:
+        """Remove an agent from the capability and status indexes."""
+        for capability_name in self._indexed_caps.pop(agent_id, ()):
+            agent_ids = self._by_cap.get(capability_name)
+            if agent_ids is not None:
+                agent_ids.pop(agent_id, None)
+                if not agent_ids:
+                    del self._by_cap[capability_name]
+        self._ready.discard(agent_id)
+    
+    def register_agent(self, agent: AgentMetadata) -> str:
         """
         Register a new agent in the registry.
         
@@ -31,18 +57,30 @@ class InMemoryAgentRegistry(AgentRegistry):
         if not agent.id:
             agent.id = str(uuid.uuid4())
         
+        # Intern the ID so lookups against hub/session copies hit the identity fast path
+        agent.id = sys.intern(agent.id)
+        
         # Update timestamps
-        current_time = datetime.now().isoformat()
+        current_time = _now_iso()
         agent.created_at = current_time
         agent.updated_at = current_time
         
-        # Store the agent
+        # Store the enum member so status checks can compare by identity
+        agent.status = AgentStatus(agent.status)
+        
+        # Name, description or capabilities may have been edited since construction
+        agent._refresh_match_fields()
+        
+        # Store the agent, replacing the index entries of any previous registration
+        if agent.id in self.agents:
+            self._unindex_agent(agent.id)
         self.agents[agent.id] = agent
+        self._index_agent(agent)
         
         logger.info(f"Registered agent: {agent.name} ({agent.id})")
         return agent.id
     
-    async def get_agent(self, agent_id: str) -> Optional[AgentMetadata]:
+    def get_agent(self, agent_id: str) -> Optional[AgentMetadata]:
         """
         Retrieve an agent by its ID.
         
@@ -54,7 +92,7 @@ class InMemoryAgentRegistry(AgentRegistry):
         """
         return self.agents.get(agent_id)
     
-    async def list_agents(self) -> List[AgentMetadata]:
+    def list_agents(self) -> List[AgentMetadata]:
         """
         List all registered agents.
         
@@ -63,7 +101,7 @@ class InMemoryAgentRegistry(AgentRegistry):
         """
         return list(self.agents.values())
     
-    async def update_agent_status(self, agent_id: str, status: AgentStatus) -> bool:
+    def update_agent_status(self, agent_id: str, status: AgentStatus) -> bool:
         """
         Update the status of an agent.
         
@@ -80,14 +118,19 @@ class InMemoryAgentRegistry(AgentRegistry):
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} not found")
         
-        # Update the agent status
+        # Update the agent status (normalized to the enum member for identity checks)
+        status = AgentStatus(status)
         self.agents[agent_id].status = status
-        self.agents[agent_id].updated_at = datetime.now().isoformat()
+        if status is AgentStatus.READY:
+            self._ready.add(agent_id)
+        else:
+            self._ready.discard(agent_id)
+        self.agents[agent_id].updated_at = _now_iso()
         
         logger.info(f"Updated agent {agent_id} status to {status}")
         return True
     
-    async def delete_agent(self, agent_id: str) -> bool:
+    def delete_agent(self, agent_id: str) -> bool:
         """
         Remove an agent from the registry.
         
@@ -102,11 +145,12 @@ class InMemoryAgentRegistry(AgentRegistry):
         
         # Remove the agent
         del self.agents[agent_id]
+        self._unindex_agent(agent_id)
         
         logger.info(f"Deleted agent: {agent_id}")
         return True
     
-    async def find_agents_by_capability(self, capability_name: str) -> List[AgentMetadata]:
+    def find_agents_by_capability(self, capability_name: str) -> List[AgentMetadata]:
         """
         Find agents that have a specific capability.
         
@@ -116,27 +160,42 @@ class InMemoryAgentRegistry(AgentRegistry):
         Returns:
             List of agents that have the capability
         """
-        matching_agents = []
-        
-        for agent in self.agents.values():
-            # Skip agents that are not ready
-            if agent.status != AgentStatus.READY:
-                continue
-            
-            # If agent has no capabilities defined, skip
-            if not agent.capabilities:
-                continue
-            
-            # Check if any capability matches
-            for capability in agent.capabilities:
-                if capability.name == capability_name:
-                    matching_agents.append(agent)
-                    break
+        # Only agents indexed under the capability are checked, not every agent
+        ready = self._ready
+        matching_agents = [
+            self.agents[agent_id]
+            for agent_id in self._by_cap.get(capability_name, ())
+            if agent_id in ready
+        ]
         
         logger.info(f"Found {len(matching_agents)} agents with capability: {capability_name}")
         return matching_agents
     
-    async def find_agents_by_framework(self, framework) -> List[AgentMetadata]:
+    def find_agents_by_capabilities(self, capability_names: Iterable[str]) -> List[AgentMetadata]:
+        """
+        Find agents that have any of the given capabilities.
+        
+        Args:
+            capability_names: The names of the capabilities
+            
+        Returns:
+            List of agents that have at least one of the capabilities, without duplicates
+        """
+        # Union of the index entries; dict keys keep first-seen order and drop duplicates
+        ready = self._ready
+        by_cap = self._by_cap
+        agent_ids = dict.fromkeys(
+            agent_id
+            for capability_name in capability_names
+            for agent_id in by_cap.get(capability_name, ())
+            if agent_id in ready
+        )
+        matching_agents = [self.agents[agent_id] for agent_id in agent_ids]
+        
+        logger.info(f"Found {len(matching_agents)} agents with any of the requested capabilities")
+        return matching_agents
+    
+    def find_agents_by_framework(self, framework) -> List[AgentMetadata]:
         """
         Find agents of a specific framework.
         
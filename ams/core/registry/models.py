@@ -1,10 +1,29 @@
+import sys
+import time
 from datetime import datetime
 
 from enum import Enum
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 from dataclasses import dataclass, field
 
 
+# Registry records are created in bulk, so store them in __slots__ where the
+# running Python supports slotted dataclasses (3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# [time_ns when formatted, ISO string] shared by _now_iso callers
+_now_iso_cache = [0, ""]
+
+
+def _now_iso() -> str:
+    """Return the current local time as an ISO string, reformatted at most once per millisecond."""
+    ns = time.time_ns()
+    if ns - _now_iso_cache[0] >= 1_000_000:
+        _now_iso_cache[1] = datetime.fromtimestamp(ns / 1e9).isoformat()
+        _now_iso_cache[0] = ns
+    return _now_iso_cache[1]
+
+
 class AgentFramework(str, Enum):
     AUTOGEN = "autogen"
     CREWAI = "crewai"
@@ -17,14 +36,20 @@ class AgentStatus(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AgentCapability:
     name: str
     description: str
     parameters: Optional[dict] = None
+    # Lowercased name for keyword matching
+    _name_lower: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute the lowercased name used for matching."""
+        self._name_lower = self.name.lower()
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AgentMetadata:
     id: str
     name: str
@@ -34,5 +59,18 @@ class AgentMetadata:
     capabilities: Optional[List[AgentCapability]] = None
     status: AgentStatus = AgentStatus.OFFLINE
     config: Optional[dict] = None
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_now_iso)
+    updated_at: str = field(default_factory=_now_iso)
+    # Names of the capabilities above, for set-based matching; refreshed on registration
+    _capability_names: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    # Lowercased "name description", for role matching; refreshed on registration
+    _role_text: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute the values used for matching."""
+        self._refresh_match_fields()
+    
+    def _refresh_match_fields(self) -> None:
+        """Recompute the matching values after the name, description or capabilities change."""
+        self._capability_names = frozenset(cap.name for cap in self.capabilities or ())
+        self._role_text = f"{self.name} {self.description}".lower()
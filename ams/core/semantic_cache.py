@@ -0,0 +1,143 @@
+"""
+Semantic Cache Module
+
+This module provides an in-process cache for LLM results keyed by the embedding
+of the prompt, so that near-duplicate prompts can reuse an earlier result instead
+of making another LLM call.
+"""
+
+import logging
+import math
+import operator
+import time
+from typing import Any, List, Optional
+
+import openai
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy only speeds up similarity search
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Cache of LLM results looked up by cosine similarity of prompt embeddings.
+    
+    Entries expire after a TTL and the least recently used entry is evicted
+    when the cache is full. Values are returned as stored, so callers that
+    mutate results should store and return copies.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_size: int = 256,
+        ttl: float = 3600.0,
+        embedding_model: str = "text-embedding-3-small"
+    ):
+        """
+        Initialize a semantic cache.
+        
+        Args:
+            threshold: Cosine similarity at or above which a cached value is reused
+            max_size: Maximum number of cached entries
+            ttl: Seconds an entry stays valid
+            embedding_model: OpenAI embedding model used by embed()
+        """
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self.embedding_model = embedding_model
+        # [unit embedding, value, created, last used] per entry
+        self._entries: List[List[Any]] = []
+        # Stacked embeddings for numpy similarity search, rebuilt after changes
+        self._matrix = None
+    
+    def embed(self, text: str) -> Optional[Any]:
+        """
+        Embed text as a unit-length vector.
+        
+        This makes a blocking API call; async callers should run it in a thread.
+        
+        Args:
+            text: The text to embed
+        
+        Returns:
+            The normalized embedding, or None if embedding failed
+        """
+        try:
+            embedding = openai.embeddings.create(
+                model=self.embedding_model,
+                input=text
+            ).data[0].embedding
+        except Exception as e:
+            logger.warning(f"Could not embed text for the semantic cache: {str(e)}")
+            return None
+        
+        if np is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(vector))
+            return vector / norm if norm else None
+        norm = math.sqrt(math.fsum(x * x for x in embedding))
+        return [x / norm for x in embedding] if norm else None
+    
+    def lookup(self, embedding: Any) -> Optional[Any]:
+        """
+        Find the cached value whose embedding is most similar to the given one.
+        
+        Args:
+            embedding: Unit-length embedding from embed()
+        
+        Returns:
+            The cached value if its similarity reaches the threshold, None otherwise
+        """
+        now = time.monotonic()
+        live = [entry for entry in self._entries if now - entry[2] < self.ttl]
+        if len(live) != len(self._entries):
+            self._entries = live
+            self._matrix = None
+        if not live:
+            return None
+        
+        # Cosine similarity of unit vectors is their dot product
+        if np is not None:
+            if self._matrix is None:
+                self._matrix = np.stack([entry[0] for entry in live])
+            similarities = self._matrix @ embedding
+            best = int(similarities.argmax())
+            best_similarity = float(similarities[best])
+        else:
+            similarities = [sum(map(operator.mul, entry[0], embedding)) for entry in live]
+            best = max(range(len(similarities)), key=similarities.__getitem__)
+            best_similarity = similarities[best]
+        
+        if best_similarity < self.threshold:
+            return None
+        live[best][3] = now
+        return live[best][1]
+    
+    def store(self, embedding: Any, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entry when full.
+        
+        Args:
+            embedding: Unit-length embedding from embed()
+            value: The value to cache
+        """
+        if len(self._entries) >= self.max_size:
+            oldest = min(range(len(self._entries)), key=lambda i: self._entries[i][3])
+            del self._entries[oldest]
+        now = time.monotonic()
+        self._entries.append([embedding, value, now, now])
+        self._matrix = None
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+        self._matrix = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -8,9 +8,10 @@ and supervision of collaborative workflows.
 Classes:
 - SupervisorAgent: Agent responsible for orchestrating multi-agent collaborations
 - SupervisorManager: Manager for creating and handling supervisor agents
+- SessionRecord: Supervisor-side state of a collaboration session
 """
 
 from .base import SupervisorAgent
-from .manager import SupervisorManager
+from .manager import SessionRecord, SupervisorManager
 
-__all__ = ["SupervisorAgent", "SupervisorManager"] 
\ No newline at end of file
+__all__ = ["SupervisorAgent", "SupervisorManager", "SessionRecord"] 
\ No newline at end of file
@@ -1,16 +1,215 @@
+import asyncio
+import copy
+import hashlib
+import heapq
 import logging
 import json
-from typing import Dict, List, Any, Optional
+import operator
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Final, List, Any, Optional, Set, Tuple
 import openai
 
-from ..registry.base import AgentRegistry
-from ..registry.models import AgentMetadata
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+from ..errors import SessionNotFoundException
+from ..registry.base import AgentRegistry, AsyncAgentRegistry
+from ..registry.models import AgentMetadata, AgentStatus, _SLOTS
 from ..registry.capability_registry import capability_registry
 from ..communication.hub import CommunicationHub
+from ..semantic_cache import SemanticCache
 from .base import SupervisorAgent
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _canonical_json(obj: Any) -> bytes:
+    """Serialize to JSON with sorted keys for hashing, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True).encode("utf-8")
+
+
+# System prompt for analyze_task and analyze_tasks. It must stay byte-identical
+# across calls (no interpolation, timestamps or per-task text) and stay the first
+# message, so the provider's automatic prompt caching can reuse it as a shared
+# prefix. Anything task-specific belongs in the trailing user message.
+# Requests use JSON mode, so the prompt only names the fields; JSON mode still
+# requires the word "JSON" to appear in the messages.
+_TASK_ANALYSIS_SYSTEM_PROMPT: Final[str] = """You are a task analyzer. Return a JSON object with:
+task_summary (brief summary of the task), complexity (integer 1-10),
+subtasks (list of strings) and fields (list of knowledge domains relevant to the task).
+"""
+
+# Shared first message of every task analysis request; never mutate it
+_TASK_ANALYSIS_SYSTEM_MESSAGE: Final[Dict[str, str]] = {
+    "role": "system",
+    "content": _TASK_ANALYSIS_SYSTEM_PROMPT
+}
+
+# Routes task analysis requests to the same prompt cache
+_TASK_ANALYSIS_CACHE_KEY = "ams-task-analysis"
+
+# Maximum number of task analyses kept in the exact-match cache
+_EXACT_CACHE_SIZE = 1024
+
+# Analyses are only cached exactly when sampling is close to deterministic
+_EXACT_CACHE_MAX_TEMPERATURE = 0.2
+
+# Keywords used to guess capabilities when no LLM is reachable, keyed by the
+# capability names registered in capability_registry
+_FALLBACK_KEYWORDS = {
+    "code_generation": ["code", "programming"],
+    "research": ["research", "data", "analyze"],
+    "tool_use": ["math", "calculate"],
+    "planning": ["plan", "strategy"],
+    "evaluation": ["review", "evaluate", "critique"],
+    "text_generation": ["writing", "text", "write"],
+}
+_FALLBACK_KEYWORD_CAPABILITIES = {
+    keyword: capability
+    for capability, keywords in _FALLBACK_KEYWORDS.items()
+    for keyword in keywords
+}
+# One alternation scanned in a single case-insensitive pass, longest keywords first
+_FALLBACK_KEYWORD_RE = re.compile(
+    "|".join(
+        re.escape(keyword)
+        for keyword in sorted(_FALLBACK_KEYWORD_CAPABILITIES, key=len, reverse=True)
+    ),
+    re.IGNORECASE
+)
+
+# Execution priority for different agent roles, found in agent names and descriptions
+_ROLE_PRIORITIES = MappingProxyType({
+    "research": 1,
+    "strategist": 2,
+    "writer": 3,
+    "content": 3,  # Same priority as writer
+    "evaluator": 4,
+    "reviewer": 4   # Same priority as evaluator
+})
+# No role name contains another, so a single scan finds every role mentioned
+_ROLE_RE = re.compile("|".join(map(re.escape, _ROLE_PRIORITIES)))
+
+# Priority of agents that don't match any role
+_DEFAULT_ROLE_PRIORITY = 5
+
+# Execution priority of the roles suggested by capability names
+_CAPABILITY_ROLE_PRIORITIES = MappingProxyType({
+    "research": _ROLE_PRIORITIES["research"],
+    "strategy": _ROLE_PRIORITIES["strategist"],
+    "content": _ROLE_PRIORITIES["content"],
+    "evaluate": _ROLE_PRIORITIES["evaluator"]
+})
+_CAPABILITY_ROLE_RE = re.compile("|".join(map(re.escape, _CAPABILITY_ROLE_PRIORITIES)))
+_MIN_CAPABILITY_ROLE_PRIORITY = min(_CAPABILITY_ROLE_PRIORITIES.values())
+
+
+def _as_dependency_ids(depends_on: Any) -> Tuple[str, ...]:
+    """
+    Normalize an agent's depends_on config value to a tuple of agent IDs.
+    
+    Args:
+        depends_on: A single agent ID or a list or tuple of them
+        
+    Returns:
+        The agent IDs, or an empty tuple for unsupported values
+    """
+    if isinstance(depends_on, str):
+        return (depends_on,)
+    if isinstance(depends_on, (list, tuple)):
+        return tuple(depends_on)
+    return ()
+
+
+def _keyword_capabilities(task: str) -> List[str]:
+    """
+    Guess the capabilities a task needs from keywords, without calling an LLM.
+    
+    Args:
+        task: The task description
+        
+    Returns:
+        Matched capability names in order of first appearance, limited to
+        capabilities currently registered in capability_registry
+    """
+    registered = capability_registry.capabilities
+    capabilities = {}
+    for match in _FALLBACK_KEYWORD_RE.findall(task):
+        capability = _FALLBACK_KEYWORD_CAPABILITIES[match.lower()]
+        if capability in registered:
+            capabilities[capability] = None
+    return list(capabilities)
+
+
+def _agent_priority(agent: AgentMetadata) -> int:
+    """
+    Get an agent's execution priority from its config, role and capabilities.
+    
+    Args:
+        agent: The agent metadata
+        
+    Returns:
+        The priority; lower numbers run earlier
+    """
+    # Check if the agent has an explicitly defined execution priority in its config
+    if agent.config and "execution_priority" in agent.config:
+        try:
+            # Use the explicitly defined priority
+            return int(agent.config["execution_priority"])
+        except (ValueError, TypeError):
+            logger.warning(f"Invalid execution_priority in agent config for {agent.name}")
+    
+    # Check agent name and description for role indicators, using the
+    # highest priority role that matches this agent (lowest number)
+    agent_priority = min(
+        map(_ROLE_PRIORITIES.__getitem__, _ROLE_RE.findall(agent._role_text)),
+        default=_DEFAULT_ROLE_PRIORITY
+    )
+    
+    # Check capabilities if available
+    if agent.capabilities:
+        for capability in agent.capabilities:
+            # Look for capabilities that might indicate a role, keeping the highest
+            # priority role found if it beats the agent's current priority. Once
+            # no role could beat it, skip the scan and only check parameters.
+            role_priority = None
+            if agent_priority > _MIN_CAPABILITY_ROLE_PRIORITY:
+                role_priority = min(
+                    map(_CAPABILITY_ROLE_PRIORITIES.__getitem__,
+                        _CAPABILITY_ROLE_RE.findall(capability._name_lower)),
+                    default=None
+                )
+            if role_priority is not None and role_priority < agent_priority:
+                agent_priority = role_priority
+            # Check if the capability has execution_order info
+            elif capability.parameters and "execution_priority" in capability.parameters:
+                try:
+                    priority = int(capability.parameters["execution_priority"])
+                    agent_priority = min(agent_priority, priority)
+                except (ValueError, TypeError):
+                    pass
+    
+    return agent_priority
+
+
+@dataclass(**_SLOTS)
+class SessionRecord:
+    """Supervisor-side state of a collaboration session."""
+    task: str
+    agent_ids: Tuple[str, ...]
+    status: str = "active"
+
+
 class SupervisorManager(SupervisorAgent):
     """
     Manager agent that coordinates agent selection and collaboration.
@@ -25,7 +224,7 @@ class SupervisorManager(SupervisorAgent):
     ):
         self.agent_registry = agent_registry
         self.communication_hub = communication_hub
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.active_sessions: Dict[str, SessionRecord] = {}
         
         self.llm_config = llm_config or {
             "model": "gpt-4o",
@@ -34,6 +233,57 @@ class SupervisorManager(SupervisorAgent):
         
         # Configure the capability registry with the same LLM config
         capability_registry.llm_config = self.llm_config
+        
+        # Async client and concurrency limit, created on first use so constructing
+        # the manager needs neither an API key nor a running event loop
+        self._aclient: Optional[openai.AsyncOpenAI] = None
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        
+        # LRU cache of request hash -> analysis for repeated identical tasks
+        self._exact_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Request hash -> analysis in progress, so concurrent duplicates make one request
+        self._pending_analyses: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        
+        # Optional micro-batching: while an analysis request is in flight, further
+        # analyses wait up to the window and are sent together in one request
+        self._batch_window = self.llm_config.get("analysis_batch_window_ms", 0) / 1000
+        self._batch_max = self.llm_config.get("analysis_batch_max", 8)
+        self._batch_queue: List[Tuple[str, List[Dict[str, str]], "asyncio.Future[Dict[str, Any]]"]] = []
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_runs: Set["asyncio.Task[None]"] = set()
+        self._analyses_in_flight = 0
+        
+        # Optional cache of task embedding -> analysis for near-duplicate tasks
+        self._analysis_cache: Optional[SemanticCache] = None
+        if self.llm_config.get("cache_enabled"):
+            self._analysis_cache = SemanticCache(
+                threshold=self.llm_config.get("cache_threshold", 0.92),
+                max_size=self.llm_config.get("cache_max_size", 10000),
+                ttl=self.llm_config.get("cache_ttl", 3600.0),
+                embedding_model=self.llm_config.get("embedding_model", "text-embedding-3-small")
+            )
+        
+        # Capability version the cached analyses were made with; the analyses name
+        # capabilities, so both caches are cleared when they change
+        self._cache_version = capability_registry._caps_version
+    
+    def _get_async_client(self) -> openai.AsyncOpenAI:
+        """Get the shared async OpenAI client, creating it on first use."""
+        if self._aclient is None:
+            # The client retries rate limits with exponential backoff and
+            # jitter, honoring the server's retry-after header. The timeout keeps
+            # a stalled request from holding a semaphore slot for minutes.
+            self._aclient = openai.AsyncOpenAI(
+                max_retries=self.llm_config.get("max_retries", 5),
+                timeout=self.llm_config.get("timeout", 30.0)
+            )
+        return self._aclient
+    
+    def _get_llm_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent LLM requests, creating it on first use."""
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.llm_config.get("max_concurrent_requests", 5))
+        return self._llm_semaphore
     
     async def analyze_task(self, task: str) -> Dict[str, Any]:
         """
@@ -45,99 +295,429 @@ class SupervisorManager(SupervisorAgent):
         Returns:
             Analysis results including required capabilities
         """
-        logger.info(f"Analyzing task with LLM: {task}")
+        logger.info("Analyzing task with LLM: %s", task)
+        
+        messages = [
+            _TASK_ANALYSIS_SYSTEM_MESSAGE,
+            {"role": "user", "content": f"Analyze this task: {task}"}
+        ]
+        model = self.llm_config.get("model", "gpt-4o")
+        temperature = self.llm_config.get("temperature", 0.1)
+        
+        # Cached analyses name capabilities, so drop them once the capabilities change
+        caps_version = capability_registry._caps_version
+        if self._cache_version != caps_version:
+            self._exact_cache.clear()
+            if self._analysis_cache is not None:
+                self._analysis_cache.clear()
+            self._cache_version = caps_version
+        
+        # Identical requests at a low temperature give the same analysis
+        exact_key = None
+        if temperature <= _EXACT_CACHE_MAX_TEMPERATURE:
+            exact_key = hashlib.sha256(_canonical_json({
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "caps_version": caps_version
+            })).hexdigest()
+            cached_analysis = self._exact_cache.get(exact_key)
+            if cached_analysis is not None:
+                self._exact_cache.move_to_end(exact_key)
+                logger.info("Task analysis served from exact cache with capabilities: %s", cached_analysis["required_capabilities"])
+                # Deep copies, so callers can't change the cached lists
+                return copy.deepcopy(cached_analysis)
+            
+            # Share one analysis between concurrent callers with the same request
+            pending = self._pending_analyses.get(exact_key)
+            if pending is None:
+                pending = asyncio.ensure_future(
+                    self._run_task_analysis(task, messages, model, temperature, exact_key)
+                )
+                self._pending_analyses[exact_key] = pending
+                pending.add_done_callback(lambda _: self._pending_analyses.pop(exact_key, None))
+            # Shielded so a cancelled caller doesn't cancel the others' request;
+            # each caller gets its own copy of the shared result
+            return copy.deepcopy(await asyncio.shield(pending))
         
-        # Use OpenAI API to analyze the task
-        try:
-            # First get a general task analysis with complexity and subtasks
-            messages = [
-                {"role": "system", "content": """You are a task analyzer that provides insights about a given task.
-                Analyze the task and provide a detailed assessment.
-                
-                Return your analysis as a JSON object with the following format:
-                {
-                    "task_summary": "Brief summary of the task",
-                    "complexity": 5,  // On a scale of 1-10
-                    "subtasks": ["subtask1", "subtask2"],
-                    "fields": ["field1", "field2"]  // Knowledge domains relevant to the task
-                }
-                """
-                },
-                {"role": "user", "content": f"Analyze this task: {task}"}
-            ]
+        return await self._run_task_analysis(task, messages, model, temperature, None)
+    
+    async def _run_task_analysis(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        exact_key: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Analyze a task that isn't in the exact-match cache.
+        
+        Args:
+            task: The task description
+            messages: The chat messages for the analysis request
+            model: The chat model to use
+            temperature: The sampling temperature
+            exact_key: Exact-match cache key to store the result under, or None
             
-            response = openai.chat.completions.create(
-                model=self.llm_config.get("model", "gpt-4o"),
-                temperature=self.llm_config.get("temperature", 0.1),
-                messages=messages
-            )
+        Returns:
+            Analysis results including required capabilities
+        """
+        # Reuse the analysis of a near-duplicate task when caching is enabled
+        embedding = None
+        caps_version = self._cache_version
+        if self._analysis_cache is not None:
+            embedding = await asyncio.to_thread(self._analysis_cache.embed, task)
+            if embedding is not None:
+                cached_analysis = self._analysis_cache.lookup(embedding)
+                if cached_analysis is not None:
+                    task_analysis = copy.deepcopy(cached_analysis)
+                    task_analysis["task"] = task
+                    logger.info("Task analysis served from cache with capabilities: %s", task_analysis["required_capabilities"])
+                    return task_analysis
+        
+        # Capability scoring only needs the raw task, so run it alongside the
+        # general analysis instead of waiting for it
+        task_analysis, capability_scores = await asyncio.gather(
+            self._request_task_analysis(task, messages, model, temperature),
+            capability_registry.analyze_capabilities_with_llm(task, None),
+            return_exceptions=True
+        )
+        
+        if isinstance(task_analysis, BaseException):
+            logger.error(f"Error analyzing task with LLM: {str(task_analysis)}")
+            return self._fallback_analysis(task, capability_scores)
+        if isinstance(capability_scores, BaseException):
+            logger.error(f"Error using capability registry: {str(capability_scores)}")
+            return self._fallback_analysis(task, capability_scores)
+        
+        task_analysis = await self._add_required_capabilities(task, task_analysis, capability_scores)
+        
+        if exact_key is not None:
+            self._exact_cache[exact_key] = copy.deepcopy(task_analysis)
+            if len(self._exact_cache) > _EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+        # Skip analyses made before a capability change cleared the cache
+        if embedding is not None and caps_version == capability_registry._caps_version:
+            self._analysis_cache.store(embedding, copy.deepcopy(task_analysis))
+        
+        logger.info("Task analysis complete with capabilities: %s", task_analysis["required_capabilities"])
+        return task_analysis
+    
+    async def _request_task_analysis(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """
+        Get a general task analysis with complexity and subtasks from the LLM.
+        
+        When analysis_batch_window_ms is configured and another analysis is in
+        flight, the task is queued and analyzed together with other queued tasks.
+        
+        Args:
+            task: The task description
+            messages: The chat messages for the analysis request
+            model: The chat model to use
+            temperature: The sampling temperature
             
-            # Extract the JSON response
-            content = response.choices[0].message.content
-            try:
-                task_analysis = json.loads(content)
-            except json.JSONDecodeError:
-                logger.warning(f"LLM response was not valid JSON: {content}")
-                # Create a basic analysis if JSON parsing fails
-                task_analysis = {
-                    "task_summary": task,
-                    "complexity": 5,
-                    "subtasks": [task],
-                    "fields": []
-                }
+        Returns:
+            The parsed analysis, or a basic analysis if the response wasn't JSON
+        """
+        # Under load, coalesce with other pending analyses; otherwise send at once
+        # so a lone request doesn't wait for the batch window
+        if self._batch_window > 0 and self._analyses_in_flight:
+            future = asyncio.get_running_loop().create_future()
+            self._batch_queue.append((task, messages, future))
+            if len(self._batch_queue) >= self._batch_max:
+                self._flush_analysis_batch()
+            elif self._batch_timer is None:
+                self._batch_timer = asyncio.get_running_loop().call_later(
+                    self._batch_window, self._flush_analysis_batch
+                )
+            return await future
+        
+        self._analyses_in_flight += 1
+        try:
+            return await self._send_task_analysis_request(task, messages, model, temperature)
+        finally:
+            self._analyses_in_flight -= 1
+    
+    def _flush_analysis_batch(self) -> None:
+        """Send the queued task analyses as one batch."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch_queue = self._batch_queue, []
+        if batch:
+            # Keep a reference so the run isn't garbage collected mid-flight
+            run = asyncio.ensure_future(self._run_analysis_batch(batch))
+            self._batch_runs.add(run)
+            run.add_done_callback(lambda run: self._finish_analysis_batch(run, batch))
+    
+    def _finish_analysis_batch(
+        self,
+        run: "asyncio.Task[None]",
+        batch: List[Tuple[str, List[Dict[str, str]], "asyncio.Future[Dict[str, Any]]"]]
+    ) -> None:
+        """
+        Resolve the futures a finished batch run left pending.
+        
+        A run that failed or was cancelled, even before it started, would
+        otherwise leave its callers waiting forever.
+        
+        Args:
+            run: The finished batch run
+            batch: The run's queued (task, messages, future) entries
+        """
+        self._batch_runs.discard(run)
+        for _, _, future in batch:
+            if future.done():
+                continue
+            if run.cancelled():
+                future.cancel()
+            else:
+                future.set_exception(run.exception() or RuntimeError("Task analysis batch ended without a result"))
+    
+    async def _run_analysis_batch(
+        self,
+        batch: List[Tuple[str, List[Dict[str, str]], "asyncio.Future[Dict[str, Any]]"]]
+    ) -> None:
+        """
+        Analyze a batch of queued tasks and resolve their futures.
+        
+        Args:
+            batch: Queued (task, messages, future) entries
+        """
+        tasks = [task for task, _, _ in batch]
+        model = self.llm_config.get("model", "gpt-4o")
+        temperature = self.llm_config.get("temperature", 0.1)
+        
+        self._analyses_in_flight += 1
+        try:
+            results = None
+            if len(batch) > 1:
+                results = await self._request_task_analyses(tasks)
+            if results is None:
+                # A single task, or the batched response didn't match the tasks
+                results = await asyncio.gather(*(
+                    self._send_task_analysis_request(task, messages, model, temperature)
+                    for task, messages, _ in batch
+                ), return_exceptions=True)
+        finally:
+            self._analyses_in_flight -= 1
+        
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def _send_task_analysis_request(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """
+        Send a single task analysis request to the LLM.
+        
+        Args:
+            task: The task description
+            messages: The chat messages for the analysis request
+            model: The chat model to use
+            temperature: The sampling temperature
             
-            # Now use our capability registry to determine required capabilities
-            capability_scores = await capability_registry.analyze_capabilities_with_llm(
-                task, task_analysis
+        Returns:
+            The parsed analysis, or a basic analysis if the response wasn't JSON
+        """
+        # Await the async client so concurrent analyses don't block the event loop
+        async with self._get_llm_semaphore():
+            response = await self._get_async_client().chat.completions.create(
+                model=model,
+                temperature=temperature,
+                messages=messages,
+                response_format={"type": "json_object"},
+                extra_body={"prompt_cache_key": _TASK_ANALYSIS_CACHE_KEY}
             )
+        
+        # Extract the JSON response
+        content = response.choices[0].message.content
+        try:
+            # JSON mode guarantees an object unless the response was cut off
+            return _loads(content)
+        except json.JSONDecodeError:
+            logger.warning(f"LLM response was not valid JSON: {content}")
+            # Create a basic analysis if JSON parsing fails
+            return {
+                "task_summary": task,
+                "complexity": 5,
+                "subtasks": [task],
+                "fields": []
+            }
+    
+    def _fallback_analysis(self, task: str, capability_scores: Any) -> Dict[str, Any]:
+        """
+        Build a minimal analysis when the LLM task analysis failed.
+        
+        Args:
+            task: The task description
+            capability_scores: Scores from the capability registry, or the
+                exception raised while computing them
             
-            # Add required capabilities to the analysis
+        Returns:
+            Analysis with the capabilities the registry or task keywords suggest
+        """
+        required_capabilities = []
+        if not isinstance(capability_scores, BaseException):
             required_capabilities = [
                 name for name, score in capability_scores.items() 
-                if score >= 0.5  # Use threshold of 0.5
+                if score >= 0.5
             ]
+        
+        if not required_capabilities:
+            required_capabilities = _keyword_capabilities(task)
+        
+        # Ensure we have at least one capability
+        if not required_capabilities:
+            required_capabilities = ["text_generation"]
+        
+        return {
+            "task": task,
+            "task_summary": task,
+            "complexity": 5,
+            "required_capabilities": required_capabilities,
+            "reasoning": "Fallback analysis using capability registry due to LLM error"
+        }
+    
+    async def batch_analyze(self, tasks: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several tasks concurrently.
+        
+        Args:
+            tasks: The task descriptions
             
-            # If no capabilities were identified, default to text_generation
-            if not required_capabilities:
-                required_capabilities = ["text_generation"]
-                logger.info("No specific capabilities identified. Defaulting to text_generation.")
-            
-            # Add the identified capabilities and scores to the analysis
-            task_analysis["required_capabilities"] = required_capabilities
-            task_analysis["capability_scores"] = capability_scores
-            task_analysis["task"] = task
+        Returns:
+            Analysis results for each task, in the same order as tasks
+        """
+        return list(await asyncio.gather(*(self.analyze_task(task) for task in tasks)))
+    
+    async def _add_required_capabilities(
+        self,
+        task: str,
+        task_analysis: Dict[str, Any],
+        capability_scores: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score the capabilities a task needs and add them to its analysis.
+        
+        Args:
+            task: The task description
+            task_analysis: The general task analysis from the LLM
+            capability_scores: Scores already computed for the task, if any
             
-            logger.info(f"Task analysis complete with capabilities: {required_capabilities}")
-            return task_analysis
+        Returns:
+            The task analysis with required capabilities, scores and the task added
+        """
+        # Now use our capability registry to determine required capabilities
+        if capability_scores is None:
+            capability_scores = await capability_registry.analyze_capabilities_with_llm(
+                task, task_analysis
+            )
+        
+        # Add required capabilities to the analysis
+        required_capabilities = [
+            name for name, score in capability_scores.items() 
+            if score >= 0.5  # Use threshold of 0.5
+        ]
+        
+        # If no capabilities were identified, default to text_generation
+        if not required_capabilities:
+            required_capabilities = ["text_generation"]
+            logger.info("No specific capabilities identified. Defaulting to text_generation.")
+        
+        # Add the identified capabilities and scores to the analysis
+        task_analysis["required_capabilities"] = required_capabilities
+        task_analysis["capability_scores"] = capability_scores
+        task_analysis["task"] = task
+        return task_analysis
+    
+    async def analyze_tasks(self, tasks: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several tasks with a single chat completion request.
+        
+        The general analyses for all tasks come back in one response, which
+        avoids a round-trip and a re-sent system prompt per task. If the
+        response cannot be matched up with the tasks, each task is analyzed
+        separately instead.
+        
+        Args:
+            tasks: The task descriptions
             
-        except Exception as e:
-            logger.error(f"Error analyzing task with LLM: {str(e)}")
-            # Fallback to using the capability registry directly with minimal task analysis
-            simple_analysis = {"task": task, "complexity": 5}
+        Returns:
+            Analysis results for each task, in the same order as tasks
+        """
+        if len(tasks) <= 1:
+            return await self.batch_analyze(tasks)
+        
+        analyses = await self._request_task_analyses(tasks)
+        if analyses is None:
+            logger.warning("Batched task analysis did not match the tasks. Analyzing tasks individually.")
+            return await self.batch_analyze(tasks)
+        
+        return list(await asyncio.gather(*(
+            self._add_required_capabilities(task, analysis)
+            for task, analysis in zip(tasks, analyses)
+        )))
+    
+    async def _request_task_analyses(self, tasks: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get general analyses for several tasks from a single LLM request.
+        
+        Args:
+            tasks: The task descriptions
             
-            try:
-                capability_scores = await capability_registry.analyze_capabilities_with_llm(
-                    task, simple_analysis
+        Returns:
+            One analysis per task in the same order, or None if the request
+            failed or its response didn't match the tasks
+        """
+        logger.info("Analyzing %d tasks with a single LLM request", len(tasks))
+        numbered_tasks = "\n".join(f"{i}. {task}" for i, task in enumerate(tasks, 1))
+        messages = [
+            _TASK_ANALYSIS_SYSTEM_MESSAGE,
+            {"role": "user", "content": (
+                f"Analyze each of these {len(tasks)} tasks. Return a JSON object of the form "
+                f'{{"analyses": [...]}} containing exactly {len(tasks)} analyses in the same '
+                f"order as the tasks, each with the fields above:\n{numbered_tasks}"
+            )}
+        ]
+        
+        try:
+            async with self._get_llm_semaphore():
+                response = await self._get_async_client().chat.completions.create(
+                    model=self.llm_config.get("model", "gpt-4o"),
+                    temperature=self.llm_config.get("temperature", 0.1),
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    extra_body={"prompt_cache_key": _TASK_ANALYSIS_CACHE_KEY}
                 )
-                required_capabilities = [
-                    name for name, score in capability_scores.items() 
-                    if score >= 0.5
-                ]
-            except Exception as inner_e:
-                logger.error(f"Error using capability registry: {str(inner_e)}")
-                required_capabilities = ["text_generation"]
-            
-            # Ensure we have at least one capability
-            if not required_capabilities:
-                required_capabilities = ["text_generation"]
-            
-            return {
-                "task": task,
-                "task_summary": task,
-                "complexity": 5,
-                "required_capabilities": required_capabilities,
-                "reasoning": "Fallback analysis using capability registry due to LLM error"
-            }
+            analyses = _loads(response.choices[0].message.content).get("analyses")
+        except Exception as e:
+            logger.error(f"Error analyzing tasks with LLM: {str(e)}")
+            return None
+        
+        if (
+            not isinstance(analyses, list)
+            or len(analyses) != len(tasks)
+            or not all(isinstance(analysis, dict) for analysis in analyses)
+        ):
+            return None
+        return analyses
     
     async def select_agents(self, task_analysis: Dict[str, Any]) -> List[AgentMetadata]:
         """
@@ -149,23 +729,45 @@ class SupervisorManager(SupervisorAgent):
         Returns:
             List of selected agents
         """
-        logger.info(f"Selecting agents for task: {task_analysis['task']}")
+        logger.info("Selecting agents for task: %s", task_analysis["task"])
         
         # Get the original task
         task = task_analysis.get("task", "")
         
-        # Get all registered agents
-        all_agents = await self.agent_registry.list_agents()
+        # Get the capabilities the task requires
+        required_capabilities = await capability_registry.get_required_capabilities(
+            task, task_analysis, threshold=0.5
+        )
+        
+        # Look up candidates in the registry's capability index instead of
+        # ranking every registered agent
+        is_async = isinstance(self.agent_registry, AsyncAgentRegistry)
+        candidates = []
+        if required_capabilities:
+            if is_async:
+                candidates = await self.agent_registry.find_agents_by_capabilities_async(required_capabilities)
+            else:
+                candidates = self.agent_registry.find_agents_by_capabilities(required_capabilities)
+        
+        # Without requirements or matching agents, consider every registered agent
+        # that is READY, like the capability index does
+        if not candidates:
+            if is_async:
+                all_agents = await self.agent_registry.list_agents_async()
+            else:
+                all_agents = self.agent_registry.list_agents()
+            candidates = [agent for agent in all_agents if agent.status == AgentStatus.READY]
         
         # Use the capability registry to filter agents based on the task
         selected_agents = await capability_registry.filter_agents_by_capabilities(
-            agents=all_agents,
+            agents=candidates,
             task=task,
             task_analysis=task_analysis,
-            threshold=0.5
+            threshold=0.5,
+            required_capabilities=required_capabilities
         )
         
-        logger.info(f"Selected {len(selected_agents)} agents for the task")
+        logger.info("Selected %d agents for the task", len(selected_agents))
         return selected_agents
     
     async def create_collaboration(
@@ -183,17 +785,16 @@ class SupervisorManager(SupervisorAgent):
         Returns:
             The session ID
         """
-        logger.info(f"Creating collaboration for task: {task}")
+        logger.info("Creating collaboration for task: %s", task)
         
         # Create a new session in the communication hub
         session_id = self.communication_hub.create_session(task, agents)
         
         # Store session info
-        self.active_sessions[session_id] = {
-            "task": task,
-            "agents": [agent.id for agent in agents],
-            "status": "active"
-        }
+        self.active_sessions[session_id] = SessionRecord(
+            task=task,
+            agent_ids=tuple(agent.id for agent in agents)
+        )
         
         # Add a system message to initiate the collaboration
         self.communication_hub.send_message(
@@ -204,7 +805,7 @@ class SupervisorManager(SupervisorAgent):
             metadata={"type": "system", "task": task}
         )
         
-        logger.info(f"Created collaboration session {session_id}")
+        logger.info("Created collaboration session %s", session_id)
         return session_id
     
     async def monitor_collaboration(self, session_id: str) -> Dict[str, Any]:
@@ -218,22 +819,23 @@ class SupervisorManager(SupervisorAgent):
             Session status information
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.active_sessions:
-            raise ValueError(f"Session {session_id} not found")
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundException(session_id)
         
-        # Get the message history from the communication hub
-        messages = self.communication_hub.get_session_history(session_id)
+        # Only the message count and last message time are needed, not the history
+        message_count, last_update = self.communication_hub.get_session_stats(session_id)
         
         status = {
             "session_id": session_id,
-            "status": self.active_sessions[session_id]["status"],
-            "message_count": len(messages),
-            "last_update": messages[-1]["timestamp"] if messages else None,
+            "status": session.status,
+            "message_count": message_count,
+            "last_update": last_update,
         }
         
-        logger.info(f"Monitored session {session_id}: {status['status']}")
+        logger.info("Monitored session %s: %s", session_id, status["status"])
         return status
     
     async def terminate_collaboration(self, session_id: str) -> bool:
@@ -247,10 +849,11 @@ class SupervisorManager(SupervisorAgent):
             True if the session was terminated successfully
             
         Raises:
-            ValueError: If the session doesn't exist
+            SessionNotFoundException: If the session doesn't exist
         """
-        if session_id not in self.active_sessions:
-            raise ValueError(f"Session {session_id} not found")
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            raise SessionNotFoundException(session_id)
         
         # Add a system message indicating termination
         self.communication_hub.send_message(
@@ -265,9 +868,9 @@ class SupervisorManager(SupervisorAgent):
         self.communication_hub.terminate_session(session_id)
         
         # Update session info
-        self.active_sessions[session_id]["status"] = "terminated"
+        session.status = "terminated"
         
-        logger.info(f"Terminated collaboration session {session_id}")
+        logger.info("Terminated collaboration session %s", session_id)
         return True
         
     async def determine_agent_execution_order(self, agents: List[AgentMetadata]) -> List[AgentMetadata]:
@@ -283,123 +886,78 @@ class SupervisorManager(SupervisorAgent):
         Returns:
             Ordered list of agents optimized for collaboration efficiency
         """
-        logger.info(f"Determining optimal execution order for {len(agents)} agents")
-        
-        # Define the execution priority for different agent roles
-        role_priorities = {
-            "research": 1,
-            "strategist": 2, 
-            "writer": 3,
-            "content": 3,  # Same priority as writer
-            "evaluator": 4,
-            "reviewer": 4   # Same priority as evaluator
-        }
+        logger.info("Determining optimal execution order for %d agents", len(agents))
         
-        # Default priority for agents that don't match any category
-        default_priority = 5
+        # Nothing to order
+        if len(agents) < 2:
+            return list(agents)
         
-        # Build a dependency graph
-        dependencies = {}  # agent_id -> list of agent_ids it depends on
-        agent_map = {agent.id: agent for agent in agents}
-        
-        # First pass: collect explicit dependencies from agent configs
-        for agent in agents:
-            if agent.config and "depends_on" in agent.config:
-                depends_on = agent.config["depends_on"]
-                if isinstance(depends_on, list):
-                    # Filter to only include valid agent IDs
-                    valid_dependencies = [dep for dep in depends_on if dep in agent_map]
-                    dependencies[agent.id] = valid_dependencies
-                elif isinstance(depends_on, str) and depends_on in agent_map:
-                    dependencies[agent.id] = [depends_on]
-        
-        # Assign priority to each agent based on various factors
+        # Single pass: index the agents, collect declared dependencies and assign priorities
+        agent_map = {}
+        dependencies = {}  # agent_id -> agent_ids it depends on
         prioritized_agents = []
         for agent in agents:
-            # Check if the agent has an explicitly defined execution priority in its config
-            if agent.config and "execution_priority" in agent.config:
-                try:
-                    # Use the explicitly defined priority
-                    agent_priority = int(agent.config["execution_priority"])
-                    prioritized_agents.append((agent_priority, agent))
-                    continue
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid execution_priority in agent config for {agent.name}")
-            
-            # Check agent name and description for role indicators
-            agent_priority = default_priority
-            agent_text = f"{agent.name.lower()} {agent.description.lower()}"
-            
-            # Find the highest priority role that matches this agent
-            for role, priority in role_priorities.items():
-                if role in agent_text:
-                    agent_priority = min(agent_priority, priority)  # Use the highest priority (lowest number)
-            
-            # Check capabilities if available
-            if agent.capabilities:
-                for capability in agent.capabilities:
-                    # Look for capabilities that might indicate a role
-                    capability_name = capability.name.lower()
-                    if "research" in capability_name and role_priorities.get("research", 99) < agent_priority:
-                        agent_priority = role_priorities["research"]
-                    elif "strategy" in capability_name and role_priorities.get("strategist", 99) < agent_priority:
-                        agent_priority = role_priorities["strategist"]
-                    elif "content" in capability_name and role_priorities.get("content", 99) < agent_priority:
-                        agent_priority = role_priorities["content"]
-                    elif "evaluate" in capability_name and role_priorities.get("evaluator", 99) < agent_priority:
-                        agent_priority = role_priorities["evaluator"]
-                    # Check if the capability has execution_order info
-                    elif capability.parameters and "execution_priority" in capability.parameters:
-                        try:
-                            priority = int(capability.parameters["execution_priority"])
-                            agent_priority = min(agent_priority, priority)
-                        except (ValueError, TypeError):
-                            pass
-            
-            # Store the agent with its priority
-            prioritized_agents.append((agent_priority, agent))
-        
-        # Sort agents by priority
-        prioritized_agents.sort(key=lambda x: x[0])
-        sorted_agents = [agent for _, agent in prioritized_agents]
+            agent_map[agent.id] = agent
+            config = agent.config
+            if config and "depends_on" in config:
+                dependencies[agent.id] = _as_dependency_ids(config["depends_on"])
+            prioritized_agents.append((_agent_priority(agent), agent))
+        
+        # Dependencies may name agents later in the list, so filter to valid IDs only
+        # now, with one set intersection per agent (which also drops duplicates)
+        for agent_id, dep_ids in list(dependencies.items()):
+            valid_dependencies = agent_map.keys() & dep_ids
+            if valid_dependencies:
+                dependencies[agent_id] = valid_dependencies
+            else:
+                del dependencies[agent_id]
         
         # Process dependencies to ensure proper execution order
         if dependencies:
-            # Create a final execution order respecting dependencies
-            processed = set()
-            agent_execution_order = []
-            
-            def add_with_dependencies(agent_id):
-                """Add an agent and its dependencies to the execution order."""
-                if agent_id in processed:
-                    return
-                
-                # First add dependencies
-                if agent_id in dependencies:
-                    for dep_id in dependencies[agent_id]:
-                        add_with_dependencies(dep_id)
-                
-                # Then add the agent if it hasn't been processed
-                if agent_id not in processed and agent_id in agent_map:
-                    agent_execution_order.append(agent_map[agent_id])
-                    processed.add(agent_id)
+            # Kahn's algorithm: repeatedly schedule the highest priority agent whose
+            # dependencies have all been scheduled. The heap orders ready agents by
+            # (priority, input position), so no separate priority sort is needed.
+            rank = {}
+            for index, (agent_priority, agent) in enumerate(prioritized_agents):
+                rank.setdefault(agent.id, (agent_priority, index))
+            in_degree = dict.fromkeys(rank, 0)
+            dependents = {}  # agent_id -> list of agent_ids that depend on it
+            for agent_id, dep_ids in dependencies.items():
+                for dep_id in dep_ids:
+                    in_degree[agent_id] += 1
+                    dependents.setdefault(dep_id, []).append(agent_id)
             
-            # Process each agent in priority order
-            for agent in sorted_agents:
-                add_with_dependencies(agent.id)
+            ready = [(rank[agent_id], agent_id) for agent_id, degree in in_degree.items() if not degree]
+            heapq.heapify(ready)
+            agent_execution_order = []
+            while ready:
+                _, agent_id = heapq.heappop(ready)
+                agent_execution_order.append(agent_map[agent_id])
+                for dependent_id in dependents.get(agent_id, ()):
+                    in_degree[dependent_id] -= 1
+                    if not in_degree[dependent_id]:
+                        heapq.heappush(ready, (rank[dependent_id], dependent_id))
             
-            # Add any remaining agents that weren't processed
-            for agent in sorted_agents:
-                if agent.id not in processed:
-                    agent_execution_order.append(agent)
-                    processed.add(agent.id)
+            # Agents in a dependency cycle never become ready; add them in priority order
+            if len(agent_execution_order) < len(rank):
+                logger.warning("Circular agent dependencies found; appending those agents in priority order")
+                agent_execution_order.extend(
+                    agent_map[agent_id]
+                    for _, agent_id in sorted((rank[agent_id], agent_id) for agent_id in rank if in_degree[agent_id])
+                )
         else:
-            # If no dependencies, just use the priority-sorted list
-            agent_execution_order = sorted_agents
+            # If no dependencies, just sort by priority. The sort is stable, so ties
+            # keep their input order and agents themselves are never compared.
+            # Explicit priorities can be any integer, so a fixed-range bucket sort
+            # doesn't apply.
+            prioritized_agents.sort(key=operator.itemgetter(0))
+            agent_execution_order = [agent for _, agent in prioritized_agents]
         
         # If no order was determined, use the original order
         if not agent_execution_order:
             agent_execution_order = agents
         
-        logger.info(f"Determined execution order: {[agent.name for agent in agent_execution_order]}")
+        # Only build the list of names when it will actually be logged
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Determined execution order: %s", [agent.name for agent in agent_execution_order])
         return agent_execution_order 
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Shared helpers for the test modules.
+"""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import yaml
+
+from ams.core.registry.models import AgentCapability, AgentFramework, AgentMetadata
+
+# The libyaml-backed dumper is much faster than the pure-Python one when available
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@contextmanager
+def yaml_config_file(config_data: Dict[str, Any]) -> Iterator[str]:
+    """
+    Write config data to a temporary YAML file.
+
+    The file lives in its own temporary directory, which is removed on exit.
+
+    Args:
+        config_data: The configuration to write
+
+    Yields:
+        Path of the YAML file
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "config.yaml"
+        path.write_text(yaml.dump(config_data, Dumper=_YAML_DUMPER))
+        yield str(path)
+
+
+def make_agent(agent_id: str, capabilities: Tuple[str, ...] = ("text_generation",), **fields: Any) -> AgentMetadata:
+    """
+    Build agent metadata for tests.
+
+    Args:
+        agent_id: ID of the agent, also used as its name
+        capabilities: Names of the agent's capabilities
+        **fields: Other AgentMetadata fields to set, such as status
+
+    Returns:
+        The agent metadata
+    """
+    return AgentMetadata(
+        id=agent_id,
+        name=agent_id,
+        description=f"Test agent {agent_id}",
+        system_prompt="You are a test agent.",
+        framework=AgentFramework.AUTOGEN,
+        capabilities=[AgentCapability(name=name, description=name) for name in capabilities],
+        **fields
+    )
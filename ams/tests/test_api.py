@@ -0,0 +1,97 @@
+"""
+Tests for the API endpoints.
+"""
+
+import importlib
+import json
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from ams.tests.helpers import make_agent
+
+# ams.api rebinds the name "app" to the application, so look the module up directly
+app_module = importlib.import_module("ams.api.app")
+
+
+class TestStreamMessages(unittest.TestCase):
+    """Test cases for the /tasks/{session_id}/stream endpoint."""
+
+    def setUp(self):
+        """Create a test client and a session with one message after the start message."""
+        self.client = TestClient(app_module.create_app())
+        self.hub = app_module.communication_hub
+        self.session_id = self.hub.create_session("Test task", [make_agent("agent-1")])
+        self.addCleanup(self.hub.delete_session, self.session_id)
+        self.hub.send_message(self.session_id, "Hello", "agent-1", "agent-1")
+
+    def test_unknown_session(self):
+        """Test that streaming an unknown session returns an error before the stream starts."""
+        response = self.client.get("/tasks/missing/stream")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["code"], "SUPERVISOR_ERROR")
+
+    def test_inactive_session_streams_history_then_done(self):
+        """Test that a session without an active collaboration sends its history and closes."""
+        with mock.patch.object(app_module, "STREAM_IDLE_SECONDS", 0.01):
+            response = self.client.get(f"/tasks/{self.session_id}/stream", params={"since": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = [event for event in response.text.split("\n\n") if event]
+        self.assertEqual(events[-1], "event: done\ndata: {}")
+        messages = [json.loads(event[len("data: "):]) for event in events if event.startswith("data: ")]
+        self.assertEqual([message["content"] for message in messages], ["Hello"])
+
+
+class TestRegisterAgentsBatch(unittest.TestCase):
+    """Test cases for the /agents/batch endpoint."""
+
+    def setUp(self):
+        """Create a test client and a valid agent payload."""
+        self.client = TestClient(app_module.create_app())
+        self.registry = app_module.agent_registry
+        self.agent_data = {
+            "name": "Writer",
+            "description": "Writes text",
+            "system_prompt": "You are a writer.",
+            "framework": "autogen",
+            "capabilities": [{"name": "text_generation", "description": "Writes text"}]
+        }
+
+    def _register(self, agents):
+        """Post a batch and return the response and the number of agents it added."""
+        count = len(self.registry.list_agents())
+        response = self.client.post("/agents/batch", json={"agents": agents})
+        for agent in response.json() if response.status_code == 200 else ():
+            self.addCleanup(self.registry.delete_agent, agent["id"])
+        return response, len(self.registry.list_agents()) - count
+
+    def test_registers_all_agents(self):
+        """Test that a valid batch registers every agent in request order."""
+        response, added = self._register([self.agent_data, dict(self.agent_data, name="Critic")])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([agent["name"] for agent in response.json()], ["Writer", "Critic"])
+        self.assertEqual(added, 2)
+
+    def test_bad_entry_registers_nothing(self):
+        """Test that one malformed entry rejects the whole batch with its index."""
+        bad_entries = [
+            "not an object",
+            dict(self.agent_data, unknown="value"),
+            {"name": "Missing fields"},
+            dict(self.agent_data, framework="unknown"),
+            dict(self.agent_data, capabilities=["not an object"]),
+        ]
+        for bad_entry in bad_entries:
+            response, added = self._register([self.agent_data, bad_entry])
+            self.assertEqual(response.status_code, 400, bad_entry)
+            error = response.json()["error"]
+            self.assertEqual(error["code"], "REGISTRY_ERROR")
+            self.assertEqual(error["details"]["index"], 1)
+            self.assertEqual(added, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
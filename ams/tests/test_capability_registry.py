@@ -0,0 +1,69 @@
+"""
+Tests for the capability registry.
+"""
+
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from ams.core.registry.capability_registry import CapabilityRegistry
+
+
+def _batch(status, output_file_id=None):
+    """Build a fake Batch API batch object."""
+    return SimpleNamespace(id="batch-1", status=status, output_file_id=output_file_id)
+
+
+class TestCapabilityBatch(unittest.TestCase):
+    """Test cases for CapabilityRegistry.analyze_capabilities_batch."""
+
+    def setUp(self):
+        """Create a registry with one capability and a fake OpenAI client."""
+        self.registry = CapabilityRegistry()
+        self.registry.register_capability("research", "Can research topics")
+
+        patcher = mock.patch("ams.core.registry.capability_registry.openai")
+        self.openai = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.openai.files.create.return_value = SimpleNamespace(id="file-1")
+
+    def test_timeout_cancels_batch_and_deletes_file(self):
+        """Test that a batch still running at the timeout is cancelled and cleaned up."""
+        self.openai.batches.create.return_value = _batch("in_progress")
+        self.openai.batches.retrieve.return_value = _batch("in_progress")
+
+        results = asyncio.run(self.registry.analyze_capabilities_batch(
+            ["Research solar panels"], poll_interval=0.01, timeout=0.05
+        ))
+
+        self.assertEqual(results, [{}])
+        self.openai.batches.cancel.assert_called_once_with("batch-1")
+        self.openai.files.delete.assert_called_once_with("file-1")
+        self.openai.files.content.assert_not_called()
+
+    def test_completed_batch_returns_scores(self):
+        """Test that completed batch output is mapped back to task order."""
+        self.openai.batches.create.return_value = _batch("validating")
+        self.openai.batches.retrieve.return_value = _batch("completed", output_file_id="file-2")
+        record = {
+            "custom_id": "task-1",
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": {"content": json.dumps({"research": 0.9})}}]}
+            }
+        }
+        self.openai.files.content.return_value = SimpleNamespace(text=json.dumps(record))
+
+        results = asyncio.run(self.registry.analyze_capabilities_batch(
+            ["Write a poem", "Research solar panels"], poll_interval=0.01
+        ))
+
+        self.assertEqual(results, [{}, {"research": 0.9}])
+        self.openai.batches.cancel.assert_not_called()
+        self.openai.files.delete.assert_called_once_with("file-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for the AMS exceptions.
+"""
+
+import unittest
+
+from ams.core.errors import AgentNotFoundException, AMSBaseException
+
+
+class TestErrors(unittest.TestCase):
+    """Test cases for AMSBaseException."""
+
+    def test_details_default_to_mutable_dict(self):
+        """Test that exceptions raised without details can still be enriched."""
+        exc = AgentNotFoundException("agent-1")
+        self.assertEqual(exc.details, {})
+        exc.details["attempt"] = 2
+        self.assertEqual(exc.to_dict()["error"]["details"], {"attempt": 2})
+
+        # Each exception gets its own dict
+        self.assertEqual(AgentNotFoundException("agent-2").details, {})
+
+    def test_to_dict_reflects_later_changes(self):
+        """Test that to_dict picks up changes made after an earlier call."""
+        exc = AMSBaseException("Original", details={"key": "value"})
+        self.assertEqual(exc.to_dict()["error"]["message"], "Original")
+
+        exc.message = "Enriched"
+        exc.details["extra"] = True
+        error = exc.to_dict()["error"]
+        self.assertEqual(error["message"], "Enriched")
+        self.assertEqual(error["details"], {"key": "value", "extra": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""
+Tests for the communication hub.
+"""
+
+import unittest
+
+from ams.core.communication import CommunicationHub
+from ams.core.errors import SessionNotFoundException
+from ams.tests.helpers import make_agent
+
+
+class TestCommunicationHub(unittest.TestCase):
+    """Test cases for CommunicationHub."""
+
+    def setUp(self):
+        """Create a hub with one session."""
+        self.hub = CommunicationHub()
+        self.session_id = self.hub.create_session("Test task", [make_agent("agent-1"), make_agent("agent-2")])
+
+    def test_unknown_session_raises(self):
+        """Test that unknown sessions raise SessionNotFoundException."""
+        calls = [
+            lambda: self.hub.send_message("missing", "Hello", "agent-1", "agent-1"),
+            lambda: self.hub.get_session_history("missing"),
+            lambda: self.hub.get_session("missing"),
+            lambda: self.hub.terminate_session("missing"),
+        ]
+        for call in calls:
+            with self.assertRaises(SessionNotFoundException) as context:
+                call()
+            self.assertEqual(context.exception.code, "SUPERVISOR_ERROR")
+            self.assertIn("missing", context.exception.message)
+
+    def test_session_not_found_is_value_error(self):
+        """Test that callers catching ValueError still see unknown sessions."""
+        with self.assertRaises(ValueError):
+            self.hub.get_session_history("missing")
+
+    def test_sessions_across_shards(self):
+        """Test lookup, iteration and deletion with sessions spread over shards."""
+        session_ids = [self.session_id] + [
+            self.hub.create_session(f"Task {i}", [make_agent("agent-1")]) for i in range(40)
+        ]
+
+        # With 41 sessions over 16 shards, more than one shard is in use
+        self.assertGreater(sum(1 for shard in self.hub._shards if shard), 1)
+        for session_id in session_ids:
+            self.assertEqual(self.hub.get_session(session_id).session_id, session_id)
+        self.assertCountEqual([session.session_id for session in self.hub.iter_sessions()], session_ids)
+        self.assertEqual(len(self.hub.list_sessions()), len(session_ids))
+
+        self.assertTrue(self.hub.delete_session(session_ids[1]))
+        self.assertFalse(self.hub.delete_session(session_ids[1]))
+        with self.assertRaises(SessionNotFoundException):
+            self.hub.get_session(session_ids[1])
+        self.assertEqual(len(list(self.hub.iter_sessions())), len(session_ids) - 1)
+
+    def test_delete_session_prunes_sender_identities(self):
+        """Test that deleting a session forgets agents no other session includes."""
+        other_id = self.hub.create_session("Another task", [make_agent("agent-1"), make_agent("agent-3")])
+        self.assertCountEqual(self.hub.sender_identities, ["agent-1", "agent-2", "agent-3"])
+
+        self.hub.delete_session(self.session_id)
+        self.assertCountEqual(self.hub.sender_identities, ["agent-1", "agent-3"])
+        self.hub.delete_session(other_id)
+        self.assertEqual(self.hub.sender_identities, {})
+
+    def test_sessions_view(self):
+        """Test that the sessions property is a live, read-only mapping."""
+        sessions = self.hub.sessions
+        self.assertIn(self.session_id, sessions)
+        self.assertIs(sessions[self.session_id], self.hub.get_session(self.session_id))
+        self.assertEqual(len(sessions), 1)
+
+        other_id = self.hub.create_session("Another task", [make_agent("agent-1")])
+        self.assertIn(other_id, sessions)
+        self.assertCountEqual(sessions.keys(), [self.session_id, other_id])
+
+        with self.assertRaises(TypeError):
+            sessions["new"] = sessions[self.session_id]
+
+    def test_since_counts_evicted_messages(self):
+        """Test that since offsets stay absolute once the message cap evicts messages."""
+        hub = CommunicationHub(max_messages=3)
+        session_id = hub.create_session("Capped task", [make_agent("agent-1")])
+        # Six messages in all: the session start message, then five more
+        for i in range(1, 6):
+            hub.send_message(session_id, f"message {i}", "agent-1", "agent-1")
+
+        # A poller that has seen five messages only gets the sixth
+        self.assertEqual([m["content"] for m in hub.get_session_history(session_id, since=5)], ["message 5"])
+        # Offsets before the retained window return everything still retained
+        self.assertEqual(
+            [m["content"] for m in hub.get_session_history(session_id, since=1)],
+            ["message 3", "message 4", "message 5"]
+        )
+        self.assertEqual(hub.get_session_history(session_id, since=6), [])
+
+        message_count, _ = hub.get_session_stats(session_id)
+        self.assertEqual(message_count, 6)
+        self.assertEqual(hub.get_session(session_id).get_session_info()["message_count"], 6)
+        # get_messages still returns a list, which callers can slice
+        self.assertEqual([m.content for m in hub.get_session(session_id).get_messages()[-2:]], ["message 4", "message 5"])
+
+    def test_send_messages_bulk(self):
+        """Test that bulk sends add every message in order and return them."""
+        sent = self.hub.send_messages_bulk(self.session_id, [
+            ("First", "agent-1", "agent-1", None),
+            ("Second", "agent-2", "agent-2", {"topic": "test"}),
+        ])
+
+        self.assertEqual([message.content for message in sent], ["First", "Second"])
+        self.assertEqual(sent[1].metadata["topic"], "test")
+        history = self.hub.get_session_history(self.session_id, since=1)
+        self.assertEqual([m["message_id"] for m in history], [message.message_id for message in sent])
+        message_count, _ = self.hub.get_session_stats(self.session_id)
+        self.assertEqual(message_count, 3)
+        with self.assertRaises(SessionNotFoundException):
+            self.hub.send_messages_bulk("missing", [("Hello", "agent-1", "agent-1", None)])
+
+    def test_subscribers_receive_new_messages(self):
+        """Test that every subscriber queue gets each message sent after subscribing."""
+        first = self.hub.subscribe(self.session_id, "agent-1")
+        second = self.hub.subscribe(self.session_id, "agent-2")
+        self.assertIs(self.hub.subscribe(self.session_id, "agent-1"), first)
+
+        message = self.hub.send_message(self.session_id, "Hello", "agent-1", "agent-1")
+        bulk = self.hub.send_messages_bulk(self.session_id, [("Bulk", "agent-2", "agent-2", None)])
+
+        for queue in (first, second):
+            self.assertEqual([queue.get_nowait() for _ in range(queue.qsize())], [message] + bulk)
+
+        self.assertTrue(self.hub.unsubscribe(self.session_id, "agent-2"))
+        self.assertFalse(self.hub.unsubscribe(self.session_id, "agent-2"))
+        self.hub.send_message(self.session_id, "After", "agent-1", "agent-1")
+        self.assertEqual(first.qsize(), 1)
+        self.assertTrue(second.empty())
+
+    def test_full_subscriber_queue_drops_messages(self):
+        """Test that a full bounded queue drops new messages without affecting others."""
+        bounded = self.hub.subscribe(self.session_id, "agent-1", maxsize=1)
+        unbounded = self.hub.subscribe(self.session_id, "agent-2")
+
+        first = self.hub.send_message(self.session_id, "First", "agent-1", "agent-1")
+        with self.assertLogs("ams.core.communication.chat_context", level="WARNING"):
+            self.hub.send_message(self.session_id, "Second", "agent-1", "agent-1")
+
+        self.assertEqual(bounded.qsize(), 1)
+        self.assertIs(bounded.get_nowait(), first)
+        self.assertEqual(unbounded.qsize(), 2)
+        # Dropped messages are still in the history
+        self.assertEqual(len(self.hub.get_session_history(self.session_id, since=1)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
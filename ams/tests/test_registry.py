@@ -0,0 +1,98 @@
+"""
+Tests for the in-memory agent registry.
+"""
+
+import unittest
+
+from ams.core.registry import InMemoryAgentRegistry
+from ams.core.registry.models import AgentStatus
+from ams.tests.helpers import make_agent
+
+
+class TestInMemoryAgentRegistry(unittest.TestCase):
+    """Test cases for InMemoryAgentRegistry and its capability and status indexes."""
+
+    def setUp(self):
+        """Create a registry with READY, busy and offline agents."""
+        self.registry = InMemoryAgentRegistry()
+        self.registry.register_agent(make_agent("writer", status=AgentStatus.READY))
+        self.registry.register_agent(make_agent("researcher", ("research", "text_generation"), status=AgentStatus.READY))
+        self.registry.register_agent(make_agent("busy", ("research",), status=AgentStatus.BUSY))
+        self.registry.register_agent(make_agent("offline"))
+
+    def assert_indexes_consistent(self):
+        """Check the indexes against a rebuild from the registered agents."""
+        by_cap = {}
+        for agent in self.registry.agents.values():
+            for capability in agent.capabilities or ():
+                by_cap.setdefault(capability.name, set()).add(agent.id)
+        self.assertEqual({name: set(agent_ids) for name, agent_ids in self.registry._by_cap.items()}, by_cap)
+        ready = {agent.id for agent in self.registry.agents.values() if agent.status is AgentStatus.READY}
+        self.assertEqual(self.registry._ready, ready)
+
+    def test_register(self):
+        """Test that registration indexes capabilities and READY status."""
+        self.assert_indexes_consistent()
+        self.assertEqual(list(self.registry._by_cap["research"]), ["researcher", "busy"])
+        self.assertEqual(self.registry._ready, {"writer", "researcher"})
+
+    def test_re_register_replaces_index_entries(self):
+        """Test that registering an existing ID drops the old capability and status entries."""
+        self.registry.register_agent(make_agent("researcher", ("code_generation",), status=AgentStatus.BUSY))
+
+        self.assert_indexes_consistent()
+        self.assertEqual(list(self.registry._by_cap["research"]), ["busy"])
+        self.assertEqual(list(self.registry._by_cap["code_generation"]), ["researcher"])
+        self.assertNotIn("researcher", self.registry._ready)
+
+    def test_re_register_edited_instance(self):
+        """Test that re-registering the same instance after editing its capabilities drops the old entries."""
+        agent = self.registry.get_agent("researcher")
+        agent.capabilities = make_agent("researcher", ("code_generation",)).capabilities
+        self.registry.register_agent(agent)
+
+        self.assert_indexes_consistent()
+        self.assertEqual([agent.id for agent in self.registry.find_agents_by_capability("research")], [])
+        self.assertEqual([agent.id for agent in self.registry.find_agents_by_capability("code_generation")], ["researcher"])
+        self.assertEqual(self.registry._indexed_caps["researcher"], ("code_generation",))
+
+    def test_update_status(self):
+        """Test that status updates move agents in and out of the READY index."""
+        self.registry.update_agent_status("busy", AgentStatus.READY)
+        self.registry.update_agent_status("writer", "offline")
+
+        self.assert_indexes_consistent()
+        self.assertIs(self.registry.get_agent("writer").status, AgentStatus.OFFLINE)
+        self.assertEqual(self.registry._ready, {"researcher", "busy"})
+        with self.assertRaises(ValueError):
+            self.registry.update_agent_status("missing", AgentStatus.READY)
+
+    def test_delete(self):
+        """Test that deleting agents removes them and any emptied capability entries."""
+        self.assertTrue(self.registry.delete_agent("researcher"))
+        self.assertTrue(self.registry.delete_agent("busy"))
+        self.assertFalse(self.registry.delete_agent("busy"))
+
+        self.assert_indexes_consistent()
+        self.assertNotIn("research", self.registry._by_cap)
+        self.assertNotIn("researcher", self.registry._indexed_caps)
+        self.assertEqual(self.registry.find_agents_by_capability("research"), [])
+
+    def test_find_agents_by_capability(self):
+        """Test that single capability lookups only return READY agents."""
+        self.assertEqual([agent.id for agent in self.registry.find_agents_by_capability("research")], ["researcher"])
+        self.assertEqual(self.registry.find_agents_by_capability("unknown"), [])
+
+    def test_find_agents_by_capabilities(self):
+        """Test that multi capability lookups return READY agents once, in first-seen order."""
+        agents = self.registry.find_agents_by_capabilities(["research", "text_generation", "unknown"])
+        self.assertEqual([agent.id for agent in agents], ["researcher", "writer"])
+
+        self.registry.update_agent_status("busy", AgentStatus.READY)
+        agents = self.registry.find_agents_by_capabilities(iter(["text_generation", "research"]))
+        self.assertEqual([agent.id for agent in agents], ["writer", "researcher", "busy"])
+        self.assertEqual(self.registry.find_agents_by_capabilities([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
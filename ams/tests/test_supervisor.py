@@ -0,0 +1,362 @@
+"""
+Tests for the supervisor manager.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from ams.core.communication import CommunicationHub
+from ams.core.registry import InMemoryAgentRegistry
+from ams.core.registry.models import AgentStatus
+from ams.core.registry.capability_registry import capability_registry
+from ams.core.supervisor.manager import SupervisorManager, _FALLBACK_KEYWORDS, _keyword_capabilities
+from ams.tests.helpers import make_agent
+
+
+class TestFallbackAnalysis(unittest.TestCase):
+    """Test cases for the keyword fallback used when the LLM is unavailable."""
+
+    def setUp(self):
+        """Create a supervisor with empty dependencies."""
+        self.supervisor = SupervisorManager(InMemoryAgentRegistry(), CommunicationHub())
+
+    def test_keywords_map_to_registered_capabilities(self):
+        """Test that every fallback capability is registered."""
+        for capability in _FALLBACK_KEYWORDS:
+            self.assertIn(capability, capability_registry.capabilities)
+
+    def test_keyword_capabilities(self):
+        """Test that keywords map to capabilities in order of first appearance."""
+        self.assertEqual(
+            _keyword_capabilities("Research the DATA, write it up and ship the code"),
+            ["research", "text_generation", "code_generation"]
+        )
+        self.assertEqual(_keyword_capabilities("Say hello"), [])
+
+    def test_unregistered_capabilities_are_skipped(self):
+        """Test that capabilities missing from the registry are never suggested."""
+        registered = {name: info for name, info in capability_registry.capabilities.items() if name != "research"}
+        with mock.patch.object(capability_registry, "capabilities", registered):
+            self.assertEqual(_keyword_capabilities("Research and write"), ["text_generation"])
+
+    def test_fallback_analysis(self):
+        """Test the fallback analysis with and without registry scores."""
+        analysis = self.supervisor._fallback_analysis("Review this plan", RuntimeError("LLM down"))
+        self.assertEqual(analysis["required_capabilities"], ["evaluation", "planning"])
+
+        analysis = self.supervisor._fallback_analysis("Review this plan", {"research": 0.8, "planning": 0.2})
+        self.assertEqual(analysis["required_capabilities"], ["research"])
+
+        analysis = self.supervisor._fallback_analysis("Say hello", RuntimeError("LLM down"))
+        self.assertEqual(analysis["required_capabilities"], ["text_generation"])
+
+
+class TestSelectAgents(unittest.TestCase):
+    """Test cases for SupervisorManager.select_agents."""
+
+    def setUp(self):
+        """Register READY and non-READY agents with different capabilities."""
+        self.registry = InMemoryAgentRegistry()
+        self.registry.register_agent(make_agent("writer", status=AgentStatus.READY))
+        self.registry.register_agent(make_agent("researcher", ("research",), status=AgentStatus.READY))
+        self.registry.register_agent(make_agent("busy-researcher", ("research",), status=AgentStatus.BUSY))
+        self.registry.register_agent(make_agent("offline-writer", status=AgentStatus.OFFLINE))
+        self.supervisor = SupervisorManager(self.registry, CommunicationHub())
+
+    def _select(self, required_capabilities):
+        """Run select_agents with the given required capabilities and return the agent IDs."""
+        with mock.patch.object(
+            capability_registry, "get_required_capabilities",
+            mock.AsyncMock(return_value=set(required_capabilities))
+        ):
+            agents = asyncio.run(self.supervisor.select_agents({"task": "Test task"}))
+        return [agent.id for agent in agents]
+
+    def test_matching_agents_are_ready(self):
+        """Test that only READY agents with a required capability are selected."""
+        self.assertEqual(self._select({"research"}), ["researcher"])
+
+    def test_no_match_falls_back_to_ready_agents(self):
+        """Test that the fallback skips busy and offline agents as well."""
+        self.assertCountEqual(self._select({"code_generation"}), ["writer", "researcher"])
+        self.assertCountEqual(self._select(set()), ["writer", "researcher"])
+
+
+class TestExecutionOrder(unittest.TestCase):
+    """Test cases for SupervisorManager.determine_agent_execution_order."""
+
+    def setUp(self):
+        """Create a supervisor with empty dependencies."""
+        self.supervisor = SupervisorManager(InMemoryAgentRegistry(), CommunicationHub())
+
+    def _order(self, *agents):
+        """Order agents given as (ID, config) pairs and return the IDs."""
+        ordered = asyncio.run(self.supervisor.determine_agent_execution_order(
+            [make_agent(agent_id, config=config) for agent_id, config in agents]
+        ))
+        return [agent.id for agent in ordered]
+
+    def test_priorities_without_dependencies(self):
+        """Test that agents run by priority, with ties in input order."""
+        self.assertEqual(
+            self._order(
+                ("a", {"execution_priority": 2}),
+                ("b", {"execution_priority": 1}),
+                ("c", {"execution_priority": 2}),
+                ("d", {"execution_priority": -1}),
+            ),
+            ["d", "b", "a", "c"]
+        )
+
+    def test_dependencies_with_priorities(self):
+        """Test that dependencies come first and otherwise priority decides."""
+        self.assertEqual(
+            self._order(
+                ("a", {"execution_priority": 1}),
+                ("b", {"execution_priority": 0, "depends_on": "c"}),
+                ("c", {"execution_priority": 2}),
+                ("d", {"execution_priority": 3, "depends_on": ["missing"]}),
+            ),
+            ["a", "c", "b", "d"]
+        )
+
+    def test_dependency_cycle(self):
+        """Test that agents in a cycle follow the others, in priority order."""
+        with self.assertLogs("ams.core.supervisor.manager", level="WARNING"):
+            order = self._order(
+                ("x", {"execution_priority": 1, "depends_on": ["y"]}),
+                ("y", {"execution_priority": 0, "depends_on": ["x"]}),
+                ("z", {"execution_priority": 2}),
+            )
+        self.assertEqual(order, ["z", "y", "x"])
+
+
+class TestTaskAnalysisCache(unittest.TestCase):
+    """Test cases for the exact-match task analysis cache."""
+
+    def setUp(self):
+        """Create a supervisor whose LLM requests are mocked."""
+        self.supervisor = SupervisorManager(InMemoryAgentRegistry(), CommunicationHub())
+        self.request = mock.AsyncMock(side_effect=lambda task, *args: {
+            "task_summary": task, "complexity": 2, "subtasks": [task], "fields": []
+        })
+        self.supervisor._send_task_analysis_request = self.request
+        patcher = mock.patch.object(
+            capability_registry, "analyze_capabilities_with_llm", mock.AsyncMock(return_value={"research": 0.9})
+        )
+        self.scores = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_task_is_served_from_cache(self):
+        """Test that an identical task makes one request and callers get their own copies."""
+        first = asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+        first["required_capabilities"].append("planning")
+        first["subtasks"].append("Changed")
+
+        second = asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+        self.assertEqual(self.request.await_count, 1)
+        self.assertEqual(second["required_capabilities"], ["research"])
+        self.assertEqual(second["subtasks"], ["Research solar panels"])
+        # Capabilities are scored from the task alone, without invented analysis fields
+        self.scores.assert_awaited_once_with("Research solar panels", None)
+
+    def test_capability_changes_invalidate_cache(self):
+        """Test that cached analyses are dropped once the registered capabilities change."""
+        asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+
+        self.scores.return_value = {"planning": 0.9}
+        with mock.patch.object(capability_registry, "_caps_version", capability_registry._caps_version + 1):
+            analysis = asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+
+        self.assertEqual(self.request.await_count, 2)
+        self.assertEqual(analysis["required_capabilities"], ["planning"])
+        self.assertEqual(len(self.supervisor._exact_cache), 1)
+
+    def test_concurrent_identical_tasks_share_one_request(self):
+        """Test that concurrent identical tasks are coalesced into one request."""
+        self.request.side_effect = self._slow_analysis
+
+        async def analyze():
+            return await asyncio.gather(*(self.supervisor.analyze_task("Research solar panels") for _ in range(5)))
+
+        results = asyncio.run(analyze())
+        self.assertEqual(self.request.await_count, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        results[0]["subtasks"].append("Changed")
+        self.assertEqual(results[1]["subtasks"], ["Research solar panels"])
+        self.assertEqual(self.supervisor._pending_analyses, {})
+
+    def test_cancelled_waiter_leaves_others_running(self):
+        """Test that cancelling one coalesced caller doesn't cancel the shared request."""
+        self.request.side_effect = self._slow_analysis
+
+        async def analyze():
+            cancelled = asyncio.ensure_future(self.supervisor.analyze_task("Research solar panels"))
+            waiting = asyncio.ensure_future(self.supervisor.analyze_task("Research solar panels"))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return cancelled, await waiting
+
+        cancelled, analysis = asyncio.run(analyze())
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(analysis["required_capabilities"], ["research"])
+        self.assertEqual(self.request.await_count, 1)
+        self.assertEqual(len(self.supervisor._exact_cache), 1)
+
+    @staticmethod
+    async def _slow_analysis(task, *args):
+        """Return a basic analysis after yielding to the event loop."""
+        await asyncio.sleep(0.01)
+        return {"task_summary": task, "complexity": 2, "subtasks": [task], "fields": []}
+
+
+class TestTaskAnalysisSemanticCache(unittest.TestCase):
+    """Test cases for the semantic task analysis cache."""
+
+    def setUp(self):
+        """Create a supervisor with the semantic cache enabled and mocked LLM requests."""
+        # A temperature above the exact-match limit, so only the semantic cache applies
+        self.supervisor = SupervisorManager(
+            InMemoryAgentRegistry(), CommunicationHub(), {"cache_enabled": True, "temperature": 0.5}
+        )
+        self.supervisor._analysis_cache.embed = mock.Mock(return_value=[1.0, 0.0])
+        self.request = mock.AsyncMock(side_effect=lambda task, *args: {
+            "task_summary": task, "complexity": 2, "subtasks": [task], "fields": []
+        })
+        self.supervisor._send_task_analysis_request = self.request
+        patcher = mock.patch.object(
+            capability_registry, "analyze_capabilities_with_llm", mock.AsyncMock(return_value={"research": 0.9})
+        )
+        self.scores = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_similar_task_is_served_from_cache(self):
+        """Test that a similar task reuses a copy of the cached analysis."""
+        first = asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+        first["required_capabilities"].append("planning")
+
+        second = asyncio.run(self.supervisor.analyze_task("Research solar power"))
+        self.assertEqual(self.request.await_count, 1)
+        self.assertEqual(second["task"], "Research solar power")
+        self.assertEqual(second["required_capabilities"], ["research"])
+
+    def test_capability_changes_invalidate_cache(self):
+        """Test that the semantic cache is cleared once the registered capabilities change."""
+        asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+
+        self.scores.return_value = {"planning": 0.9}
+        with mock.patch.object(capability_registry, "_caps_version", capability_registry._caps_version + 1):
+            analysis = asyncio.run(self.supervisor.analyze_task("Research solar panels"))
+
+        self.assertEqual(self.request.await_count, 2)
+        self.assertEqual(analysis["required_capabilities"], ["planning"])
+        self.assertEqual(len(self.supervisor._analysis_cache), 1)
+
+
+class TestAnalysisBatching(unittest.TestCase):
+    """Test cases for micro-batching of task analysis requests."""
+
+    def setUp(self):
+        """Create a supervisor that batches analyses, with mocked LLM requests."""
+        self.supervisor = SupervisorManager(
+            InMemoryAgentRegistry(), CommunicationHub(),
+            {"analysis_batch_window_ms": 20, "analysis_batch_max": 3}
+        )
+        self.single = mock.AsyncMock(side_effect=self._slow_analysis)
+        self.batched = mock.AsyncMock(side_effect=lambda tasks: [{"task_summary": f"batched {task}"} for task in tasks])
+        self.supervisor._send_task_analysis_request = self.single
+        self.supervisor._request_task_analyses = self.batched
+
+    @staticmethod
+    async def _slow_analysis(task, *args):
+        """Return a single-request analysis after a short delay."""
+        await asyncio.sleep(0.05)
+        return {"task_summary": f"single {task}"}
+
+    def _analyze(self, tasks, while_queued=None):
+        """
+        Analyze a first task and, while it is in flight, the given tasks.
+
+        Args:
+            tasks: Tasks to analyze while the first one is in flight
+            while_queued: Optional callback run with the queued callers once they are waiting
+
+        Returns:
+            The results of the queued callers, exceptions included
+        """
+        async def run():
+            first = asyncio.ensure_future(self.supervisor._request_task_analysis("first", [], "gpt-4o", 0.1))
+            await asyncio.sleep(0)
+            callers = [
+                asyncio.ensure_future(self.supervisor._request_task_analysis(task, [], "gpt-4o", 0.1))
+                for task in tasks
+            ]
+            await asyncio.sleep(0)
+            if while_queued is not None:
+                while_queued(callers)
+            results = await asyncio.gather(*callers, return_exceptions=True)
+            await first
+            return results
+
+        return asyncio.run(run())
+
+    def test_flush_at_batch_max(self):
+        """Test that a full batch is sent at once, without waiting for the window."""
+        self.supervisor._batch_window = 10.0
+        results = self._analyze(["a", "b", "c"])
+
+        self.batched.assert_awaited_once_with(["a", "b", "c"])
+        self.assertEqual([result["task_summary"] for result in results], ["batched a", "batched b", "batched c"])
+        self.assertIsNone(self.supervisor._batch_timer)
+
+    def test_flush_after_window(self):
+        """Test that a partial batch is sent when the window ends."""
+        results = self._analyze(["a", "b"])
+
+        self.batched.assert_awaited_once_with(["a", "b"])
+        self.assertEqual([result["task_summary"] for result in results], ["batched a", "batched b"])
+        self.assertEqual(self.single.await_count, 1)
+
+    def test_mismatched_batch_falls_back_to_single_requests(self):
+        """Test that tasks are analyzed one by one when the batched response doesn't match."""
+        self.batched.side_effect = None
+        self.batched.return_value = None
+        results = self._analyze(["a", "b"])
+
+        self.assertEqual([result["task_summary"] for result in results], ["single a", "single b"])
+        self.assertEqual(self.single.await_count, 3)
+
+    def test_cancelled_caller(self):
+        """Test that cancelling one queued caller doesn't affect the rest of its batch."""
+        results = self._analyze(["a", "b"], while_queued=lambda callers: callers[0].cancel())
+
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+        self.assertEqual(results[1]["task_summary"], "batched b")
+
+    def test_failed_batch_run_resolves_callers(self):
+        """Test that callers get the error instead of waiting forever when a batch run fails."""
+        self.batched.side_effect = RuntimeError("Batch failed")
+        results = self._analyze(["a", "b"])
+
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+        self.assertEqual(self.supervisor._analyses_in_flight, 0)
+
+    def test_cancelled_batch_run_cancels_callers(self):
+        """Test that callers are cancelled instead of waiting forever when a batch run is cancelled."""
+        self.supervisor._batch_window = 10.0
+
+        def cancel_runs(callers):
+            for run in self.supervisor._batch_runs:
+                run.cancel()
+
+        results = self._analyze(["a", "b", "c"], while_queued=cancel_runs)
+
+        for result in results:
+            self.assertIsInstance(result, asyncio.CancelledError)
+        self.assertEqual(self.supervisor._analyses_in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
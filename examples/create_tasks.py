@@ -5,17 +5,25 @@ This demonstrates how to create tasks that will be matched with appropriate agen
 """
 
 import requests
-import time
 from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 AMS_URL = "http://localhost:8000"
 
+# Shared session, so requests reuse connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
 def create_task(task_description: str) -> Optional[Dict[str, Any]]:
     """Create a task with the given description."""
-    response = requests.post(
+    response = SESSION.post(
         f"{AMS_URL}/tasks", 
-        headers={"Content-Type": "application/json"},
         json={"task": task_description}
     )
     
@@ -31,7 +39,7 @@ def create_task(task_description: str) -> Optional[Dict[str, Any]]:
 
 def execute_task(session_id: str) -> Optional[Dict[str, Any]]:
     """Execute a previously created task."""
-    response = requests.post(f"{AMS_URL}/tasks/{session_id}/execute")
+    response = SESSION.post(f"{AMS_URL}/tasks/{session_id}/execute")
     
     if response.status_code == 200:
         data = response.json()
@@ -44,9 +52,8 @@ def execute_task(session_id: str) -> Optional[Dict[str, Any]]:
 
 def create_and_execute_task(task_description: str) -> Optional[Dict[str, Any]]:
     """Create and execute a task in one call."""
-    response = requests.post(
+    response = SESSION.post(
         f"{AMS_URL}/tasks/run", 
-        headers={"Content-Type": "application/json"},
         json={"task": task_description}
     )
     
@@ -62,7 +69,7 @@ def create_and_execute_task(task_description: str) -> Optional[Dict[str, Any]]:
 
 def get_task_messages(session_id: str) -> Optional[List[Dict[str, Any]]]:
     """Get all messages for a task session."""
-    response = requests.get(f"{AMS_URL}/tasks/{session_id}/messages")
+    response = SESSION.get(f"{AMS_URL}/tasks/{session_id}/messages")
     
     if response.status_code == 200:
         messages = response.json()
@@ -91,15 +98,9 @@ def main() -> None:
     
     if task_data:
         session_id = task_data['session_id']
-        print("\nWaiting a moment before executing the task...")
-        time.sleep(1)
-        
         execution_data = execute_task(session_id)
         
         if execution_data:
-            print("\nWaiting a moment before retrieving messages...")
-            time.sleep(1)
-            
             messages = get_task_messages(session_id)
             if messages:
                 display_message_content(messages)
@@ -113,9 +114,6 @@ def main() -> None:
     
     if combined_data:
         session_id = combined_data['creation']['session_id']
-        print("\nWaiting a moment before retrieving messages...")
-        time.sleep(1)
-        
         messages = get_task_messages(session_id)
         if messages:
             display_message_content(messages)
@@ -129,9 +127,6 @@ def main() -> None:
     
     if combined_data:
         session_id = combined_data['creation']['session_id']
-        print("\nWaiting a moment before retrieving messages...")
-        time.sleep(1)
-        
         messages = get_task_messages(session_id)
         if messages:
             display_message_content(messages)
@@ -21,16 +21,28 @@ import logging
 from typing import Dict, List, Any, Optional, TypedDict, cast
 from pathlib import Path
 import socket
+from concurrent.futures import ThreadPoolExecutor
 
 # Type hints for requests library to fix linter errors
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     # requests library is available
+    
+    # Shared session, so requests reuse connections
+    SESSION = requests.Session()
+    SESSION.mount("http://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    ))
 except ImportError:
     # Only for type checking - stub class if requests is not available
     class Response:
         status_code: int
         text: str
+        content: bytes
         def json(self) -> Any: ...
     
     class requests:
@@ -42,6 +54,19 @@ except ImportError:
         
         @staticmethod
         def post(url: str, **kwargs: Any) -> 'Response': ...
+    
+    SESSION = requests
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+def _response_json(response: Any) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 # Configure logging
 logging.basicConfig(
@@ -54,6 +79,16 @@ logger = logging.getLogger("creative_writing")
 AMS_URL = None
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 DEFAULT_PORTS = [8000, 5000, 3000]  # Common ports to try
+MIN_POLL_DELAY = 0.25  # Seconds between message polls right after activity
+MAX_POLL_DELAY = 5.0  # Upper bound on the idle polling interval
+
+# Descriptive role of each creative writing agent, by agent name
+AGENT_ROLES = {
+    "CrewAIBrainstormer": "CONCEPT GENERATOR",
+    "AutoGenOutliner": "STORY ARCHITECT",
+    "CrewAIWriter": "NARRATIVE AUTHOR",
+    "AutoGenEditor": "CONTENT REFINER"
+}
 
 # Type definitions for better type checking
 class AgentContribution(TypedDict):
@@ -68,6 +103,14 @@ class AgentResponse(TypedDict):
     description: str
     framework: str
 
+def _port_is_open(port: int) -> bool:
+    """Check whether something accepts TCP connections on a local port."""
+    try:
+        with socket.create_connection(("localhost", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
 def detect_ams_server() -> str:
     """
     Detect the AMS server by trying common ports.
@@ -81,8 +124,15 @@ def detect_ams_server() -> str:
         logger.info(f"Using AMS_URL from environment: {url}")
         return url
     
-    # Try common ports
-    for port in DEFAULT_PORTS:
+    # Probe all common ports at once with a plain TCP connect, which fails fast on closed ports
+    with ThreadPoolExecutor(max_workers=len(DEFAULT_PORTS)) as executor:
+        open_ports = [
+            port for port, is_open in zip(DEFAULT_PORTS, executor.map(_port_is_open, DEFAULT_PORTS))
+            if is_open
+        ]
+    
+    # Confirm over HTTP, keeping the preference order of DEFAULT_PORTS
+    for port in open_ports:
         url = f"http://localhost:{port}"
         try:
             # Check the root endpoint instead of /health
@@ -115,7 +165,7 @@ def setup_environment() -> bool:
     # Verify AMS is running
     try:
         # Check the root endpoint instead of /health
-        response = requests.get(f"{AMS_URL}/")
+        response = SESSION.get(f"{AMS_URL}/")
         if response.status_code not in [200, 404]:  # Either 200 OK or 404 Not Found means server is running
             logger.error(f"AMS server not reachable at {AMS_URL}")
             logger.info("Please start the AMS server with: python -m ams")
@@ -129,6 +179,97 @@ def setup_environment() -> bool:
         
     return True
 
+# Registration payloads of the creative writing agents, in execution order
+CREATIVE_WRITING_AGENTS: List[Dict[str, Any]] = [
+    {
+        "name": "CrewAIBrainstormer",
+        "description": "Expert in generating creative concepts and ideas",
+        "system_prompt": "You are a creative brainstormer who specializes in generating unique and interesting ideas for stories. Your role is to provide compelling concepts, settings, characters, and plot hooks.",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can generate creative concepts and ideas"
+            }
+        ],
+        "framework": "crewai",
+        "config": {
+            "execution_priority": 1,  # Execute first
+            "llm_config": {
+                "model": "gpt-4-turbo",
+                "temperature": 0.9
+            },
+            "role": "Creative Brainstormer",
+            "goal": "Generate unique and compelling story concepts",
+            "backstory": "An imaginative ideation specialist who can envision novel scenarios and concepts"
+        }
+    },
+    {
+        "name": "AutoGenOutliner",
+        "description": "Expert in structuring and organizing narratives",
+        "system_prompt": "You are a story outliner who excels at creating well-structured narrative outlines. Your role is to take creative concepts and organize them into a coherent story structure with a clear beginning, middle, and end.",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can create structured narrative outlines"
+            }
+        ],
+        "framework": "autogen",
+        "config": {
+            "execution_priority": 2,  # Execute second
+            "depends_on": ["CrewAIBrainstormer"],  # Depends on brainstormer's ideas
+            "llm_config": {
+                "model": "gpt-4-turbo",
+                "temperature": 0.7,
+                "max_tokens": 2000
+            }
+        }
+    },
+    {
+        "name": "CrewAIWriter",
+        "description": "Expert in creative prose and dialogue writing",
+        "system_prompt": "You are a skilled creative writer who specializes in vivid prose and engaging dialogue. Your role is to transform outlines into captivating narrative text with rich descriptions and authentic character voices.",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can write creative prose and dialogue"
+            }
+        ],
+        "framework": "crewai",
+        "config": {
+            "execution_priority": 3,  # Execute third
+            "depends_on": ["AutoGenOutliner"],  # Depends on the outliner's structure
+            "llm_config": {
+                "model": "gpt-4-turbo",
+                "temperature": 0.8
+            },
+            "role": "Creative Writer",
+            "goal": "Transform outlines into engaging narrative text",
+            "backstory": "A talented wordsmith with a gift for creating immersive story worlds through prose"
+        }
+    },
+    {
+        "name": "AutoGenEditor",
+        "description": "Expert in refining and polishing written content",
+        "system_prompt": "You are a skilled editor who specializes in refining and improving written content. Your role is to polish the narrative prose, correct inconsistencies, enhance the flow, and ensure the story is engaging from start to finish.",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can edit and refine written content"
+            }
+        ],
+        "framework": "autogen",
+        "config": {
+            "execution_priority": 4,  # Execute last
+            "depends_on": ["CrewAIWriter"],  # Depends on the writer's draft
+            "llm_config": {
+                "model": "gpt-4-turbo",
+                "temperature": 0.4,
+                "max_tokens": 3000
+            }
+        }
+    }
+]
+
 def register_creative_writing_agents() -> List[AgentResponse]:
     """
     Register agents specialized in different aspects of the creative writing process.
@@ -138,112 +279,32 @@ def register_creative_writing_agents() -> List[AgentResponse]:
     """
     logger.info("Registering creative writing agents...")
     
-    agents_data: List[Dict[str, Any]] = [
-        {
-            "name": "CrewAIBrainstormer",
-            "description": "Expert in generating creative concepts and ideas",
-            "system_prompt": "You are a creative brainstormer who specializes in generating unique and interesting ideas for stories. Your role is to provide compelling concepts, settings, characters, and plot hooks.",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can generate creative concepts and ideas"
-                }
-            ],
-            "framework": "crewai",
-            "config": {
-                "execution_priority": 1,  # Execute first
-                "llm_config": {
-                    "model": "gpt-4-turbo",
-                    "temperature": 0.9
-                },
-                "role": "Creative Brainstormer",
-                "goal": "Generate unique and compelling story concepts",
-                "backstory": "An imaginative ideation specialist who can envision novel scenarios and concepts"
-            }
-        },
-        {
-            "name": "AutoGenOutliner",
-            "description": "Expert in structuring and organizing narratives",
-            "system_prompt": "You are a story outliner who excels at creating well-structured narrative outlines. Your role is to take creative concepts and organize them into a coherent story structure with a clear beginning, middle, and end.",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can create structured narrative outlines"
-                }
-            ],
-            "framework": "autogen",
-            "config": {
-                "execution_priority": 2,  # Execute second
-                "depends_on": ["CrewAIBrainstormer"],  # Depends on brainstormer's ideas
-                "llm_config": {
-                    "model": "gpt-4-turbo",
-                    "temperature": 0.7,
-                    "max_tokens": 2000
-                }
-            }
-        },
-        {
-            "name": "CrewAIWriter",
-            "description": "Expert in creative prose and dialogue writing",
-            "system_prompt": "You are a skilled creative writer who specializes in vivid prose and engaging dialogue. Your role is to transform outlines into captivating narrative text with rich descriptions and authentic character voices.",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can write creative prose and dialogue"
-                }
-            ],
-            "framework": "crewai",
-            "config": {
-                "execution_priority": 3,  # Execute third
-                "depends_on": ["AutoGenOutliner"],  # Depends on the outliner's structure
-                "llm_config": {
-                    "model": "gpt-4-turbo",
-                    "temperature": 0.8
-                },
-                "role": "Creative Writer",
-                "goal": "Transform outlines into engaging narrative text",
-                "backstory": "A talented wordsmith with a gift for creating immersive story worlds through prose"
-            }
-        },
-        {
-            "name": "AutoGenEditor",
-            "description": "Expert in refining and polishing written content",
-            "system_prompt": "You are a skilled editor who specializes in refining and improving written content. Your role is to polish the narrative prose, correct inconsistencies, enhance the flow, and ensure the story is engaging from start to finish.",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can edit and refine written content"
-                }
-            ],
-            "framework": "autogen",
-            "config": {
-                "execution_priority": 4,  # Execute last
-                "depends_on": ["CrewAIWriter"],  # Depends on the writer's draft
-                "llm_config": {
-                    "model": "gpt-4-turbo",
-                    "temperature": 0.4,
-                    "max_tokens": 3000
-                }
-            }
-        }
-    ]
-    
-    registered_agents: List[AgentResponse] = []
+    # Register concurrently; map keeps the input order
+    with ThreadPoolExecutor(max_workers=len(CREATIVE_WRITING_AGENTS)) as executor:
+        results = list(executor.map(_register_agent, CREATIVE_WRITING_AGENTS))
     
-    for agent_data in agents_data:
-        try:
-            response = requests.post(f"{AMS_URL}/agents", json=agent_data)
-            
-            if response.status_code == 200:
-                result = cast(AgentResponse, response.json())
-                logger.info(f"Successfully registered: {agent_data['name']} ({agent_data['framework']})")
-                registered_agents.append(result)
-            else:
-                logger.error(f"Failed to register {agent_data['name']}: {response.text}")
-        except requests.RequestException as e:
-            logger.error(f"Exception during agent registration: {str(e)}")
+    return [result for result in results if result is not None]
+
+def _register_agent(agent_data: Dict[str, Any]) -> Optional[AgentResponse]:
+    """
+    Register a single agent with the AMS server.
     
-    return registered_agents
+    Args:
+        agent_data: The agent registration payload
+        
+    Returns:
+        Optional[AgentResponse]: The registered agent data, or None if registration failed
+    """
+    try:
+        response = SESSION.post(f"{AMS_URL}/agents", json=agent_data)
+        
+        if response.status_code == 200:
+            logger.info(f"Successfully registered: {agent_data['name']} ({agent_data['framework']})")
+            return cast(AgentResponse, _response_json(response))
+        logger.error(f"Failed to register {agent_data['name']}: {response.text}")
+    except requests.RequestException as e:
+        logger.error(f"Exception during agent registration: {str(e)}")
+    return None
 
 def create_writing_task(task_description: str) -> Dict[str, Any]:
     """
@@ -258,14 +319,13 @@ def create_writing_task(task_description: str) -> Dict[str, Any]:
     logger.info("Creating creative writing task...")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{AMS_URL}/tasks", 
-            headers={"Content-Type": "application/json"},
             json={"task": task_description}
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = _response_json(response)
             logger.info(f"Task created with session ID: {result['session_id']}")
             return cast(Dict[str, Any], result)
         else:
@@ -275,12 +335,18 @@ def create_writing_task(task_description: str) -> Dict[str, Any]:
         logger.error(f"Exception during task creation: {str(e)}")
         return {}
 
-def execute_creative_collaboration(session_id: str) -> Dict[str, AgentContribution]:
+def execute_creative_collaboration(
+    session_id: str,
+    registered_agents: List[AgentResponse],
+    draft_path: Optional[Path] = None
+) -> Dict[str, AgentContribution]:
     """
     Execute the creative writing collaboration session.
     
     Args:
         session_id: The session ID for the collaboration
+        registered_agents: The agents returned by register_creative_writing_agents
+        draft_path: Optional file each contribution is appended to as it arrives
         
     Returns:
         Dict[str, AgentContribution]: Dictionary of agent contributions
@@ -291,46 +357,57 @@ def execute_creative_collaboration(session_id: str) -> Dict[str, AgentContributi
     print("1. CrewAIBrainstormer → 2. AutoGenOutliner → 3. CrewAIWriter → 4. AutoGenEditor")
     print("Each agent contributes a different aspect to the creative writing process.")
     
-    # Start the collaboration
+    # The execute request only returns once every agent has run, so send it from a
+    # worker thread and poll for messages while it is in flight
+    executor = ThreadPoolExecutor(max_workers=1)
+    # Line buffered, so the draft can be followed with tail -f while agents work
+    draft_file = open(draft_path, "a", encoding="utf-8", buffering=1) if draft_path else None
     try:
-        response = requests.post(f"{AMS_URL}/tasks/{session_id}/execute")
-        
-        if response.status_code != 200:
-            logger.error(f"Failed to start session: {response.text}")
-            return {}
+        execute_future = executor.submit(SESSION.post, f"{AMS_URL}/tasks/{session_id}/execute")
         
         logger.info("Collaboration session started successfully")
         print("✅ Session started successfully! Monitoring progress...")
         
         # Monitor the collaboration by checking messages
         last_message_count = 0
-        wait_time = 0
+        wait_time = 0.0
+        # Poll quickly while messages are arriving and back off while idle
+        poll_delay = MIN_POLL_DELAY
         max_wait_time = 600  # Maximum wait time in seconds (10 minutes)
         
         # Store the agent contributions for final display
         agent_contributions: Dict[str, AgentContribution] = {}
+        # Number of expected agents that have contributed at least once
+        contributed_count = 0
         
-        # Get initial list of registered agents to map IDs to names
-        agents_response = requests.get(f"{AMS_URL}/agents")
-        agent_name_map: Dict[str, str] = {}
-        if agents_response.status_code == 200:
-            agents_data = agents_response.json()
-            agent_name_map = {agent["id"]: agent["name"] for agent in agents_data}
+        # Map agent IDs to names from the registration results we already have
+        agent_name_map: Dict[str, str] = {agent["id"]: agent["name"] for agent in registered_agents}
         
         print("\n--- Collaboration Progress ---")
         
         while wait_time < max_wait_time:
-            # Get messages
-            messages_response = requests.get(f"{AMS_URL}/tasks/{session_id}/messages")
+            # Checked before polling, so the poll below sees every message of a finished run
+            execution_done = execute_future.done()
+            if execution_done:
+                response = execute_future.result()
+                if response.status_code != 200:
+                    logger.error(f"Failed to execute session: {response.text}")
+                    print(f"\nFailed to execute session: {response.text}")
+                    return {}
+            
+            # Get only the messages we haven't seen yet
+            messages_response = SESSION.get(
+                f"{AMS_URL}/tasks/{session_id}/messages",
+                params={"since": last_message_count}
+            )
             
             if messages_response.status_code == 200:
-                messages: List[Dict[str, Any]] = messages_response.json()
+                new_messages: List[Dict[str, Any]] = _response_json(messages_response)
                 
                 # If we have new messages, update and print
-                if len(messages) > last_message_count:
+                if new_messages:
                     # Process any new messages
-                    for i in range(last_message_count, len(messages)):
-                        msg = messages[i]
+                    for msg in new_messages:
                         sender_id = msg.get("sender_id", "")
                         sender_name = msg.get("sender_name", "Unknown")
                         content = msg.get("content", "")
@@ -345,38 +422,48 @@ def execute_creative_collaboration(session_id: str) -> Dict[str, AgentContributi
                             framework = msg["metadata"]["framework"]
                         
                         # Store the contribution
+                        if sender_name in AGENT_ROLES and sender_name not in agent_contributions:
+                            contributed_count += 1
                         agent_contributions[sender_name] = {
                             "content": content,
                             "framework": framework,
                             "timestamp": msg.get("timestamp", ""),
                             "role": get_agent_role(sender_name)
                         }
+                        if draft_file is not None:
+                            draft_file.write(f"\n=== {sender_name} ===\n{content}\n")
                         
                         # Print a notification about the new contribution
                         preview = content[:150] + "..." if len(content) > 150 else content
-                        print(f"\n➤ {sender_name} ({framework.upper()}) has contributed:")
-                        print(f"  \"{preview}\"")
-                        logger.info(f"New contribution from {sender_name} ({framework})")
+                        print(f"\n➤ {sender_name} ({framework.upper()}) has contributed:\n  \"{preview}\"")
+                        # The print above already tells the user, so only log at debug level
+                        logger.debug("New contribution from %s (%s)", sender_name, framework)
                     
-                    last_message_count = len(messages)
-                    wait_time = 0  # Reset wait time when there's activity
+                    last_message_count += len(new_messages)
+                    wait_time = 0.0  # Reset wait time when there's activity
+                    poll_delay = MIN_POLL_DELAY
                     
                     # Check if all agents have contributed
-                    expected_agents = ["CrewAIBrainstormer", "AutoGenOutliner", "CrewAIWriter", "AutoGenEditor"]
-                    if all(agent in agent_contributions for agent in expected_agents):
+                    if contributed_count == len(AGENT_ROLES):
                         logger.info("All agents have contributed to the collaboration")
                         print("\n✅ All agents have contributed to the story!")
                         break
+                elif execution_done:
+                    # The run finished and every message it produced has been shown
+                    logger.info("Collaboration execution finished")
+                    break
                 else:
                     print(".", end="", flush=True)
-                    time.sleep(5)
-                    wait_time += 5
+                    time.sleep(poll_delay)
+                    wait_time += poll_delay
+                    poll_delay = min(poll_delay * 1.5, MAX_POLL_DELAY)
                     
             else:
                 logger.error(f"Failed to get messages: {messages_response.text}")
                 print(f"\nFailed to get messages: {messages_response.text}")
-                time.sleep(5)
-                wait_time += 5
+                time.sleep(poll_delay)
+                wait_time += poll_delay
+                poll_delay = min(poll_delay * 1.5, MAX_POLL_DELAY)
                 
         if wait_time >= max_wait_time:
             logger.warning("Monitoring timed out, collaboration may still be in progress")
@@ -387,6 +474,11 @@ def execute_creative_collaboration(session_id: str) -> Dict[str, AgentContributi
     except requests.RequestException as e:
         logger.error(f"Exception during collaboration execution: {str(e)}")
         return {}
+    finally:
+        # Don't block on an execute request that is still running after a timeout
+        executor.shutdown(wait=False)
+        if draft_file is not None:
+            draft_file.close()
 
 def get_agent_role(agent_name: str) -> str:
     """
@@ -398,13 +490,7 @@ def get_agent_role(agent_name: str) -> str:
     Returns:
         str: The descriptive role for the agent
     """
-    roles = {
-        "CrewAIBrainstormer": "CONCEPT GENERATOR",
-        "AutoGenOutliner": "STORY ARCHITECT",
-        "CrewAIWriter": "NARRATIVE AUTHOR", 
-        "AutoGenEditor": "CONTENT REFINER"
-    }
-    return roles.get(agent_name, "CONTRIBUTOR")
+    return AGENT_ROLES.get(agent_name, "CONTRIBUTOR")
 
 def print_final_story(agent_contributions: Dict[str, AgentContribution]) -> None:
     """
@@ -494,10 +580,10 @@ def get_session_messages(session_id: str) -> List[Dict[str, Any]]:
     """
     try:
         logger.info(f"Retrieving messages for session {session_id}")
-        response = requests.get(f"{AMS_URL}/tasks/{session_id}/messages")
+        response = SESSION.get(f"{AMS_URL}/tasks/{session_id}/messages")
         
         if response.status_code == 200:
-            return cast(List[Dict[str, Any]], response.json())
+            return cast(List[Dict[str, Any]], _response_json(response))
         else:
             logger.error(f"Failed to get session messages: {response.text}")
             return []
@@ -548,8 +634,14 @@ def main() -> None:
     
     session_id = task_result["session_id"]
     
+    # Write contributions to a draft file as they arrive
+    output_dir = Path("output")
+    output_dir.mkdir(exist_ok=True)
+    draft_path = output_dir / f"story_draft_{time.strftime('%Y%m%d-%H%M%S')}.txt"
+    print(f"\nContributions will be written to {draft_path} as they arrive")
+    
     # Execute the creative writing collaboration
-    agent_contributions = execute_creative_collaboration(session_id)
+    agent_contributions = execute_creative_collaboration(session_id, registered_agents, draft_path)
     
     if not agent_contributions:
         logger.error("No agent contributions collected, exiting")
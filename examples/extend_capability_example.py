@@ -18,7 +18,7 @@ import sys
 import json
 import logging
 import asyncio
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Set, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +35,46 @@ from ams.core.registry.capability_registry import capability_registry
 from ams.core.registry.models import AgentMetadata, AgentCapability, AgentFramework
 from ams.core.adapters import get_adapter
 
+# Capability scores by (task, model, temperature, registered capabilities), so the
+# demos below never send the same analysis to the LLM twice
+_score_cache: Dict[Tuple[Any, ...], Dict[str, float]] = {}
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _cache_key(task: str) -> Tuple[Any, ...]:
+    """Build the score cache key of a task under the current registry settings."""
+    return (
+        task,
+        capability_registry.llm_config.get("model"),
+        capability_registry.llm_config.get("temperature"),
+        tuple(sorted(capability_registry.capabilities))
+    )
+
+async def cached_analyze_many(tasks: List[str]) -> List[Dict[str, float]]:
+    """Get the capability scores for several tasks, analyzing the uncached ones in one request."""
+    keys = [_cache_key(task) for task in tasks]
+    # dict keeps one entry per distinct uncached task, in order
+    missing = {key: task for key, task in zip(keys, tasks) if key not in _score_cache}
+    _cache_stats["hits"] += len(tasks) - len(missing)
+    _cache_stats["misses"] += len(missing)
+    
+    if missing:
+        scores_per_task = await capability_registry.analyze_capabilities_with_llm_many(list(missing.values()))
+        for key, scores in zip(missing, scores_per_task):
+            # Failed analyses come back empty and are worth retrying
+            if scores:
+                _score_cache[key] = dict(scores)
+    
+    return [dict(_score_cache.get(key, {})) for key in keys]
+
+async def cached_analyze(task: str) -> Dict[str, float]:
+    """Get the capability scores for a task, reusing an earlier identical analysis."""
+    return (await cached_analyze_many([task]))[0]
+
+async def cached_required_capabilities(task: str, threshold: float = 0.5) -> Set[str]:
+    """Get the capabilities required for a task from its cached scores."""
+    scores = await cached_analyze(task)
+    return {name for name, score in scores.items() if score >= threshold}
+
 # Step 1: Register the sentiment analysis capability with the registry
 def register_sentiment_capability():
     """Register the sentiment analysis capability with the system."""
@@ -81,10 +121,10 @@ async def test_capability_with_tasks():
     print("Task | Capability Scores")
     print("-" * 60)
     
-    for task in test_tasks:
-        # Get capability scores for the task using LLM
-        scores = await capability_registry.analyze_capabilities_with_llm(task)
-        
+    # Analyze all tasks with one LLM request, then print the results in task order
+    results = await cached_analyze_many(test_tasks)
+    
+    for task, scores in zip(test_tasks, results):
         # Format the scores for display
         scores_str = ", ".join([f"{name}: {score:.2f}" for name, score in scores.items()])
         
@@ -95,7 +135,7 @@ async def test_capability_with_tasks():
     
     # Test the get_required_capabilities method
     sample_task = "Analyze the emotional tone and sentiment of these customer reviews"
-    required_caps = await capability_registry.get_required_capabilities(sample_task)
+    required_caps = await cached_required_capabilities(sample_task)
     print(f"\nRequired capabilities for '{sample_task}':")
     print(required_caps)
 
@@ -180,6 +220,9 @@ async def demonstrate_agent_matching():
     # List of all agents
     all_agents = [sentiment_agent, general_agent, coding_agent]
     
+    # Capability names of each agent, listed once for all tasks
+    agent_capabilities = {agent.id: [cap.name for cap in agent.capabilities or ()] for agent in all_agents}
+    
     # Test tasks
     test_tasks = [
         "Analyze the sentiment of customer reviews from our last product launch",
@@ -187,24 +230,27 @@ async def demonstrate_agent_matching():
         "Write a summary of the quarterly report"
     ]
     
+    # Analyze all tasks with one LLM request before printing the selections in task order
+    required_per_task = [
+        {name for name, score in scores.items() if score >= 0.5}
+        for scores in await cached_analyze_many(test_tasks)
+    ]
+    
     print("\n=== Agent Selection Based on Capabilities ===")
-    for task in test_tasks:
+    for task, required_capabilities in zip(test_tasks, required_per_task):
         print(f"\nTask: {task}")
         
-        # Get matched agents for this task
+        # Match agents against the required capabilities computed above
         matched_agents = await capability_registry.filter_agents_by_capabilities(
             agents=all_agents,
-            task=task
+            task=task,
+            required_capabilities=required_capabilities
         )
-        
-        # Get the required capabilities for reference
-        required_capabilities = await capability_registry.get_required_capabilities(task)
         print(f"Required capabilities: {required_capabilities}")
         
         print("Selected agents:")
         for agent in matched_agents:
-            agent_capabilities = [cap.name for cap in agent.capabilities] if agent.capabilities else []
-            print(f"- {agent.name} (capabilities: {agent_capabilities})")
+            print(f"- {agent.name} (capabilities: {agent_capabilities[agent.id]})")
 
 # Main function
 async def main():
@@ -226,6 +272,8 @@ async def main():
     # Demonstrate agent matching with the new capability
     await demonstrate_agent_matching()
     
+    print(f"\nCapability analyses: {_cache_stats['misses']} LLM calls, {_cache_stats['hits']} cache hits")
+    
     print("\n=== Capability Extension Demo Complete ===")
 
 if __name__ == "__main__":
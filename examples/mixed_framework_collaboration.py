@@ -10,21 +10,54 @@ If you encounter errors with CrewAI agents, try the following:
 3. Check the CrewAI adapter implementation in the AMS codebase
 """
 
+import json
 import os
 import time
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Set
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 # Configuration
 AMS_URL = "http://localhost:8000"
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "your_api_key")
+MIN_POLL_DELAY = 0.25  # Seconds between message polls right after activity
+MAX_POLL_DELAY = 5.0  # Upper bound on the idle polling interval
+SPINNER = "|/-\\"  # Frames of the waiting indicator
+
+# Shared session, so requests reuse connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
+# orjson.JSONDecodeError subclasses ValueError, like json.JSONDecodeError
+_loads = orjson.loads if orjson is not None else json.loads
+
+def _response_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
 
 if not OPENAI_API_KEY:
     print("Error: OPENAI_API_KEY environment variable is not set")
     print("Please set it with: export OPENAI_API_KEY=your_api_key")
     exit(1)
 
+def _preview(text: str, limit: int) -> str:
+    """Truncate text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
 def register_mixed_framework_agents() -> List[Dict[str, Any]]:
     """
     Register agents from different frameworks (AutoGen and CrewAI).
@@ -125,19 +158,29 @@ def register_mixed_framework_agents() -> List[Dict[str, Any]]:
         }
     ]
     
-    registered_agents = []
+    # Register concurrently; map keeps the input order
+    with ThreadPoolExecutor(max_workers=len(agents_data)) as executor:
+        results = list(executor.map(_register_agent, agents_data))
+    
+    return [result for result in results if result is not None]
+
+def _register_agent(agent_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Register a single agent with the AMS.
     
-    for agent_data in agents_data:
-        response = requests.post(f"{AMS_URL}/agents", json=agent_data)
+    Args:
+        agent_data: The agent registration payload
         
-        if response.status_code == 200:
-            result = response.json()
-            print(f"Successfully registered: {agent_data['name']} ({agent_data['framework']})")
-            registered_agents.append(result)
-        else:
-            print(f"Failed to register {agent_data['name']}: {response.text}")
+    Returns:
+        Optional[Dict[str, Any]]: The registered agent data, or None if registration failed
+    """
+    response = SESSION.post(f"{AMS_URL}/agents", json=agent_data)
     
-    return registered_agents
+    if response.status_code == 200:
+        print(f"Successfully registered: {agent_data['name']} ({agent_data['framework']})")
+        return _response_json(response)
+    print(f"Failed to register {agent_data['name']}: {response.text}")
+    return None
 
 def create_mixed_collaboration_task(task_description: str) -> Dict[str, Any]:
     """
@@ -149,26 +192,26 @@ def create_mixed_collaboration_task(task_description: str) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Task data with session ID
     """
-    response = requests.post(
+    response = SESSION.post(
         f"{AMS_URL}/tasks", 
-        headers={"Content-Type": "application/json"},
         json={"task": task_description}
     )
     
     if response.status_code == 200:
-        result = response.json()
+        result = _response_json(response)
         print(f"Task created with session ID: {result['session_id']}")
         return result
     else:
         print(f"Failed to create task: {response.text}")
         return {}
 
-def execute_collaboration(session_id: str) -> None:
+def execute_collaboration(session_id: str, agents: Optional[List[Dict[str, Any]]] = None) -> None:
     """
     Execute the collaboration session.
     
     Args:
         session_id: The session ID for the collaboration
+        agents: Registered agents, if the caller already fetched them (fetched otherwise)
     """
     print("\n=== Starting Mixed Framework Collaboration Session ===")
     print("This example demonstrates how AutoGen and CrewAI agents work together in sequence:")
@@ -177,7 +220,7 @@ def execute_collaboration(session_id: str) -> None:
     print("\nExecuting collaboration session...")
     
     # Start the collaboration
-    response = requests.post(f"{AMS_URL}/tasks/{session_id}/execute")
+    response = SESSION.post(f"{AMS_URL}/tasks/{session_id}/execute")
     
     if response.status_code != 200:
         print(f"Failed to start session: {response.text}")
@@ -189,36 +232,44 @@ def execute_collaboration(session_id: str) -> None:
     
     # Monitor the collaboration by checking messages
     last_message_count = 0
-    wait_time = 0
+    wait_time = 0.0
+    # Poll quickly while messages are arriving and back off while idle
+    poll_delay = MIN_POLL_DELAY
+    idle_polls = 0
     max_wait_time = 300  # Maximum wait time in seconds (5 minutes)
     
     # Store the agent contributions for final display
     agent_contributions = {}
     
-    # Get initial list of registered agents to map IDs to names
-    agents_response = requests.get(f"{AMS_URL}/agents")
-    agent_name_map = {}
-    if agents_response.status_code == 200:
-        agents_data = agents_response.json()
-        agent_name_map = {agent["id"]: agent["name"] for agent in agents_data}
+    # Map agent IDs to names, fetching the agents only if the caller didn't pass them
+    if agents is None:
+        agents = get_registered_agents()
+    agent_name_map = {agent["id"]: agent["name"] for agent in agents}
+    
+    # Senders seen so far, updated only with new messages
+    expected_ids = set(agent_name_map)
+    contributor_ids: Set[str] = set()
     
     print("\n--- Collaboration Progress ---")
     
     while wait_time < max_wait_time:
-        # Get messages
-        messages_response = requests.get(f"{AMS_URL}/tasks/{session_id}/messages")
+        # Get only the messages we haven't seen yet
+        messages_response = SESSION.get(
+            f"{AMS_URL}/tasks/{session_id}/messages",
+            params={"since": last_message_count}
+        )
         
         if messages_response.status_code == 200:
-            messages = messages_response.json()
+            new_messages = _response_json(messages_response)
             
             # If we have new messages, update and print
-            if len(messages) > last_message_count:
+            if new_messages:
                 # Process any new messages
-                for i in range(last_message_count, len(messages)):
-                    msg = messages[i]
+                for msg in new_messages:
                     sender_id = msg.get("sender_id", "")
                     sender_name = msg.get("sender_name", "Unknown")
                     content = msg.get("content", "")
+                    contributor_ids.add(sender_id)
                     
                     # Skip system messages
                     if sender_id == "system":
@@ -237,29 +288,31 @@ def execute_collaboration(session_id: str) -> None:
                     }
                     
                     # Print a notification about the new contribution
-                    preview = content[:100] + "..." if len(content) > 100 else content
+                    preview = _preview(content, 100)
                     print(f"\n➤ {sender_name} ({framework.upper()}) has contributed:")
                     print(f"  \"{preview}\"")
                 
-                last_message_count = len(messages)
-                wait_time = 0  # Reset wait time when there's activity
+                last_message_count += len(new_messages)
+                wait_time = 0.0  # Reset wait time when there's activity
+                poll_delay = MIN_POLL_DELAY
                 
                 # Check if all agents have contributed
-                agent_ids = [agent_id for agent_id in agent_name_map.keys()]
-                contributor_ids = [msg.get("sender_id") for msg in messages]
-                
-                if all(agent_id in contributor_ids for agent_id in agent_ids):
+                if expected_ids <= contributor_ids:
                     print("\n✅ All agents have contributed to the collaboration!")
                     break
             else:
-                print(".", end="", flush=True)
-                time.sleep(3)
-                wait_time += 3
+                # Redraw one status line instead of printing a dot per poll
+                print(f"\rWaiting for agents {SPINNER[idle_polls % len(SPINNER)]}", end="", flush=True)
+                idle_polls += 1
+                time.sleep(poll_delay)
+                wait_time += poll_delay
+                poll_delay = min(poll_delay * 1.5, MAX_POLL_DELAY)
                 
         else:
             print(f"\nFailed to get messages: {messages_response.text}")
-            time.sleep(3)
-            wait_time += 3
+            time.sleep(poll_delay)
+            wait_time += poll_delay
+            poll_delay = min(poll_delay * 1.5, MAX_POLL_DELAY)
             
     if wait_time >= max_wait_time:
         print("\n⚠️ Monitoring timed out, but the task may still be running.")
@@ -271,7 +324,7 @@ def execute_collaboration(session_id: str) -> None:
             contrib = agent_contributions[agent_name]
             print(f"\n--- {agent_name} ({contrib['framework'].upper()}) ---")
             # Print the first 300 characters of each contribution
-            preview = contrib["content"][:300] + "..." if len(contrib["content"]) > 300 else contrib["content"]
+            preview = _preview(contrib["content"], 300)
             print(preview)
     
     print("\nFor the complete results, use the get_session_messages() function.")
@@ -284,10 +337,10 @@ def get_registered_agents() -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of registered agents
     """
-    response = requests.get(f"{AMS_URL}/agents")
+    response = SESSION.get(f"{AMS_URL}/agents")
     
     if response.status_code == 200:
-        return response.json()
+        return _response_json(response)
     else:
         print(f"Failed to get registered agents: {response.text}")
         return []
@@ -322,10 +375,10 @@ def get_session_messages(session_id: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of messages
     """
-    response = requests.get(f"{AMS_URL}/tasks/{session_id}/messages")
+    response = SESSION.get(f"{AMS_URL}/tasks/{session_id}/messages")
     
     if response.status_code == 200:
-        return response.json()
+        return _response_json(response)
     else:
         print(f"Failed to get session messages: {response.text}")
         return []
@@ -342,28 +395,25 @@ def display_conversation(messages: List[Dict[str, Any]], agents: List[Dict[str,
         print("No messages found in the session.")
         return
     
-    # Create a mapping of agent_id to framework for quick lookup
-    agent_framework_map = {agent["id"]: agent.get("framework", "unknown") for agent in agents}
+    # Create a mapping of agent_id to display framework for quick lookup
+    agent_framework_map = {agent["id"]: agent.get("framework", "unknown").upper() for agent in agents}
     
     print("\n===== Collaboration Conversation =====")
     
     for msg in messages:
         sender = msg.get("sender_name", "Unknown")
         sender_id = msg.get("sender_id")
-        framework = agent_framework_map.get(sender_id, "system").upper() if sender_id else "SYSTEM"
+        framework = agent_framework_map.get(sender_id, "SYSTEM") if sender_id else "SYSTEM"
         content = msg.get("content", "")
         
-        # Clean up content if it looks like a serialized object
-        if content and isinstance(content, str):
-            # If it looks like a dictionary that was converted to a string
-            if content.startswith('{') and content.endswith('}'):
-                try:
-                    import json
-                    parsed = json.loads(content)
-                    if isinstance(parsed, dict) and 'result' in parsed:
-                        content = parsed['result']
-                except:
-                    pass
+        # Clean up content if it looks like a dictionary that was converted to a string
+        if isinstance(content, str) and content[:1] == "{" and content[-1:] == "}":
+            try:
+                parsed = _loads(content)
+                if isinstance(parsed, dict) and 'result' in parsed:
+                    content = parsed['result']
+            except ValueError:
+                pass
         
         print(f"\n[{framework}] {sender}:")
         print(f"{content}")
@@ -404,7 +454,7 @@ def main() -> None:
     session_id = task_result["session_id"]
     
     # Execute the collaboration
-    execute_collaboration(session_id)
+    execute_collaboration(session_id, agents)
     
     # Display the conversation with framework information
     messages = get_session_messages(session_id)
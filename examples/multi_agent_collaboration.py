@@ -4,185 +4,265 @@ Example script for setting up multi-agent collaboration with the AMS.
 This demonstrates how to create a task that requires multiple agents to collaborate.
 """
 
+import contextlib
+import json
+import sys
+
 import requests
-import time
-from typing import Dict, Any, List, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 # Configuration
 AMS_URL = "http://localhost:8000"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def register_specialized_agents() -> List[dict]:
-    """Register specialized agents for collaboration."""
-    agents = [
-        # Researcher agent
-        {
-            "name": "Researcher",
-            "description": "An agent that specializes in research and information gathering",
-            "system_prompt": "You are a research specialist. Your role is to gather and analyze information on various topics. Be thorough, accurate, and comprehensive in your research.",
-            "framework": "autogen",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can research and gather information"
-                }
-            ],
-            "config": {
-                "llm_config": {
-                    "model": "gpt-4",
-                    "temperature": 0.3
-                }
+# Shared session, so requests reuse connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a request body as JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _response_json(response: requests.Response) -> Any:
+    """Decode a JSON response body."""
+    return _loads(response.content)
+
+def _log(*lines: str) -> None:
+    """Print lines with a single write, so output from worker threads doesn't interleave."""
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+
+def _call(method: str, path: str, action: str, body: Optional[bytes] = None) -> Any:
+    """
+    Send a request to the AMS and decode its JSON reply.
+    
+    Args:
+        method: The HTTP method
+        path: The endpoint path, starting with a slash
+        action: What the request does, for the failure message
+        body: The encoded JSON request body, if any
+    
+    Returns:
+        The decoded reply, or None if the server did not answer with 200
+    """
+    response = SESSION.request(
+        method,
+        f"{AMS_URL}{path}",
+        data=body,
+        headers=JSON_HEADERS if body is not None else None
+    )
+    if response.status_code == 200:
+        return _response_json(response)
+    _log(f"Failed to {action}: {response.text}")
+    return None
+
+# Agents registered for the collaboration; the payloads never change, so they are
+# built and encoded once at import time
+SPECIALIZED_AGENTS = (
+    # Researcher agent
+    {
+        "name": "Researcher",
+        "description": "An agent that specializes in research and information gathering",
+        "system_prompt": "You are a research specialist. Your role is to gather and analyze information on various topics. Be thorough, accurate, and comprehensive in your research.",
+        "framework": "autogen",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can research and gather information"
+            }
+        ],
+        "config": {
+            "llm_config": {
+                "model": "gpt-4",
+                "temperature": 0.3
+            }
+        }
+    },
+    # Writer agent
+    {
+        "name": "Writer",
+        "description": "An agent that specializes in writing compelling content",
+        "system_prompt": "You are a skilled writer. Your role is to craft engaging, clear, and well-structured content based on the information provided. Focus on creating compelling narratives.",
+        "framework": "autogen",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can write engaging content"
+            }
+        ],
+        "config": {
+            "llm_config": {
+                "model": "gpt-4",
+                "temperature": 0.7
+            }
+        }
+    },
+    # Code writer agent
+    {
+        "name": "CodeWriter",
+        "description": "An agent that specializes in writing code",
+        "system_prompt": "You are an expert software developer. Your role is to write clean, efficient, and well-documented code based on requirements. Focus on creating maintainable and optimized solutions.",
+        "framework": "autogen",
+        "capabilities": [
+            {
+                "name": "code_execution",
+                "description": "Can write efficient code"
             }
-        },
-        # Writer agent
-        {
-            "name": "Writer",
-            "description": "An agent that specializes in writing compelling content",
-            "system_prompt": "You are a skilled writer. Your role is to craft engaging, clear, and well-structured content based on the information provided. Focus on creating compelling narratives.",
-            "framework": "autogen",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can write engaging content"
-                }
-            ],
-            "config": {
-                "llm_config": {
-                    "model": "gpt-4",
-                    "temperature": 0.7
-                }
+        ],
+        "config": {
+            "llm_config": {
+                "model": "gpt-4",
+                "temperature": 0.2
             }
-        },
-        # Code writer agent
-        {
-            "name": "CodeWriter",
-            "description": "An agent that specializes in writing code",
-            "system_prompt": "You are an expert software developer. Your role is to write clean, efficient, and well-documented code based on requirements. Focus on creating maintainable and optimized solutions.",
-            "framework": "autogen",
-            "capabilities": [
-                {
-                    "name": "code_execution",
-                    "description": "Can write efficient code"
-                }
-            ],
-            "config": {
-                "llm_config": {
-                    "model": "gpt-4",
-                    "temperature": 0.2
-                }
+        }
+    },
+    # Critic agent
+    {
+        "name": "Critic",
+        "description": "An agent that specializes in reviewing and critiquing work",
+        "system_prompt": "You are a thoughtful critic. Your role is to review and provide constructive feedback on content and code. Focus on identifying potential improvements and issues.",
+        "framework": "autogen",
+        "capabilities": [
+            {
+                "name": "text_generation",
+                "description": "Can review and critique content"
+            },
+            {
+                "name": "code_execution",
+                "description": "Can review and critique code"
             }
-        },
-        # Critic agent
-        {
-            "name": "Critic",
-            "description": "An agent that specializes in reviewing and critiquing work",
-            "system_prompt": "You are a thoughtful critic. Your role is to review and provide constructive feedback on content and code. Focus on identifying potential improvements and issues.",
-            "framework": "autogen",
-            "capabilities": [
-                {
-                    "name": "text_generation",
-                    "description": "Can review and critique content"
-                },
-                {
-                    "name": "code_execution",
-                    "description": "Can review and critique code"
-                }
-            ],
-            "config": {
-                "llm_config": {
-                    "model": "gpt-4",
-                    "temperature": 0.4
-                }
+        ],
+        "config": {
+            "llm_config": {
+                "model": "gpt-4",
+                "temperature": 0.4
             }
         }
-    ]
+    }
+)
+_SPECIALIZED_AGENTS_BODY = _dumps({"agents": SPECIALIZED_AGENTS})
+_SPECIALIZED_AGENT_BODIES = tuple(_dumps(agent) for agent in SPECIALIZED_AGENTS)
+
+def register_specialized_agents() -> List[dict]:
+    """Register specialized agents for collaboration."""
+    # Register all agents in one round trip
+    response = SESSION.post(f"{AMS_URL}/agents/batch", data=_SPECIALIZED_AGENTS_BODY, headers=JSON_HEADERS)
+    if response.status_code == 200:
+        registered_agents = _response_json(response)
+        for registered_agent in registered_agents:
+            print(f"Registered {registered_agent['name']} with ID: {registered_agent['id']}")
+        return registered_agents
+    if response.status_code != 404:
+        print(f"Failed to register agents: {response.text}")
+        return []
     
-    registered_agents = []
-    for agent_data in agents:
-        response = requests.post(
-            f"{AMS_URL}/agents", 
-            headers={"Content-Type": "application/json"},
-            json=agent_data
-        )
-        
-        if response.status_code == 200:
-            registered_agent = response.json()
-            print(f"Registered {agent_data['name']} with ID: {registered_agent['id']}")
-            registered_agents.append(registered_agent)
-        else:
-            print(f"Failed to register {agent_data['name']}: {response.text}")
+    # No batch endpoint: register concurrently; map keeps the input order
+    with ThreadPoolExecutor(max_workers=len(SPECIALIZED_AGENTS)) as executor:
+        results = list(executor.map(_register_agent, SPECIALIZED_AGENTS, _SPECIALIZED_AGENT_BODIES))
     
-    return registered_agents
+    return [result for result in results if result is not None]
+
+def _register_agent(agent_data: dict, body: Optional[bytes] = None) -> Optional[dict]:
+    """Register a single agent, returning its data or None on failure."""
+    registered_agent = _call(
+        "POST", "/agents", f"register {agent_data['name']}",
+        body=body if body is not None else _dumps(agent_data)
+    )
+    if registered_agent is not None:
+        _log(f"Registered {agent_data['name']} with ID: {registered_agent['id']}")
+    return registered_agent
 
 def create_collaboration_session(task_description: str) -> Union[dict, None]:
     """Create a task that requires collaboration between multiple agents."""
-    response = requests.post(
-        f"{AMS_URL}/tasks", 
-        headers={"Content-Type": "application/json"},
-        json={"task": task_description}
-    )
-    
-    if response.status_code == 200:
-        data = response.json()
+    data = _call("POST", "/tasks", "create collaboration session", body=_dumps({"task": task_description}))
+    if data is not None:
         print(f"Created collaboration session with ID: {data['session_id']}")
         print(f"Selected agents: {', '.join(data['agents'])}")
-        return data
-    else:
-        print(f"Failed to create collaboration session: {response.text}")
-        return None
+    return data
+
+@contextlib.contextmanager
+def collaboration_session(task_description: str) -> Iterator[Optional[dict]]:
+    """
+    Create a collaboration session that is terminated when the block exits.
+    
+    Yields the session data, or None if the session could not be created. The
+    terminate request is sent even if the block raises, so the server never
+    keeps an abandoned session.
+    """
+    data = create_collaboration_session(task_description)
+    try:
+        yield data
+    finally:
+        if data is not None:
+            print("\nTerminating the collaboration session...")
+            _call("POST", f"/tasks/{data['session_id']}/terminate", "terminate collaboration")
 
 def send_message_to_session(session_id: str, content: str, sender_id: str, sender_name: str) -> Union[dict, None]:
     """Send a message to the collaboration session."""
-    response = requests.post(
-        f"{AMS_URL}/tasks/{session_id}/messages",
-        headers={"Content-Type": "application/json"},
-        json={
+    message = _call(
+        "POST", f"/tasks/{session_id}/messages", "send message",
+        body=_dumps({
             "content": content,
             "sender_id": sender_id,
             "sender_name": sender_name
-        }
+        })
     )
-    
-    if response.status_code == 200:
+    if message is not None:
         print(f"Sent message from {sender_name} to session {session_id}")
-        return response.json()
-    else:
-        print(f"Failed to send message: {response.text}")
-        return None
-
-def get_messages(session_id: str) -> List[dict]:
-    """Get all messages from the collaboration session."""
-    response = requests.get(f"{AMS_URL}/tasks/{session_id}/messages")
-    
-    if response.status_code == 200:
-        messages = response.json()
-        print(f"Retrieved {len(messages)} messages from session {session_id}")
-        return messages
-    else:
-        print(f"Failed to get messages: {response.text}")
-        return []
+    return message
 
-def display_conversation(messages: List[Dict[str, Any]]) -> None:
-    """Display the conversation in a readable format."""
-    print("\n=== Collaboration Conversation ===")
-    for i, message in enumerate(messages):
-        sender = message.get('sender_name', 'Unknown')
-        content = message.get('content', 'No content')
+def stream_messages(session_id: str, since: int = 0, stop: Optional[Callable[[], bool]] = None) -> Iterator[dict]:
+    """Yield the session's messages as the server pushes them, until the session is done or stop() is true."""
+    with SESSION.get(f"{AMS_URL}/tasks/{session_id}/stream", params={"since": since}, stream=True, timeout=None) as response:
+        if response.status_code != 200:
+            print(f"Failed to stream messages: {response.text}")
+            return
         
-        print(f"\n--- Message {i+1} from {sender} ---")
-        print(content[:500] + "..." if len(content) > 500 else content)
+        # The server sends a keep-alive comment every second, so stop() is checked even while idle
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event: done") or (stop is not None and stop()):
+                return
+            if line.startswith("data:"):
+                yield _loads(line[5:])
+
+def _format_message(index: int, message: Dict[str, Any]) -> str:
+    """Format one message of the conversation, truncating long content."""
+    sender = message.get('sender_name', 'Unknown')
+    content = message.get('content', 'No content')
+    if len(content) > 500:
+        content = f"{content[:500]}..."
+    return f"\n--- Message {index} from {sender} ---\n{content}\n"
+
+def display_message(index: int, message: Dict[str, Any]) -> None:
+    """Display one message of the conversation."""
+    sys.stdout.write(_format_message(index, message))
 
 def execute_collaboration(session_id: str) -> Union[dict, None]:
     """Execute the collaboration session."""
-    response = requests.post(f"{AMS_URL}/tasks/{session_id}/execute")
-    
-    if response.status_code == 200:
-        data = response.json()
-        print(f"Successfully executed collaboration session: {session_id}")
-        print(f"Status: {data['status']}")
-        return data
-    else:
-        print(f"Failed to execute collaboration: {response.text}")
-        return None
+    data = _call("POST", f"/tasks/{session_id}/execute", "execute collaboration")
+    if data is not None:
+        # Runs beside the message stream, so write both lines at once
+        _log(f"Successfully executed collaboration session: {session_id}", f"Status: {data['status']}")
+    return data
 
 def main() -> None:
     # Step 1: Register specialized agents
@@ -200,28 +280,34 @@ def main() -> None:
         "and a critique of the approach. This is both a research, coding, and writing task."
     )
     
-    session_data = create_collaboration_session(complex_task)
-    if not session_data:
-        print("Failed to create collaboration session. Exiting.")
-        return
-    
-    session_id = session_data['session_id']
-    
-    # Step 3: Execute the collaboration
-    print("\nExecuting the collaboration...\n")
-    execution_data = execute_collaboration(session_id)
-    
-    # Step 4: Wait a moment and then get the conversation
-    print("\nWaiting for agents to collaborate...")
-    time.sleep(2)
-    
-    # Step 5: Get and display the conversation
-    messages = get_messages(session_id)
-    display_conversation(messages)
+    # The session is terminated when this block exits, however it exits
+    with collaboration_session(complex_task) as session_data:
+        if not session_data:
+            print("Failed to create collaboration session. Exiting.")
+            return
+        
+        session_id = session_data['session_id']
+        
+        # Step 3: Execute the collaboration, printing each message as the server pushes it
+        print("\nExecuting the collaboration...\n")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            execution = executor.submit(execute_collaboration, session_id)
+            
+            print("\n=== Collaboration Conversation ===")
+            # A failed execution leaves the session active, so stop streaming when it fails
+            def failed() -> bool:
+                if not execution.done():
+                    return False
+                # Check for an exception first, so the check itself doesn't re-raise it
+                return execution.exception() is not None or execution.result() is None
+            
+            for i, message in enumerate(stream_messages(session_id, stop=failed)):
+                display_message(i + 1, message)
+            
+            # Step 4: Wait for the execution summary (the stream ends when the session does)
+            execution.result()
     
-    # Step 6: Terminate the session when done
-    print("\nTerminating the collaboration session...")
-    requests.post(f"{AMS_URL}/tasks/{session_id}/terminate")
+    # Step 5: Leaving the block above terminated the session, even after an error
     print("Collaboration complete!")
 
 if __name__ == "__main__":
@@ -5,7 +5,12 @@ This demonstrates how to register different types of agents with various capabil
 """
 
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from typing import Union
 
@@ -13,123 +18,154 @@ from typing import Union
 AMS_URL = "http://localhost:8000"
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "your_api_key_here")
 
+# Shared session, so requests reuse connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.2)
+))
+
 def register_agent(agent_data: dict) -> Union[dict, None]:
     """Register an agent with the AMS."""
-    response = requests.post(
+    response = SESSION.post(
         f"{AMS_URL}/agents", 
-        headers={"Content-Type": "application/json"},
         json=agent_data
     )
     
     if response.status_code == 200:
-        print(f"Successfully registered agent: {agent_data['name']}")
-        print(f"Agent ID: {response.json()['id']}")
-        return response.json() # type: ignore
+        registered_agent = response.json()
+        # One write per agent, so concurrent registrations don't interleave
+        sys.stdout.write(f"Successfully registered agent: {agent_data['name']}\nAgent ID: {registered_agent['id']}\n\n")
+        return registered_agent # type: ignore
     else:
-        print(f"Failed to register agent: {response.text}")
+        sys.stdout.write(f"Failed to register agent: {response.text}\n\n")
         return None
 
-def main() -> None:
-    # Example 1: Register a general-purpose assistant
-    general_assistant = {
-        "name": "GeneralAssistant",
-        "description": "A general-purpose AI assistant",
-        "system_prompt": "You are a helpful AI assistant. Answer questions accurately and concisely.",
-        "framework": "autogen",
-        "capabilities": [
-            {
-                "name": "text_generation",
-                "description": "Can generate text responses based on prompts"
-            }
-        ],
-        "config": {
-            "llm_config": {
-                "model": "gpt-4",
-                "temperature": 0.7,
-                "api_key": OPENAI_API_KEY
-            }
+# Example 1: a general-purpose assistant
+general_assistant = {
+    "name": "GeneralAssistant",
+    "description": "A general-purpose AI assistant",
+    "system_prompt": "You are a helpful AI assistant. Answer questions accurately and concisely.",
+    "framework": "autogen",
+    "capabilities": [
+        {
+            "name": "text_generation",
+            "description": "Can generate text responses based on prompts"
+        }
+    ],
+    "config": {
+        "llm_config": {
+            "model": "gpt-4",
+            "temperature": 0.7,
+            "api_key": OPENAI_API_KEY
         }
     }
-    
-    # Example 2: Register a code-focused assistant
-    code_assistant = {
-        "name": "CodeAssistant",
-        "description": "An assistant specializing in programming and software development",
-        "system_prompt": "You are an expert programmer with deep knowledge of multiple programming languages and software architectures. Write clean, efficient, and well-documented code.",
-        "framework": "autogen",
-        "capabilities": [
-            {
-                "name": "code_execution",
-                "description": "Can generate and explain code"
-            }
-        ],
-        "config": {
-            "llm_config": {
-                "model": "gpt-4",
-                "temperature": 0.2,
-                "api_key": OPENAI_API_KEY
-            }
+}
+
+# Example 2: a code-focused assistant
+code_assistant = {
+    "name": "CodeAssistant",
+    "description": "An assistant specializing in programming and software development",
+    "system_prompt": "You are an expert programmer with deep knowledge of multiple programming languages and software architectures. Write clean, efficient, and well-documented code.",
+    "framework": "autogen",
+    "capabilities": [
+        {
+            "name": "code_execution",
+            "description": "Can generate and explain code"
+        }
+    ],
+    "config": {
+        "llm_config": {
+            "model": "gpt-4",
+            "temperature": 0.2,
+            "api_key": OPENAI_API_KEY
         }
     }
-    
-    # Example 3: Register a creative writing assistant
-    writing_assistant = {
-        "name": "WritingAssistant",
-        "description": "An assistant specializing in creative writing",
-        "system_prompt": "You are a skilled creative writer who can craft engaging stories, poems, and other written content. Be imaginative and use vivid language.",
-        "framework": "autogen",
-        "capabilities": [
-            {
-                "name": "text_generation",
-                "description": "Can generate creative written content"
-            }
-        ],
-        "config": {
-            "llm_config": {
-                "model": "gpt-4",
-                "temperature": 0.9,
-                "api_key": OPENAI_API_KEY
-            }
+}
+
+# Example 3: a creative writing assistant
+writing_assistant = {
+    "name": "WritingAssistant",
+    "description": "An assistant specializing in creative writing",
+    "system_prompt": "You are a skilled creative writer who can craft engaging stories, poems, and other written content. Be imaginative and use vivid language.",
+    "framework": "autogen",
+    "capabilities": [
+        {
+            "name": "text_generation",
+            "description": "Can generate creative written content"
+        }
+    ],
+    "config": {
+        "llm_config": {
+            "model": "gpt-4",
+            "temperature": 0.9,
+            "api_key": OPENAI_API_KEY
         }
     }
-    
-    # Example 4: Register a data analysis assistant
-    data_assistant = {
-        "name": "DataAnalyst",
-        "description": "An assistant specializing in data analysis",
-        "system_prompt": "You are a data analyst with expertise in statistics and data visualization. Explain data concepts clearly and provide insightful analysis.",
-        "framework": "autogen",
-        "capabilities": [
-            {
-                "name": "data_analysis",
-                "description": "Can analyze and interpret data"
-            },
-            {
-                "name": "calculation",
-                "description": "Can perform mathematical calculations"
-            }
-        ],
-        "config": {
-            "llm_config": {
-                "model": "gpt-4",
-                "temperature": 0.3,
-                "api_key": OPENAI_API_KEY
-            }
+}
+
+# Example 4: a data analysis assistant
+data_assistant = {
+    "name": "DataAnalyst",
+    "description": "An assistant specializing in data analysis",
+    "system_prompt": "You are a data analyst with expertise in statistics and data visualization. Explain data concepts clearly and provide insightful analysis.",
+    "framework": "autogen",
+    "capabilities": [
+        {
+            "name": "data_analysis",
+            "description": "Can analyze and interpret data"
+        },
+        {
+            "name": "calculation",
+            "description": "Can perform mathematical calculations"
+        }
+    ],
+    "config": {
+        "llm_config": {
+            "model": "gpt-4",
+            "temperature": 0.3,
+            "api_key": OPENAI_API_KEY
         }
     }
+}
+
+# Agents registered by main; built once at import time
+BUILTIN_AGENTS = (general_assistant, code_assistant, writing_assistant, data_assistant)
+
+def list_agents() -> list:
+    """List the agents registered with the AMS, or an empty list on failure."""
+    response = SESSION.get(f"{AMS_URL}/agents")
+    if response.status_code == 200:
+        return response.json()
+    print(f"Failed to list agents: {response.text}\n")
+    return []
+
+def main() -> None:
+    # Skip agents the server already has, so re-running the script doesn't register duplicates
+    existing = {agent['name']: agent for agent in list_agents()}
+    agents = [agent for agent in BUILTIN_AGENTS if agent['name'] not in existing]
+    for agent in BUILTIN_AGENTS:
+        if agent['name'] in existing:
+            print(f"Agent already registered: {agent['name']}\nAgent ID: {existing[agent['name']]['id']}\n")
     
-    # Register all agents
-    agents = [general_assistant, code_assistant, writing_assistant, data_assistant]
-    for agent in agents:
-        register_agent(agent)
-        print()  # Add a newline for readability
+    # Register the remaining agents in one round trip
+    if agents:
+        response = SESSION.post(f"{AMS_URL}/agents/batch", json={"agents": agents})
+        if response.status_code == 200:
+            for registered_agent in response.json():
+                print(f"Successfully registered agent: {registered_agent['name']}\nAgent ID: {registered_agent['id']}\n")
+        elif response.status_code == 404:
+            # No batch endpoint: register concurrently
+            with ThreadPoolExecutor(max_workers=len(agents)) as executor:
+                list(executor.map(register_agent, agents))
+        else:
+            print(f"Failed to register agents: {response.text}\n")
     
     # List all registered agents
-    response = requests.get(f"{AMS_URL}/agents")
-    if response.status_code == 200:
-        print("All registered agents:")
-        for agent in response.json():
-            print(f"- {agent['name']} ({agent['id']}): {agent['framework']} - {agent['status']}")
+    print("All registered agents:")
+    for agent in list_agents():
+        print(f"- {agent['name']} ({agent['id']}): {agent['framework']} - {agent['status']}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file